@@ -0,0 +1,499 @@
+# Optional local agent: one poller per host, shared by every GUI/script over a loopback socket
+# Usage: python agent.py [--port 47810]
+#        python agent.py --host 0.0.0.0 --token SECRET --insecure   (for fleet.py; see below)
+#
+# Security: frames are not encrypted. On loopback that is fine. On any other
+# address the shared token and every request travel in plaintext, and the
+# token authorizes apply with this process's (admin) rights, so anyone who
+# can sniff or reach the port can reconfigure the host. Binding beyond
+# loopback therefore needs --insecure; only do it on a trusted, isolated
+# management network.
+#
+# Protocol: each frame is a 4-byte big-endian length followed by compact UTF-8 JSON.
+# Requests carry an "id" and get exactly one reply with the same id:
+#   {"op": "hello", "token": ...}           must be first; the token is read from token_path()
+#   {"op": "snapshot"}                      -> {"infos": [...]}
+#   {"op": "subscribe"} / {"op": "unsubscribe"}
+#   {"op": "apply", "name": ..., "ip": ..., "netmask": ..., "gateway": ..., "dns1": ..., "dns2": ...}
+#                                           -> {"result": PlanResult}; missing fields keep their value
+#   {"op": "stats"}
+# Subscribers also receive pushed {"event": record} frames, where record is an
+# exporter record (snapshot/add/update/remove) with a per-connection gap-free seq.
+import argparse
+import ipaddress
+import json
+import os
+import secrets
+import socket
+import struct
+import subprocess
+import threading
+import time
+from dataclasses import asdict
+from typing import Optional
+
+from exporter import SNAPSHOT, ADD, DeltaEncoder, StateRebuilder, info_dict, info_from_dict
+from interfacemanager import InterfaceCollector, RefreshManager, ConfigureInterface
+from poller import Poller
+from statecache import default_path
+
+DEFAULT_PORT = 47810
+HEADER = struct.Struct("!I")
+MAX_FRAME = 16 * 2**20
+FIELDS = ("ip", "netmask", "gateway", "dns1", "dns2")
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def token_path():
+    """Lives next to the state cache, in the per-user app data folder."""
+    return os.path.join(os.path.dirname(default_path()), "agent.token")
+
+
+def _restrict_to_current_user(path):
+    """Windows ignores the 0o600 mode; replace the inherited ACL with one for this user only."""
+    user = os.environ.get("USERNAME")
+    if os.environ.get("USERDOMAIN"):
+        user = f"{os.environ['USERDOMAIN']}\\{user}"
+    result = subprocess.run(
+        ["icacls", path, "/inheritance:r", "/grant:r", f"{user}:F"],
+        capture_output=True, text=True, creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+    )
+    if result.returncode != 0:
+        os.remove(path)
+        raise PermissionError(f"could not restrict the token file: {(result.stdout + result.stderr).strip()}")
+
+
+def send_frame(sock, message):
+    payload = json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock, first=b""):
+    """first: bytes of the header already read by the caller."""
+    (length,) = HEADER.unpack(first + _recv_exact(sock, HEADER.size - len(first)))
+    if length > MAX_FRAME:
+        raise ProtocolError(f"frame of {length} bytes is too large")
+    return json.loads(_recv_exact(sock, length).decode("utf-8"))
+
+
+class _Connection:
+    """One client. Writes come from its own thread and from the poller, so they share a lock."""
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.subscribed = False
+        self.seq = 0
+        self._send_lock = threading.Lock()
+
+    def send(self, message):
+        with self._send_lock:
+            send_frame(self.sock, message)
+
+    def push(self, records):
+        with self._send_lock:
+            for record in records:
+                self.seq += 1
+                send_frame(self.sock, {"event": dict(record, seq=self.seq, ts=round(time.time(), 3))})
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)  # close() alone sends no FIN while our reader is in recv()
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class Agent:
+    """
+    Owns the only Poller on the host and fans its deltas out to subscribers, so
+    psutil and PowerShell load does not grow with the number of clients.
+    Configuration requests run one at a time under apply_lock.
+    Listens on loopback unless given another host and insecure=True; clients
+    must present the token written at start.
+    """
+    def __init__(self, collector=None, host="127.0.0.1", port=DEFAULT_PORT, token=None,
+                 fast=1.0, slow=30.0, send_timeout=5.0, insecure=False):
+        if not is_loopback(host) and not insecure:
+            raise ValueError(f"refusing to listen on {host} without TLS; pass insecure=True (--insecure) "
+                             "only on a trusted network")
+        self.collector = collector or InterfaceCollector()
+        self.refresher = RefreshManager(self.collector)
+        self.encoder = DeltaEncoder()
+        self.host = host
+        self.port = port
+        self.token = token or secrets.token_hex(16)
+        self.send_timeout = send_timeout
+        self.requests = 0
+        self.applies = 0
+        self._connections = set()
+        self._lock = threading.Lock()  # guards _connections and the encoder state
+        self.apply_lock = threading.Lock()
+        self._server = None
+        self._stop = threading.Event()
+        self.poller = Poller(
+            sample=lambda: (self.refresher.tick(), self.refresher.changed),
+            deliver=self._broadcast,
+            schedule=lambda fn: fn(),  # no UI thread; deliver on the poller thread
+            fast=fast, slow=slow,
+        )
+
+    # --- Lifecycle ---
+
+    def start(self, write_token=True):
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen()
+        self.port = self._server.getsockname()[1]  # port=0 picks a free one
+        if write_token:
+            self._write_token()
+        self._broadcast(self.refresher.tick())  # first inventory before anyone can ask
+        self.poller.start()
+        threading.Thread(target=self._accept_loop, name="agent-accept", daemon=True).start()
+        return self
+
+    def _write_token(self):
+        """Readable by the current user only: the token authorizes apply, which runs with our rights."""
+        path = token_path()
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        tmp = path + ".tmp"
+        try:
+            os.remove(tmp)  # O_CREAT keeps the mode of a file that already exists
+        except FileNotFoundError:
+            pass
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(f"{self.port} {self.token}\n")
+        if os.name == "nt":
+            _restrict_to_current_user(tmp)
+        os.replace(tmp, path)
+
+    def stop(self):
+        self._stop.set()
+        self.poller.stop(timeout=1)
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)  # wakes accept(); close() alone leaves the port bound
+            except OSError:
+                pass
+            self._server.close()
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
+    def serve_forever(self):
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    # --- Fan-out ---
+
+    def _broadcast(self, infos):
+        with self._lock:
+            records = self.encoder.encode(infos)
+            subscribers = [c for c in self._connections if c.subscribed]
+        if not records:
+            return
+        for conn in subscribers:
+            try:
+                conn.push(records)
+            except OSError as e:
+                print(f"[DEBUG] dropping agent client {conn.address}: {e}")
+                self._drop(conn)
+
+    def _drop(self, conn):
+        with self._lock:
+            self._connections.discard(conn)
+        conn.close()
+
+    # --- Connections ---
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                sock, address = self._server.accept()
+            except OSError:
+                break
+            sock.settimeout(self.send_timeout)  # a stuck client cannot stall the poller for long
+            conn = _Connection(sock, address)
+            threading.Thread(target=self._serve, args=(conn,), name=f"agent-{address[1]}", daemon=True).start()
+
+    def _serve(self, conn):
+        try:
+            hello = self._recv(conn)
+            if hello is None or hello.get("op") != "hello" or not secrets.compare_digest(str(hello.get("token")), self.token):
+                conn.send({"id": hello.get("id") if hello else None, "ok": False, "error": "bad token"})
+                return
+            with self._lock:
+                if self._stop.is_set():
+                    return
+                self._connections.add(conn)  # before the reply, so stop() always sees it
+            conn.send({"id": hello.get("id"), "ok": True, "port": self.port})
+            while not self._stop.is_set():
+                request = self._recv(conn)
+                if request is None:
+                    continue
+                self.requests += 1
+                conn.send(self._handle(conn, request))
+        except (ConnectionError, OSError, ProtocolError, ValueError):
+            pass
+        finally:
+            self._drop(conn)
+
+    def _recv(self, conn):
+        """
+        Next request, or None when the socket idled past its timeout. Only the
+        first byte may time out quietly; a stall mid-frame drops the client.
+        """
+        try:
+            first = conn.sock.recv(1)
+        except socket.timeout:
+            return None
+        if not first:
+            raise ConnectionError("connection closed")
+        return recv_frame(conn.sock, first)
+
+    def _handle(self, conn, request):
+        op = request.get("op")
+        reply = {"id": request.get("id"), "ok": True}
+        try:
+            if op == "snapshot":
+                reply["infos"] = [info_dict(i) for i in self.collector.infos]
+            elif op == "subscribe":
+                # The snapshot goes out under the lock so no delta can slip in before it
+                with self._lock:
+                    conn.subscribed = True
+                    conn.push(DeltaEncoder.snapshot_records(self.encoder.current))
+            elif op == "unsubscribe":
+                conn.subscribed = False
+            elif op == "apply":
+                reply["result"] = asdict(self._apply(request))
+            elif op == "stats":
+                with self._lock:
+                    clients = len(self._connections)
+                reply.update(
+                    clients=clients, requests=self.requests, applies=self.applies,
+                    samples=self.poller.samples, refresh=self.refresher.stats(),
+                )
+            else:
+                reply.update(ok=False, error=f"unknown op {op!r}")
+        except Exception as e:
+            reply.update(ok=False, error=str(e))
+        return reply
+
+    def _apply(self, request) -> ConfigureInterface.PlanResult:
+        with self.apply_lock:
+            self.applies += 1
+            info = self.collector.get(request.get("name"))
+            if info is None:
+                return ConfigureInterface.PlanResult(ok=False, steps=[], error="Interface not found.")
+            first = info.ipv4[0] if info.ipv4 else None
+            values = {
+                "ip": first.address if first else None,
+                "netmask": first.netmask if first else None,
+                "gateway": info.gateway, "dns1": info.dns1, "dns2": info.dns2,
+            }
+            values.update({f: request[f] or None for f in FIELDS if f in request})
+            target = ConfigureInterface(iface_name=info.name, runner=self.collector.runner, **values)
+            errors = target.validate_syntax()
+            if errors:
+                return ConfigureInterface.PlanResult(ok=False, steps=[], error="\n".join(errors))
+            diffs = target.iface_compare(info)
+            if not diffs:
+                return ConfigureInterface.PlanResult(ok=True, steps=[])
+            result = target.compile_plan(info, diffs).apply(self.collector.runner)
+        self.refresher.invalidate()
+        self.poller.kick()  # subscribers hear about the change on the next sample
+        return result
+
+
+class AgentClient:
+    """
+    Connection to a running Agent. Pushed records rebuild the inventory in
+    self.rebuilder; on_event(records) is then called on the reader thread,
+    but never while a snapshot is only partly received.
+    on_close(): the agent went away (not called after our own close()).
+    """
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, token=None, timeout=10.0, on_event=None,
+                 connect_timeout=None, on_close=None):
+        self.timeout = timeout
+        self.on_event = on_event
+        self.on_close = on_close
+        self.rebuilder = StateRebuilder()
+        self._sock = socket.create_connection((host, port), timeout=connect_timeout or timeout)
+        self._sock.settimeout(None)  # the reader blocks; request() has its own timeout
+        self._ids = 0
+        self._replies = {}
+        self._cond = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._awaiting = 0  # ADD records still due from the last SNAPSHOT
+        self._closed = False
+        self._closing = False
+        threading.Thread(target=self._reader, name="agent-client", daemon=True).start()
+        reply = self.request("hello", token=token)
+        if not reply.get("ok"):
+            self.close()
+            raise PermissionError(reply.get("error", "agent refused the connection"))
+
+    @classmethod
+    def connect_if_running(cls, on_event=None, on_close=None, connect_timeout=0.2) -> Optional['AgentClient']:
+        """Client for the agent named in token_path(), or None when no agent is running."""
+        try:
+            with open(token_path(), encoding="utf-8") as f:
+                port, token = f.read().split()
+            return cls(port=int(port), token=token, on_event=on_event, on_close=on_close,
+                       connect_timeout=connect_timeout)
+        except (OSError, ValueError, PermissionError):
+            return None
+
+    def _reader(self):
+        try:
+            while True:
+                message = recv_frame(self._sock)
+                if "event" in message:
+                    self._feed(message["event"])
+                    continue
+                with self._cond:
+                    self._replies[message.get("id")] = message
+                    self._cond.notify_all()
+        except (ConnectionError, OSError, ProtocolError, ValueError):
+            pass
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            if self.on_close and not self._closing:
+                try:
+                    self.on_close()
+                except Exception as e:
+                    print(f"[DEBUG] agent on_close failed: {e}")
+
+    def _feed(self, record):
+        with self._state_lock:
+            synced = self.rebuilder.feed(record)
+            if record["type"] == SNAPSHOT:
+                self._awaiting = record["count"]
+            elif record["type"] == ADD and self._awaiting:
+                self._awaiting -= 1
+        if synced and not self._awaiting and self.on_event:
+            self.on_event([record])
+
+    def request(self, op, timeout=None, **fields):
+        timeout = self.timeout if timeout is None else timeout
+        with self._cond:
+            self._ids += 1
+            request_id = self._ids
+        with self._send_lock:
+            send_frame(self._sock, dict(fields, op=op, id=request_id))
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while request_id not in self._replies:
+                remaining = deadline - time.monotonic()
+                if self._closed:
+                    raise ConnectionError("agent connection closed")
+                if remaining <= 0:
+                    raise TimeoutError(f"agent did not answer {op!r} within {timeout} s")
+                self._cond.wait(remaining)
+            return self._replies.pop(request_id)
+
+    # --- Operations ---
+
+    def snapshot(self):
+        return [info_from_dict(d) for d in self.request("snapshot")["infos"]]
+
+    def subscribe(self):
+        return self.request("subscribe")
+
+    def infos(self):
+        """The inventory rebuilt from pushed records (empty until subscribed)."""
+        with self._state_lock:
+            return [info_from_dict(d) for d in self.rebuilder.state.values()]
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def apply(self, interface: ConfigureInterface, timeout=120.0) -> ConfigureInterface.PlanResult:
+        """Send every field of interface; None clears it, as in the GUI."""
+        return self.configure(interface.iface_name, timeout, **{f: getattr(interface, f) for f in FIELDS})
+
+    def configure(self, name, timeout=120.0, **fields) -> ConfigureInterface.PlanResult:
+        """Apply only the given fields (ip, netmask, gateway, dns1, dns2); the rest keep their value."""
+        reply = self.request("apply", timeout=timeout, name=name, **fields)
+        if not reply.get("ok"):
+            return ConfigureInterface.PlanResult(ok=False, steps=[], error=reply.get("error"))
+        data = reply["result"]
+        return ConfigureInterface.PlanResult(
+            ok=data["ok"],
+            steps=[ConfigureInterface.StepResult(**s) for s in data["steps"]],
+            rolled_back=data["rolled_back"],
+            error=data["error"],
+        )
+
+    def stats(self):
+        return self.request("stats")
+
+    def close(self):
+        self._closing = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)  # wakes the reader
+        except OSError:
+            pass
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IP Changer local agent")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on; 0.0.0.0 for fleet.py")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--token", default=os.environ.get("IPCHANGER_AGENT_TOKEN"),
+                        help="shared secret (default: a random one, written to the token file)")
+    parser.add_argument("--insecure", action="store_true",
+                        help="allow a non-loopback --host: token and requests are sent unencrypted")
+    args = parser.parse_args(argv)
+    if not is_loopback(args.host) and not args.insecure:
+        parser.error(f"--host {args.host} sends the token and requests in plaintext; add --insecure "
+                     "to accept that on a trusted network")
+    agent = Agent(host=args.host, port=args.port, token=args.token, insecure=args.insecure).start()
+    print(f"Agent listening on {args.host}:{agent.port}; token in {token_path()}")
+    agent.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
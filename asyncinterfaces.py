@@ -0,0 +1,198 @@
+# Asyncio counterparts of InterfaceInfo and ConfigureInterface
+import asyncio
+import json
+import subprocess
+import weakref
+from typing import List, Optional
+
+import tracing
+from interfacemanager import InterfaceInfo, ConfigureInterface, _psutil
+
+
+class AsyncRunner:
+    """
+    Async version of powershell.CommandRunner.
+    run() returns a subprocess.CompletedProcess and raises subprocess.TimeoutExpired
+    or subprocess.CalledProcessError like the sync runners do.
+    `concurrency` bounds how many scripts are in flight at once per event loop;
+    one runner can serve several asyncio.run() calls in turn.
+    """
+    def __init__(self, concurrency=4, default_timeout=60.0):
+        self.concurrency = concurrency
+        self.default_timeout = default_timeout
+        self._semaphores = weakref.WeakKeyDictionary()  # loop -> Semaphore
+
+    def _slot(self):
+        # asyncio primitives bind to the loop that first waits on them, so keep one per loop
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+        return semaphore
+
+    async def run(self, script, timeout=None, check=False) -> subprocess.CompletedProcess:
+        timeout = self.default_timeout if timeout is None else timeout
+        async with self._slot():
+            result = await self._run(script, timeout)
+        if check:
+            result.check_returncode()
+        return result
+
+    async def _run(self, script, timeout):
+        raise NotImplementedError
+
+
+class AsyncSubprocessRunner(AsyncRunner):
+    """One powershell process per script via asyncio.create_subprocess_exec."""
+    def __init__(self, executable="powershell", concurrency=4, default_timeout=60.0):
+        super().__init__(concurrency, default_timeout)
+        self.executable = executable
+
+    async def _run(self, script, timeout):
+        args = [self.executable, "-NoProfile", "-NonInteractive", "-Command", script]
+        with tracing.span("powershell", cat="powershell", runner=type(self).__name__, script_bytes=len(script)) as span:
+            proc = await asyncio.create_subprocess_exec(
+                *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise subprocess.TimeoutExpired(args, timeout)
+            return span.set_result(subprocess.CompletedProcess(
+                args, proc.returncode,
+                stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+            ))
+
+
+class RunnerPool(AsyncRunner):
+    """
+    Runs scripts on a pool of sync CommandRunners (e.g. PowerShellSession or
+    FakeRunner) in worker threads. Each runner serves one script at a time,
+    so concurrency equals the pool size. The sync runners trace their own calls.
+    Use it from one event loop at a time: each loop gets its own idle queue.
+    """
+    def __init__(self, runners, default_timeout=60.0):
+        super().__init__(len(runners), default_timeout)
+        self.runners = list(runners)
+        self._idle = weakref.WeakKeyDictionary()  # loop -> Queue of idle runners
+
+    def _idle_queue(self):
+        loop = asyncio.get_running_loop()
+        idle = self._idle.get(loop)
+        if idle is None:
+            idle = self._idle[loop] = asyncio.Queue()
+            for runner in self.runners:
+                idle.put_nowait(runner)
+        return idle
+
+    async def _run(self, script, timeout):
+        idle = self._idle_queue()
+        runner = await idle.get()
+        try:
+            # The sync runner enforces the timeout itself (and restarts its session on expiry)
+            return await asyncio.to_thread(runner.run, script, timeout)
+        finally:
+            idle.put_nowait(runner)
+
+    def close(self):
+        for runner in self.runners:
+            runner.close()
+
+
+class AsyncInterfaceInfo:
+    """
+    InterfaceInfo over an AsyncRunner. The DHCP, DNS and route queries behind
+    get_info_light run as three concurrent scripts instead of one sequential one.
+    """
+    DHCP_SCRIPT = "Get-NetIPInterface -AddressFamily IPv4 | Select-Object InterfaceAlias, Dhcp | ConvertTo-Json"
+    DNS_SCRIPT = (
+        "Get-DnsClientServerAddress -AddressFamily IPv4 | "
+        "Where-Object { $_.ServerAddresses -and $_.ServerAddresses.Count -gt 0 } | "
+        "Select-Object InterfaceAlias, @{Name='DNSServers';Expression={ $_.ServerAddresses -join ',' }} | ConvertTo-Json"
+    )
+    ROUTE_SCRIPT = "Get-NetRoute -DestinationPrefix '0.0.0.0/0' | Select-Object InterfaceAlias, NextHop | ConvertTo-Json"
+
+    def __init__(self, runner: AsyncRunner, net=None, timeout=None):
+        self.runner = runner
+        self._net = net
+        self.timeout = timeout
+
+    @property
+    def net(self):
+        if self._net is None:
+            self._net = _psutil()
+        return self._net
+
+    async def _query(self, script):
+        result = await self.runner.run(script, timeout=self.timeout, check=True)
+        data = json.loads(result.stdout) if result.stdout.strip() else []
+        return [data] if isinstance(data, dict) else data
+
+    async def get_info_light(self):
+        try:
+            ifaces, dns, routes = await asyncio.gather(
+                self._query(self.DHCP_SCRIPT), self._query(self.DNS_SCRIPT), self._query(self.ROUTE_SCRIPT)
+            )
+        except Exception as e:
+            print(f"[DEBUG] async get_info_light failed: {e}")
+            return {}
+        merged = {}
+        for entry in ifaces:
+            alias = entry.get("InterfaceAlias")
+            if alias:
+                merged[alias] = {"InterfaceAlias": alias, "Dhcp": entry.get("Dhcp"), "DNSServers": None, "Gateway": None}
+        for entry in dns:
+            if entry.get("InterfaceAlias") in merged:
+                merged[entry["InterfaceAlias"]]["DNSServers"] = entry.get("DNSServers")
+        for entry in routes:
+            if entry.get("InterfaceAlias") in merged:
+                merged[entry["InterfaceAlias"]]["Gateway"] = entry.get("NextHop")
+        return InterfaceInfo.parse_info_light(list(merged.values()))
+
+    async def take_snapshot(self) -> InterfaceInfo.Snapshot:
+        addrs, stats, light = await asyncio.gather(
+            asyncio.to_thread(self.net.net_if_addrs),
+            asyncio.to_thread(self.net.net_if_stats),
+            self.get_info_light(),
+        )
+        return InterfaceInfo.snapshot_from(self.net, addrs, stats, light)
+
+    async def get_info(self) -> List[InterfaceInfo.Info]:
+        return InterfaceInfo.build(await self.take_snapshot())
+
+    async def get_status(self, name) -> Optional[InterfaceInfo.Status]:
+        stats = await asyncio.to_thread(self.net.net_if_stats)
+        return InterfaceInfo.get_status(name, stats)
+
+
+class AsyncConfigureInterface:
+    """Applies a ConfigureInterface plan over an AsyncRunner."""
+    def __init__(self, interface: ConfigureInterface, runner: AsyncRunner, timeout=None):
+        self.interface = interface
+        self.runner = runner
+        self.timeout = timeout
+
+    async def apply(self, iface_info, diffs=None) -> ConfigureInterface.PlanResult:
+        plan = self.interface.compile_plan(iface_info, diffs)
+        return await self.apply_plan(plan)
+
+    async def apply_plan(self, plan) -> ConfigureInterface.PlanResult:
+        if not plan.steps:
+            return ConfigureInterface.PlanResult(ok=True, steps=[])
+        try:
+            result = await self.runner.run(plan.render(), timeout=self.timeout)
+        except Exception as e:
+            return ConfigureInterface.PlanResult(ok=False, steps=[], error=str(e) or type(e).__name__)
+        return ConfigureInterface.Plan.parse_result(result.stdout, result.stderr)
+
+    @staticmethod
+    async def apply_many(configs, runner: AsyncRunner, timeout=None):
+        """
+        configs: list of (ConfigureInterface, iface_info) pairs.
+        Returns PlanResults in the same order; the runner bounds concurrency.
+        """
+        return await asyncio.gather(*(
+            AsyncConfigureInterface(interface, runner, timeout).apply(info) for interface, info in configs
+        ))
@@ -0,0 +1,242 @@
+# Platform backends for the DHCP/DNS/gateway data psutil does not provide
+import calendar
+import glob
+import os
+import socket
+import time
+
+
+class Backend:
+    """
+    Supplies the per-interface extras that InterfaceInfo.build() merges with psutil:
+    get_info_light() returns {alias: {"dhcp": bool, "dns": [str], "gateway": str or None}}.
+    The *_family attributes are the address-family numbers psutil reports on this OS.
+    """
+    name = "base"
+    inet_family = 2
+    inet6_family = 23
+    link_family = 17  # only used when psutil has no AF_LINK
+
+    def get_info_light(self, runner=None):
+        raise NotImplementedError
+
+
+class WindowsBackend(Backend):
+    """DHCP/DNS/gateway from the batched PowerShell query."""
+    name = "windows"
+    inet6_family = 23
+
+    def get_info_light(self, runner=None):
+        from interfacemanager import InterfaceInfo  # interfacemanager imports this module
+        return InterfaceInfo.get_info_light(runner)
+
+
+class LinuxBackend(Backend):
+    """
+    Reads kernel and resolver state straight from the filesystem; no subprocesses.
+    root: filesystem root to read from, so fixture trees can stand in for a live host.
+
+    gateway: /proc/net/route default routes (lowest metric per interface)
+    dns: systemd-resolved per-link state, else resolv.conf nameservers for
+         interfaces that carry a default route
+    dhcp: lease files from systemd-networkd, NetworkManager, dhclient (unexpired only) and dhcpcd
+    """
+    name = "linux"
+    inet6_family = 10
+    link_family = 17  # AF_PACKET
+
+    RTF_UP = 0x1
+    RTF_GATEWAY = 0x2
+    RESOLVED_STUB = "127.0.0.53"
+
+    def __init__(self, root="/", clock=time.time):
+        self.root = root
+        self.clock = clock
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *(p.lstrip("/") for p in parts))
+
+    def _read(self, *parts):
+        return self._read_file(self._path(*parts))
+
+    @staticmethod
+    def _read_file(path):
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    # --- Interfaces ---
+
+    def interface_indexes(self):
+        """{name: ifindex} from /sys/class/net."""
+        indexes = {}
+        base = self._path("sys/class/net")
+        try:
+            names = os.listdir(base)
+        except OSError:
+            return indexes
+        for name in names:
+            text = self._read("sys/class/net", name, "ifindex")
+            if text and text.strip().isdigit():
+                indexes[name] = int(text.strip())
+        return indexes
+
+    # --- Gateway ---
+
+    def gateways(self):
+        """{iface: gateway} from the default routes in /proc/net/route."""
+        text = self._read("proc/net/route")
+        best = {}
+        if not text:
+            return {}
+        for line in text.splitlines()[1:]:
+            fields = line.split()
+            if len(fields) < 8:
+                continue
+            iface, dest, gateway, flags, metric, mask = fields[0], fields[1], fields[2], fields[3], fields[6], fields[7]
+            try:
+                flags = int(flags, 16)
+                if int(dest, 16) != 0 or int(mask, 16) != 0:
+                    continue
+                if not flags & self.RTF_UP or not flags & self.RTF_GATEWAY:
+                    continue
+                # Stored as a little-endian hex word
+                addr = socket.inet_ntoa(int(gateway, 16).to_bytes(4, "little"))
+                metric = int(metric)
+            except ValueError:
+                continue
+            if iface not in best or metric < best[iface][0]:
+                best[iface] = (metric, addr)
+        return {iface: addr for iface, (metric, addr) in best.items()}
+
+    # --- DNS ---
+
+    @staticmethod
+    def parse_resolv_conf(text):
+        servers = []
+        for line in (text or "").splitlines():
+            fields = line.split()
+            if len(fields) >= 2 and fields[0] == "nameserver" and "." in fields[1]:
+                servers.append(fields[1])
+        return servers
+
+    def global_dns(self):
+        servers = self.parse_resolv_conf(self._read("etc/resolv.conf"))
+        if servers == [self.RESOLVED_STUB] or not servers:
+            # The stub hides the real upstreams; resolved keeps them here
+            upstream = self.parse_resolv_conf(self._read("run/systemd/resolve/resolv.conf"))
+            if upstream:
+                return upstream
+        return servers
+
+    def resolved_link_dns(self, ifindex):
+        """IPv4 DNS servers systemd-resolved has for one link, or None if it has no state."""
+        text = self._read("run/systemd/resolve/netif", str(ifindex))
+        if text is None:
+            return None
+        for line in text.splitlines():
+            if line.startswith("DNS="):
+                servers = []
+                for server in line[4:].split():
+                    server = server.split("#")[0]  # drop "#servername"
+                    if server.count(".") == 3 and ":" not in server:
+                        servers.append(server)
+                return servers
+        return []
+
+    # --- DHCP ---
+
+    @staticmethod
+    def dhclient_leases(text):
+        """{interface: expiry} for the newest lease block per interface; expiry is epoch seconds or None (never)."""
+        leases = {}
+        name = expire = None
+        for line in text.splitlines():
+            line = line.split("#")[0].strip().rstrip(";").strip()
+            if line.startswith("lease"):
+                name = expire = None
+            elif line.startswith("interface "):
+                name = line.split('"')[1] if '"' in line else line.split()[1]
+            elif line.startswith("expire "):
+                # "expire 4 2026/10/22 10:00:00" (UTC), "expire epoch 1792663200 # ..." or "expire never"
+                words = line.split()
+                try:
+                    if words[1] == "epoch":
+                        expire = float(words[2])
+                    elif words[1] != "never":
+                        expire = calendar.timegm(time.strptime(" ".join(words[2:4]), "%Y/%m/%d %H:%M:%S"))
+                except (IndexError, ValueError):
+                    expire = 0.0  # unreadable: treat as stale
+            elif line == "}" and name:
+                leases[name] = expire  # dhclient appends, so a later block replaces an earlier one
+        return leases
+
+    def dhcp_interfaces(self, indexes):
+        """Names of interfaces that have a DHCP lease on disk."""
+        found = set()
+        by_index = {str(i): n for n, i in indexes.items()}
+        for path in glob.glob(self._path("run/systemd/netif/leases/*")):
+            name = by_index.get(os.path.basename(path))
+            if name:
+                found.add(name)
+        for name in indexes:
+            patterns = (
+                f"var/lib/NetworkManager/*-{name}.lease",
+                f"var/lib/dhcpcd/{name}.lease",
+                f"var/lib/dhcpcd/dhcpcd-{name}.lease",
+                f"var/lib/dhcpcd5/dhcpcd-{name}.lease",
+            )
+            if any(glob.glob(self._path(p)) for p in patterns):
+                found.add(name)
+        # dhclient keeps every lease it ever got; only an unexpired newest one counts
+        now = self.clock()
+        for pattern in ("var/lib/dhcp/dhclient*.leases", "var/lib/dhclient/*.leases"):
+            for path in glob.glob(self._path(pattern)):
+                for name, expire in self.dhclient_leases(self._read_file(path) or "").items():
+                    if expire is None or expire > now:
+                        found.add(name)
+        return found
+
+    # --- Public API ---
+
+    def get_info_light(self, runner=None):
+        indexes = self.interface_indexes()
+        gateways = self.gateways()
+        dhcp = self.dhcp_interfaces(indexes)
+        global_dns = None
+
+        info_map = {}
+        for name in set(indexes) | set(gateways):
+            dns = None
+            if name in indexes:
+                dns = self.resolved_link_dns(indexes[name])
+            if not dns and name in gateways:
+                if global_dns is None:
+                    global_dns = self.global_dns()
+                dns = global_dns
+            info_map[name] = {
+                "dhcp": name in dhcp,
+                "dns": list(dns or []),
+                "gateway": gateways.get(name),
+            }
+        return info_map
+
+
+_default_backend = None
+
+
+def get_backend() -> Backend:
+    """The backend for this OS, created on first use."""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = LinuxBackend() if os.name == "posix" and os.path.isdir("/proc/net") else WindowsBackend()
+    return _default_backend
+
+
+def set_backend(backend: Backend):
+    """Swap the shared backend. Returns the previous one."""
+    global _default_backend
+    previous, _default_backend = _default_backend, backend
+    return previous
@@ -0,0 +1,252 @@
+# Micro-benchmarks that run anywhere: synthetic psutil data and a fake PowerShell runner, no Windows needed
+# Usage:
+#   python benchmarks.py                               print tables
+#   python benchmarks.py --save benchmarks_baseline.json
+#   python benchmarks.py --compare benchmarks_baseline.json   exit 1 on regressions
+# benchmarks_baseline.json is the committed reference (its "meta" says where it was
+# measured). Timings are machine-specific: on a different CI machine or Python,
+# regenerate it there with --save and commit it together with the change that moved the numbers.
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import compactmodel
+from backends import WindowsBackend
+from fakes import FakePsutil, fake_runner
+from interfacemanager import InterfaceInfo, InterfaceCollector, ConfigureInterface
+
+COUNTS = (1, 10, 100, 1000, 10000)
+LAUNCH_MS = 250  # simulated powershell.exe startup
+TOLERANCE = 1.5  # a metric regresses when it is this many times slower than the baseline
+NOISE_FLOOR = 0.001  # seconds; differences below this are timer noise
+
+
+def _timeit(func, repeat=3):
+    """Best-of-N wall time in seconds."""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _per_iface_stats_refresh(net):
+    """The old get_info loop shape: one net_if_stats() per interface."""
+    infos = InterfaceInfo.build(InterfaceInfo.snapshot_from(net, net.net_if_addrs(), {}, {}))
+    for info in infos:
+        net.net_if_stats().get(info.name)
+    return infos
+
+
+def bench_collector(counts=COUNTS):
+    """Compare one-snapshot refreshes against per-interface stats lookups."""
+    rows = []
+    for count in counts:
+        net = FakePsutil(count)
+        collector = InterfaceCollector(net=net)
+        snapshot = _timeit(lambda: collector.refresh(light=False))
+        status = _timeit(lambda: [collector.status(n) for n in collector.names()])
+        # Quadratic; skip the largest sizes so the run stays short
+        legacy = _timeit(lambda: _per_iface_stats_refresh(net), repeat=1) if count <= 1000 else None
+        rows.append({"count": count, "snapshot_s": snapshot, "status_s": status, "per_iface_stats_s": legacy})
+    return rows
+
+
+def _measure_build(builder, snapshot):
+    """(bytes retained, seconds) for building one interface list."""
+    tracemalloc.start()
+    infos = builder(snapshot)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return infos, retained, _timeit(lambda: builder(snapshot))
+
+
+def bench_model(count=10000):
+    """Memory and comparison cost of InterfaceInfo.Info against compactmodel.CompactInfo."""
+    net = FakePsutil(count)
+    snapshot = InterfaceInfo.snapshot_from(net, net.net_if_addrs(), net.net_if_stats(), {})
+    rows = []
+    for label, builder in (("dataclass", InterfaceInfo.build), ("compact", compactmodel.build)):
+        infos, retained, build_s = _measure_build(builder, snapshot)
+        again = builder(snapshot)
+        compare_s = _timeit(lambda: [a == b for a, b in zip(infos, again)])
+        if label == "compact":
+            linklocal_s = _timeit(lambda: [i.ipv4[0].is_linklocal for i in infos if i.ipv4])
+        else:
+            linklocal_s = _timeit(lambda: [InterfaceInfo._is_linklocal(i.ipv4[0]) for i in infos if i.ipv4])
+        rows.append({
+            "model": label, "count": count, "bytes": retained, "build_s": build_s,
+            "compare_s": compare_s, "linklocal_s": linklocal_s,
+        })
+    return rows
+
+
+def _make_ui():
+    """A MainUI for refresh benchmarks, or None where Tk has no display (headless CI)."""
+    try:
+        from main_ui import MainUI
+        ui = MainUI()
+    except Exception as e:
+        print(f"[DEBUG] skipping UI benchmarks: {e}")
+        return None
+    ui.root.withdraw()
+    return ui
+
+
+def bench_refresh(counts=COUNTS, ui=None):
+    """
+    Refresh-path costs per interface count, with a zero-latency fake runner so
+    only our own code is measured.
+    """
+    backend = WindowsBackend()
+    rows = []
+    for count in counts:
+        net = FakePsutil(count)
+        runner = fake_runner(net)
+        raw = net.info_light_json()
+        infos = InterfaceInfo.get_info(net=net, runner=runner, backend=backend)
+        targets = [ConfigureInterface(i.name, "10.200.0.5", "255.255.255.0", "10.200.0.1", "10.0.0.53", None) for i in infos]
+        row = {
+            "count": count,
+            "get_info_s": _timeit(lambda: InterfaceInfo.get_info(net=net, runner=runner, backend=backend)),
+            "parse_info_light_s": _timeit(lambda: InterfaceInfo.parse_info_light(json.loads(raw))),
+            "iface_compare_s": _timeit(lambda: [t.iface_compare(i) for t, i in zip(targets, infos)]),
+            "refresh_ifaces_s": None,
+        }
+        if ui is not None:
+            def redraw():
+                ui.refresh_ifaces(infos)
+                ui.root.update_idletasks()
+            ui.refresh_ifaces([])
+            row["refresh_ifaces_s"] = _timeit(redraw, repeat=1)  # first fill: builds widgets
+        rows.append(row)
+    return rows
+
+
+def bench_apply(launch_ms=LAUNCH_MS, applies=5):
+    """
+    Apply latency with simulated process launch cost: a fresh powershell per
+    call (SubprocessRunner's shape) against one session host.
+    """
+    net = FakePsutil(1)
+    info = InterfaceInfo.get_info(net=net, runner=fake_runner(net), backend=WindowsBackend())[0]
+    plan = ConfigureInterface(info.name, "10.200.0.5", "255.255.255.0", "10.200.0.1", "10.0.0.53", None).compile_plan(info)
+    rows = []
+    for label, persistent in (("per_process", False), ("session", True)):
+        runner = fake_runner(net, startup_latency=launch_ms / 1000, persistent=persistent)
+        runner.run("")  # a session host is already up by the time the user clicks Apply
+        t0 = time.perf_counter()
+        for _ in range(applies):
+            plan.apply(runner)
+        rows.append({"runner": label, "applies": applies, "apply_s": (time.perf_counter() - t0) / applies})
+    return rows
+
+
+# --- Baselines ---
+
+def metrics_from(collector_rows, refresh_rows, apply_rows):
+    """Flatten benchmark rows into {metric_name: seconds}."""
+    metrics = {}
+    for row in collector_rows:
+        for key in ("snapshot_s", "status_s", "per_iface_stats_s"):
+            metrics[f"collector.{key[:-2]}[{row['count']}]"] = row[key]
+    for row in refresh_rows:
+        for key in ("get_info_s", "parse_info_light_s", "iface_compare_s", "refresh_ifaces_s"):
+            metrics[f"refresh.{key[:-2]}[{row['count']}]"] = row[key]
+    for row in apply_rows:
+        metrics[f"apply.{row['runner']}"] = row["apply_s"]
+    return {k: v for k, v in metrics.items() if v is not None}
+
+
+def save_baseline(path, metrics, counts, launch_ms):
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "counts": list(counts),
+            "launch_ms": launch_ms,
+            "saved": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "metrics": metrics,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def compare_baseline(path, metrics, tolerance=TOLERANCE):
+    """Returns [(metric, baseline_s, current_s)] for metrics that got slower than tolerance allows."""
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)["metrics"]
+    regressions = []
+    for name, current in metrics.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if current > old * tolerance and current - old > NOISE_FLOOR:
+            regressions.append((name, old, current))
+    return regressions
+
+
+# --- Output ---
+
+def _fmt(val):
+    return f"{val * 1000:10.2f} ms" if val is not None else f"{'skipped':>13}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IP Changer benchmarks on synthetic interfaces")
+    parser.add_argument("--counts", type=lambda s: tuple(int(x) for x in s.split(",")), default=COUNTS,
+                        help="comma-separated interface counts (default: 1,10,100,1000,10000)")
+    parser.add_argument("--launch-ms", type=float, default=LAUNCH_MS, help="simulated powershell.exe startup")
+    parser.add_argument("--ui", action="store_true", help="also time MainUI.refresh_ifaces (needs a display)")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail if slower than this baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    ui = _make_ui() if args.ui else None
+
+    collector_rows = bench_collector(args.counts)
+    print(f"{'ifaces':>8} {'snapshot':>13} {'status all':>13} {'per-iface stats':>16}")
+    for row in collector_rows:
+        print(f"{row['count']:>8} {_fmt(row['snapshot_s'])} {_fmt(row['status_s'])} {_fmt(row['per_iface_stats_s']):>16}")
+    print()
+    refresh_rows = bench_refresh(args.counts, ui)
+    print(f"{'ifaces':>8} {'get_info':>13} {'parse light':>13} {'iface_compare':>13} {'refresh_ifaces':>15}")
+    for row in refresh_rows:
+        print(f"{row['count']:>8} {_fmt(row['get_info_s'])} {_fmt(row['parse_info_light_s'])} "
+              f"{_fmt(row['iface_compare_s'])} {_fmt(row['refresh_ifaces_s']):>15}")
+    print()
+    apply_rows = bench_apply(args.launch_ms)
+    print(f"{'runner':>12} {'apply':>13}   (launch {args.launch_ms:.0f} ms)")
+    for row in apply_rows:
+        print(f"{row['runner']:>12} {_fmt(row['apply_s'])}")
+    print()
+    print(f"{'model':>10} {'MiB':>8} {'build':>13} {'compare':>13} {'link-local':>13}")
+    for row in bench_model(max(args.counts)):
+        print(f"{row['model']:>10} {row['bytes'] / 2**20:8.2f} {_fmt(row['build_s'])} {_fmt(row['compare_s'])} {_fmt(row['linklocal_s'])}")
+
+    if not (args.save or args.compare):
+        return 0
+    metrics = metrics_from(collector_rows, refresh_rows, apply_rows)
+    if args.save:
+        save_baseline(args.save, metrics, args.counts, args.launch_ms)
+        print(f"\nBaseline saved to {args.save} ({len(metrics)} metrics)")
+    if args.compare:
+        regressions = compare_baseline(args.compare, metrics, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:")
+            for name, old, new in regressions:
+                print(f"  {name}: {_fmt(old).strip()} -> {_fmt(new).strip()}")
+            return 1
+        print(f"\nNo regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# Apply configurations to many interfaces at once
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+import validation
+from interfacemanager import InterfaceCollector, ConfigureInterface
+from powershell import PowerShellSession
+
+
+class _Keep:
+    """Default for a Target field that was not given: keep the interface's current value."""
+    def __repr__(self):
+        return "KEEP"
+
+
+KEEP = _Keep()
+FIELDS = ("ip", "netmask", "gateway", "dns1", "dns2")
+
+
+@dataclass
+class Target:
+    """Desired IPv4 settings for one interface. Fields left out keep their current value; None clears one."""
+    iface_name: str
+    ip: Optional[str] = KEEP
+    netmask: Optional[str] = KEEP
+    gateway: Optional[str] = KEEP
+    dns1: Optional[str] = KEEP
+    dns2: Optional[str] = KEEP
+
+    def resolve(self, info) -> "Target":
+        """A copy with every KEEP field filled from info (an InterfaceInfo.Info, or None for blanks)."""
+        first = info.ipv4[0] if info is not None and info.ipv4 else None
+        current = {
+            "ip": first.address if first else None,
+            "netmask": first.netmask if first else None,
+            "gateway": info.gateway if info is not None else None,
+            "dns1": info.dns1 if info is not None else None,
+            "dns2": info.dns2 if info is not None else None,
+        }
+        return replace(self, **{f: current[f] for f in FIELDS if getattr(self, f) is KEEP})
+
+    def to_interface(self, runner=None) -> ConfigureInterface:
+        return ConfigureInterface(
+            iface_name=self.iface_name, ip=self.ip, netmask=self.netmask,
+            gateway=self.gateway, dns1=self.dns1, dns2=self.dns2, runner=runner
+        )
+
+
+@dataclass
+class TargetResult:
+    iface_name: str
+    ok: bool
+    applied: bool = False
+    errors: List[str] = field(default_factory=list)
+    steps: List[str] = field(default_factory=list)
+    plan_result: Optional[ConfigureInterface.PlanResult] = None
+    elapsed: float = 0.0
+
+
+@dataclass
+class BulkResult:
+    ok: bool
+    results: Dict[str, TargetResult]
+    elapsed: float = 0.0
+
+    def failed(self):
+        return [r for r in self.results.values() if not r.ok]
+
+
+def validate_targets(targets, current) -> Dict[str, List[str]]:
+    """
+    Check every target before anything is applied.
+    current: {name: InterfaceInfo.Info}. Returns {iface_name: [errors]} for bad targets.
+    """
+    targets = [t.resolve(current.get(t.iface_name)) for t in targets]
+    errors = {}
+    seen_names = set()
+    seen_ips = {}
+    # Addresses already held by interfaces this plan leaves alone
+    names = {t.iface_name for t in targets}
+    held = {
+        addr.address: name
+        for name, info in current.items() if name not in names
+        for addr in info.ipv4 or []
+    }
+    # Address rules run once over the whole plan (vectorized when NumPy is installed)
+    checked = validation.validate_columns(
+        [t.ip for t in targets], [t.netmask for t in targets], [t.gateway for t in targets],
+        [t.dns1 for t in targets], [t.dns2 for t in targets],
+    )
+    for row, target in enumerate(targets):
+        problems = []
+        if target.iface_name in seen_names:
+            problems.append("Interface is listed more than once.")
+        seen_names.add(target.iface_name)
+        if target.iface_name not in current:
+            problems.append("Interface not found.")
+        problems.extend(checked.errors(row))
+        if target.ip:
+            other = seen_ips.get(target.ip) or held.get(target.ip)
+            if other:
+                problems.append(f"IP Address {target.ip} is also assigned to {other}.")
+            seen_ips[target.ip] = target.iface_name
+        if problems:
+            errors[target.iface_name] = problems
+    return errors
+
+
+def bulk_apply(targets, current=None, runner_factory=PowerShellSession, max_workers=4, timeout=None) -> BulkResult:
+    """
+    Validate all targets, then apply them concurrently, one runner per worker thread.
+    Nothing is applied if any target fails validation.
+    current: list of InterfaceInfo.Info (defaults to a fresh collector refresh).
+    """
+    t0 = time.time()
+    if current is None:
+        current = InterfaceCollector().refresh()
+    current = {info.name: info for info in current}
+    targets = [t.resolve(current.get(t.iface_name)) for t in targets]
+
+    invalid = validate_targets(targets, current)
+    if invalid:
+        results = {
+            t.iface_name: TargetResult(t.iface_name, ok=False, errors=invalid.get(t.iface_name, ["Not applied: other targets failed validation."]))
+            for t in targets
+        }
+        return BulkResult(ok=False, results=results, elapsed=time.time() - t0)
+
+    local = threading.local()
+    runners = []
+    runners_lock = threading.Lock()
+
+    def worker_runner():
+        if not hasattr(local, "runner"):
+            local.runner = runner_factory()
+            with runners_lock:
+                runners.append(local.runner)
+        return local.runner
+
+    def apply_one(target):
+        start = time.time()
+        interface = target.to_interface()
+        plan = interface.compile_plan(current[target.iface_name])
+        if not plan:
+            return TargetResult(target.iface_name, ok=True, elapsed=time.time() - start)
+        result = plan.apply(worker_runner(), timeout=timeout)
+        return TargetResult(
+            target.iface_name,
+            ok=result.ok,
+            applied=True,
+            errors=[f"{s.name}: {s.error}" for s in result.failed_steps()] + ([result.error] if result.error else []),
+            steps=plan.step_names(),
+            plan_result=result,
+            elapsed=time.time() - start,
+        )
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as pool:
+            for target, result in zip(targets, pool.map(apply_one, targets)):
+                results[target.iface_name] = result
+    finally:
+        for runner in runners:
+            runner.close()
+    return BulkResult(ok=all(r.ok for r in results.values()), results=results, elapsed=time.time() - t0)
@@ -0,0 +1,230 @@
+# Headless command-line entry point: no Tk, JSON on stdout, meaningful exit codes
+# Usage:
+#   python cli.py list
+#   python cli.py show "Ethernet"
+#   python cli.py diff "Ethernet" --ip 192.168.1.10 --netmask 255.255.255.0
+#   python cli.py apply "Ethernet" --ip 192.168.1.10 --netmask 255.255.255.0 --gateway 192.168.1.1
+#   python cli.py export --interval 10 > inventory.ndjson
+# Options left out keep the interface's current value; an empty string clears it.
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+
+from exporter import NdjsonExporter
+from interfacemanager import InterfaceCollector, ConfigureInterface, RefreshManager
+
+EXIT_OK = 0
+EXIT_FAILED = 1     # apply failed (and was rolled back), or --exit-code diff found changes
+EXIT_USAGE = 2      # argparse's own code for bad arguments
+EXIT_NOT_FOUND = 3  # no interface with that name
+EXIT_INVALID = 4    # target settings failed validation
+
+FIELDS = ("ip", "netmask", "gateway", "dns1", "dns2")
+
+
+def _emit(data, pretty=False):
+    json.dump(data, sys.stdout, indent=2 if pretty else None, default=str)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def _info_dict(info, status=None):
+    data = asdict(info)
+    if status is not None:
+        data["link"] = asdict(status)
+    return data
+
+
+def _current_values(info):
+    """The interface's settings in ConfigureInterface terms."""
+    first = info.ipv4[0] if info.ipv4 else None
+    return {
+        "ip": first.address if first else None,
+        "netmask": first.netmask if first else None,
+        "gateway": info.gateway,
+        "dns1": info.dns1,
+        "dns2": info.dns2,
+    }
+
+
+def _target(args, info) -> ConfigureInterface:
+    values = _current_values(info)
+    for name in FIELDS:
+        given = getattr(args, name)
+        if given is not None:
+            values[name] = given.strip() or None
+    return ConfigureInterface(iface_name=info.name, **values)
+
+
+def _lookup(collector, args):
+    info = collector.get(args.name)
+    if info is None:
+        _emit({"error": "not_found", "name": args.name, "interfaces": collector.names()}, args.pretty)
+    return info
+
+
+def _plan_for(args, collector):
+    """(info, target, diffs, plan) or an exit code after reporting the problem."""
+    info = _lookup(collector, args)
+    if info is None:
+        return EXIT_NOT_FOUND
+    target = _target(args, info)
+    errors = target.validate_syntax()
+    if errors:
+        _emit({"error": "invalid", "name": info.name, "errors": errors}, args.pretty)
+        return EXIT_INVALID
+    diffs = target.iface_compare(info)
+    plan = target.compile_plan(info, diffs) if diffs else None
+    return info, target, diffs, plan
+
+
+def _diff_dict(diffs):
+    return {field: {"current": old, "target": new} for field, (old, new) in diffs.items()}
+
+
+# --- Commands ---
+
+def cmd_list(args, collector):
+    infos = collector.refresh(light=not args.no_light)
+    if args.names:
+        _emit([i.name for i in infos], args.pretty)
+    else:
+        _emit([_info_dict(i) for i in infos], args.pretty)
+    return EXIT_OK
+
+
+def cmd_show(args, collector):
+    collector.refresh(light=not args.no_light)
+    info = _lookup(collector, args)
+    if info is None:
+        return EXIT_NOT_FOUND
+    _emit(_info_dict(info, collector.status(info.name)), args.pretty)
+    return EXIT_OK
+
+
+def cmd_diff(args, collector):
+    collector.refresh()
+    planned = _plan_for(args, collector)
+    if isinstance(planned, int):
+        return planned
+    info, target, diffs, plan = planned
+    _emit({
+        "name": info.name,
+        "changed": bool(diffs),
+        "diff": _diff_dict(diffs),
+        "steps": plan.step_names() if plan else [],
+    }, args.pretty)
+    return EXIT_FAILED if args.exit_code and diffs else EXIT_OK
+
+
+def cmd_apply(args, collector):
+    collector.refresh()
+    planned = _plan_for(args, collector)
+    if isinstance(planned, int):
+        return planned
+    info, target, diffs, plan = planned
+    output = {"name": info.name, "changed": bool(diffs), "diff": _diff_dict(diffs)}
+    if not diffs:
+        output.update(ok=True, applied=False, steps=[])
+        _emit(output, args.pretty)
+        return EXIT_OK
+    if args.dry_run:
+        output.update(ok=True, applied=False, steps=plan.step_names(), script=plan.render())
+        _emit(output, args.pretty)
+        return EXIT_OK
+    result = plan.apply(collector.runner, timeout=args.timeout)
+    output.update(
+        ok=result.ok,
+        applied=True,
+        rolled_back=result.rolled_back,
+        error=result.error,
+        steps=[asdict(s) for s in result.steps],
+    )
+    if result.ok:
+        collector.refresh()
+        fresh = collector.get(info.name)
+        output["after"] = _info_dict(fresh) if fresh else None
+    _emit(output, args.pretty)
+    return EXIT_OK if result.ok else EXIT_FAILED
+
+
+def cmd_export(args, collector):
+    refresher = RefreshManager(collector)
+    stream = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    exporter = NdjsonExporter(stream, batch_size=args.batch, resync_every=args.resync)
+    try:
+        exporter.run(refresher.tick, interval=args.interval, polls=args.polls)
+    except KeyboardInterrupt:
+        pass  # run() has already flushed
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return EXIT_OK
+
+
+# --- Argument parsing ---
+
+def _add_target_options(parser):
+    parser.add_argument("name", help="interface alias, as shown by `list --names`")
+    parser.add_argument("--ip")
+    parser.add_argument("--netmask")
+    parser.add_argument("--gateway")
+    parser.add_argument("--dns1")
+    parser.add_argument("--dns2")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ipchanger", description="Inspect and configure IPv4 settings without the GUI.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--pretty", action="store_true", help="indent the JSON output")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", parents=[common], help="all interfaces")
+    p.add_argument("--names", action="store_true", help="only the interface names")
+    p.add_argument("--no-light", action="store_true", help="skip the DHCP/DNS/gateway query")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("show", parents=[common], help="one interface, with link status")
+    p.add_argument("name")
+    p.add_argument("--no-light", action="store_true", help="skip the DHCP/DNS/gateway query")
+    p.set_defaults(func=cmd_show)
+
+    p = sub.add_parser("diff", parents=[common], help="what apply would change, without changing it")
+    _add_target_options(p)
+    p.add_argument("--exit-code", action="store_true", help="exit 1 when there are changes")
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser("apply", parents=[common], help="apply the settings as one transactional plan")
+    _add_target_options(p)
+    p.add_argument("--dry-run", action="store_true", help="print the plan script instead of running it")
+    p.add_argument("--timeout", type=float, default=None, help="seconds before the plan is abandoned")
+    p.set_defaults(func=cmd_apply)
+
+    p = sub.add_parser("export", parents=[common], help="stream the inventory as NDJSON: a snapshot, then deltas")
+    p.add_argument("--interval", type=float, default=5.0, help="seconds between polls")
+    p.add_argument("--polls", type=int, default=None, help="stop after this many polls (default: run until Ctrl+C)")
+    p.add_argument("--output", help="append to this file instead of stdout")
+    p.add_argument("--batch", type=int, default=256, help="records written per flush")
+    p.add_argument("--resync", type=int, default=None, help="write a full snapshot every N polls")
+    p.set_defaults(func=cmd_export)
+    return parser
+
+
+def main(argv=None, collector=None) -> int:
+    args = build_parser().parse_args(argv)
+    collector = collector or InterfaceCollector()
+    try:
+        return args.func(args, collector)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); keep the interpreter from failing on exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_FAILED
+    except Exception as e:
+        _emit({"error": "exception", "type": type(e).__name__, "message": str(e)}, getattr(args, "pretty", False))
+        return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
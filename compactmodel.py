@@ -0,0 +1,229 @@
+# Compact interface model: slotted records with integer-packed addresses
+import socket
+import sys
+from collections import namedtuple
+from operator import itemgetter
+from typing import List, Optional, Union
+
+from interfacemanager import InterfaceInfo
+
+LINKLOCAL_NET = 0xA9FE0000  # 169.254.0.0/16
+LINKLOCAL_MASK = 0xFFFF0000
+
+
+# Values that do not pack (a malformed address, a non-contiguous mask) are kept
+# as the original string, so converting back never loses what psutil reported.
+
+def ipv4_to_int(address: Optional[str]) -> Union[int, str, None]:
+    """The address as a 32-bit int; anything but a dotted quad comes back unchanged."""
+    if not address:
+        return None
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+    except OSError:
+        return address
+
+
+def int_to_ipv4(value: Union[int, str, None]) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+
+def mask_to_prefix(netmask: Optional[str]) -> Union[int, str, None]:
+    """Prefix length of a dotted mask; a malformed or non-contiguous mask comes back unchanged."""
+    mask = ipv4_to_int(netmask)
+    if mask is None or isinstance(mask, str):
+        return mask
+    host_bits = (~mask & 0xFFFFFFFF).bit_length()
+    if mask != (0xFFFFFFFF << host_bits) & 0xFFFFFFFF:
+        return netmask
+    return 32 - host_bits
+
+
+def prefix_to_mask(prefixlen: Union[int, str, None]) -> Optional[str]:
+    if prefixlen is None or isinstance(prefixlen, str):
+        return prefixlen
+    return int_to_ipv4((0xFFFFFFFF << (32 - prefixlen)) & 0xFFFFFFFF)
+
+
+class IPv4Addr(tuple):
+    """
+    (value, prefixlen): the address as a 32-bit int plus prefix length, either
+    one left as its string when it does not pack. A tuple subclass, so equality
+    and hashing run in C; renders like IPv4Data.
+    """
+    __slots__ = ()
+
+    def __new__(cls, value: Union[int, str, None], prefixlen: Union[int, str, None] = None):
+        return tuple.__new__(cls, (value, prefixlen))
+
+    @classmethod
+    def parse(cls, address, netmask=None):
+        return cls(ipv4_to_int(address), mask_to_prefix(netmask))
+
+    value = property(itemgetter(0))
+    prefixlen = property(itemgetter(1))
+
+    @property
+    def address(self):
+        return int_to_ipv4(self[0])
+
+    @property
+    def netmask(self):
+        return prefix_to_mask(self[1])
+
+    @property
+    def is_linklocal(self):
+        return isinstance(self[0], int) and (self[0] & LINKLOCAL_MASK) == LINKLOCAL_NET
+
+    def __repr__(self):
+        return f"IPv4Addr({self.address}/{self[1]})"
+
+
+class IPv6Addr(tuple):
+    """(value, scope, netmask): the address as a 128-bit int; netmask is kept as given."""
+    __slots__ = ()
+
+    def __new__(cls, value: int, scope: Optional[str] = None, netmask: Optional[str] = None):
+        return tuple.__new__(cls, (value, scope, netmask))
+
+    @classmethod
+    def parse(cls, address, netmask=None):
+        base, _, scope = address.partition("%")
+        try:
+            value = int.from_bytes(socket.inet_pton(socket.AF_INET6, base), "big")
+        except OSError:
+            return None
+        return cls(value, sys.intern(scope) if scope else None, netmask)
+
+    value = property(itemgetter(0))
+    scope = property(itemgetter(1))
+    netmask = property(itemgetter(2))
+
+    @property
+    def address(self):
+        text = socket.inet_ntop(socket.AF_INET6, self[0].to_bytes(16, "big"))
+        return f"{text}%{self[1]}" if self[1] else text
+
+    def __repr__(self):
+        return f"IPv6Addr({self.address})"
+
+
+_CompactFields = namedtuple("_CompactFields", [
+    "name", "mac", "dhcp", "ipv4", "ipv6", "gateway_int", "dns1_int", "dns2_int",
+    "isup", "important", "linklocal",
+])
+
+
+class CompactInfo(_CompactFields):
+    """
+    Immutable, tuple-backed counterpart of InterfaceInfo.Info. Addresses are ints
+    (or the original string when one does not pack) and the name is interned; gateway, dns1, dns2, status and the address objects'
+    address/netmask render strings on access, so UI and ConfigureInterface code
+    can use either model. Equality compares the packed values in C.
+    """
+    __slots__ = ()
+
+    def __new__(cls, name, mac, dhcp, ipv4, ipv6, gateway_int=None, dns1_int=None, dns2_int=None,
+                isup=False, important=True, linklocal=False):
+        return _CompactFields.__new__(
+            cls, sys.intern(name), mac, dhcp, ipv4, ipv6, gateway_int, dns1_int, dns2_int,
+            isup, important, linklocal
+        )
+
+    # --- String rendering for the UI edge ---
+
+    @property
+    def gateway(self):
+        return int_to_ipv4(self.gateway_int)
+
+    @property
+    def dns1(self):
+        return int_to_ipv4(self.dns1_int)
+
+    @property
+    def dns2(self):
+        return int_to_ipv4(self.dns2_int)
+
+    @property
+    def status(self):
+        return 'Up' if self.isup else 'Down'
+
+    def __repr__(self):
+        return f"CompactInfo({self.name!r}, ipv4={self.ipv4}, gateway={self.gateway}, status={self.status})"
+
+    # --- Conversion ---
+
+    @classmethod
+    def from_info(cls, info) -> 'CompactInfo':
+        return cls(
+            name=info.name,
+            mac=info.mac,
+            dhcp=info.dhcp,
+            ipv4=tuple(IPv4Addr.parse(a.address, a.netmask) for a in info.ipv4) if info.ipv4 else None,
+            ipv6=tuple(filter(None, (IPv6Addr.parse(a.address, a.netmask) for a in info.ipv6))) or None if info.ipv6 else None,
+            gateway_int=ipv4_to_int(info.gateway),
+            dns1_int=ipv4_to_int(info.dns1),
+            dns2_int=ipv4_to_int(info.dns2),
+            isup=info.status == 'Up',
+            important=info.important,
+            linklocal=info.linklocal,
+        )
+
+    def to_info(self) -> InterfaceInfo.Info:
+        return InterfaceInfo.Info(
+            name=self.name,
+            mac=self.mac,
+            dhcp=self.dhcp,
+            ipv4=[InterfaceInfo.IPv4Data(a.address, a.netmask) for a in self.ipv4] if self.ipv4 else None,
+            ipv6=[InterfaceInfo.IPv6Data(a.address, a.netmask) for a in self.ipv6] if self.ipv6 else None,
+            gateway=self.gateway,
+            dns1=self.dns1,
+            dns2=self.dns2,
+            status=self.status,
+            important=self.important,
+            linklocal=self.linklocal,
+        )
+
+
+def build(snapshot: InterfaceInfo.Snapshot) -> List[CompactInfo]:
+    """InterfaceInfo.build() producing CompactInfo records directly."""
+    mac_family = snapshot.mac_family
+    inet6_family = snapshot.inet6_family
+    stats = snapshot.stats
+    info_map = snapshot.light
+
+    result = []
+    for name, addr_list in snapshot.addrs.items():
+        mac = None
+        ipv4s = []
+        ipv6s = []
+        for addr in addr_list:
+            if addr.family == mac_family:
+                mac = addr.address
+            elif addr.family == 2:  # AF_INET
+                ipv4s.append(IPv4Addr.parse(addr.address, addr.netmask))
+            elif addr.family == inet6_family:  # AF_INET6
+                parsed = IPv6Addr.parse(addr.address, addr.netmask)
+                if parsed is not None:
+                    ipv6s.append(parsed)
+        ipv4s.sort(key=lambda x: x.is_linklocal)
+
+        extras = info_map.get(name, {})
+        dns_list = extras.get("dns", [])
+        stat = stats.get(name)
+        result.append(CompactInfo(
+            name=name,
+            mac=mac,
+            dhcp=extras.get("dhcp", False),
+            ipv4=tuple(ipv4s) or None,
+            ipv6=tuple(ipv6s) or None,
+            gateway_int=ipv4_to_int(extras.get("gateway")),
+            dns1_int=ipv4_to_int(dns_list[0]) if len(dns_list) > 0 else None,
+            dns2_int=ipv4_to_int(dns_list[1]) if len(dns_list) > 1 else None,
+            isup=bool(stat and stat.isup),
+            important=InterfaceInfo._is_important(name, mac),
+            linklocal=ipv4s[0].is_linklocal if ipv4s else False,
+        ))
+    return result
@@ -0,0 +1,192 @@
+# Stream interface inventories as newline-delimited JSON: one snapshot, then deltas
+import json
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from typing import Dict, List, Optional
+
+from interfacediff import diff, InterfaceAdded, InterfaceRemoved, InterfaceModified
+from interfacemanager import InterfaceInfo
+
+# Record types; every record has "seq" (1, 2, 3, ... with no gaps) and "ts" (epoch seconds)
+SNAPSHOT = "snapshot"  # {"count"}: start of a full state; drop everything, `count` adds follow
+ADD = "add"            # {"name", "data"}: a whole interface
+UPDATE = "update"      # {"name", "fields"}: only the fields that changed
+REMOVE = "remove"      # {"name"}
+
+
+def info_dict(info) -> dict:
+    """JSON-ready dict for an InterfaceInfo.Info or compactmodel.CompactInfo."""
+    if not is_dataclass(info):
+        info = info.to_info()
+    return asdict(info)
+
+
+class DeltaEncoder:
+    """
+    Turns successive interface lists into records (without seq/ts): the first
+    encode() returns a snapshot, later ones only what changed.
+    resync_every: return a fresh snapshot every N calls.
+    """
+    def __init__(self, resync_every=None):
+        self.resync_every = resync_every
+        self.polls = 0
+        self.current: Dict[str, object] = {}
+        self._snapshot_taken = False
+
+    @staticmethod
+    def snapshot_records(info_map):
+        records = [{"type": SNAPSHOT, "count": len(info_map)}]
+        records.extend({"type": ADD, "name": name, "data": info_dict(info)} for name, info in info_map.items())
+        return records
+
+    def encode(self, infos) -> List[dict]:
+        new_map = {i.name: i for i in infos}
+        self.polls += 1
+        resync = self.resync_every and self.polls % self.resync_every == 0
+        if not self._snapshot_taken or resync:
+            records = self.snapshot_records(new_map)
+            self._snapshot_taken = True
+        else:
+            records = []
+            updates = {}
+            for event in diff(self.current, new_map):
+                if isinstance(event, InterfaceRemoved):
+                    records.append({"type": REMOVE, "name": event.name})
+                elif isinstance(event, InterfaceAdded):
+                    records.append({"type": ADD, "name": event.name, "data": info_dict(event.info)})
+                elif isinstance(event, InterfaceModified):
+                    updates.setdefault(event.name, set()).update(event.changes)
+            for name, fields in updates.items():
+                data = info_dict(new_map[name])
+                records.append({"type": UPDATE, "name": name, "fields": {f: data[f] for f in sorted(fields)}})
+        self.current = new_map
+        return records
+
+
+class NdjsonExporter:
+    """
+    The first export() writes a snapshot (a SNAPSHOT record plus one ADD per
+    interface); later calls write only ADD/UPDATE/REMOVE for what changed.
+    Memory is the current state plus at most batch_size pending lines, however
+    long it runs. Lines are written and flushed together once batch_size
+    records are pending, or at the end of a poll once flush_interval has passed.
+    resync_every: write a fresh snapshot every N polls so late readers can join.
+    """
+    def __init__(self, stream, batch_size=256, flush_interval=1.0, resync_every=None, clock=time.monotonic):
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.encoder = DeltaEncoder(resync_every)
+        self.seq = 0
+        self.records = 0
+        self.flushes = 0
+        self._pending = []
+        self._flushed_at = clock()
+
+    @property
+    def polls(self):
+        return self.encoder.polls
+
+    def _emit(self, record):
+        self.seq += 1
+        record["seq"] = self.seq
+        record["ts"] = round(time.time(), 3)
+        self._pending.append(json.dumps(record, separators=(",", ":"), default=str))
+        self.records += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._pending.append("")  # trailing newline
+            self.stream.write("\n".join(self._pending))
+            self._pending = []
+        self.stream.flush()
+        self.flushes += 1
+        self._flushed_at = self.clock()
+
+    def export(self, infos) -> int:
+        """Write the records for one poll. Returns how many were written."""
+        records = self.encoder.encode(infos)
+        for record in records:
+            self._emit(record)
+        if self._pending and self.clock() - self._flushed_at >= self.flush_interval:
+            self.flush()
+        return len(records)
+
+    def run(self, sample, interval=5.0, polls=None, stop: Optional[threading.Event] = None):
+        """
+        Export sample() every `interval` seconds until `polls` polls or stop is set.
+        sample: returns the current interface list (e.g. RefreshManager.tick).
+        """
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                self.export(sample())
+                if polls is not None and self.polls >= polls:
+                    break
+                stop.wait(interval)
+        finally:
+            self.flush()
+
+
+def info_from_dict(data) -> InterfaceInfo.Info:
+    """Inverse of info_dict() for InterfaceInfo.Info."""
+    return InterfaceInfo.Info(
+        name=data["name"],
+        mac=data.get("mac"),
+        dhcp=data.get("dhcp", False),
+        ipv4=[InterfaceInfo.IPv4Data(**a) for a in data["ipv4"]] if data.get("ipv4") else None,
+        ipv6=[InterfaceInfo.IPv6Data(**a) for a in data["ipv6"]] if data.get("ipv6") else None,
+        gateway=data.get("gateway"),
+        dns1=data.get("dns1"),
+        dns2=data.get("dns2"),
+        status=data.get("status"),
+        important=data.get("important", True),
+        linklocal=data.get("linklocal", False),
+    )
+
+
+class StateRebuilder:
+    """
+    Consumer side: feed records in order to rebuild {name: interface dict}.
+    A gap in seq means records were lost; `synced` stays False until the next
+    SNAPSHOT arrives, and records before it are ignored.
+    """
+    def __init__(self):
+        self.state: Dict[str, dict] = {}
+        self.seq = 0
+        self.gaps = 0
+        self.synced = False
+
+    def feed(self, record) -> bool:
+        """Apply one record (dict or JSON line). Returns whether state is trustworthy."""
+        if isinstance(record, str):
+            record = json.loads(record)
+        seq = record["seq"]
+        if self.seq and seq != self.seq + 1:
+            self.gaps += 1
+            self.synced = False
+        self.seq = seq
+        kind = record["type"]
+        if kind == SNAPSHOT:
+            self.state = {}
+            self.synced = True
+        elif not self.synced:
+            pass
+        elif kind == ADD:
+            self.state[record["name"]] = record["data"]
+        elif kind == UPDATE:
+            self.state.setdefault(record["name"], {}).update(record["fields"])
+        elif kind == REMOVE:
+            self.state.pop(record["name"], None)
+        return self.synced
+
+    def feed_lines(self, lines) -> bool:
+        synced = self.synced
+        for line in lines:
+            if line.strip():
+                synced = self.feed(line)
+        return synced
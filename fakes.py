@@ -0,0 +1,148 @@
+# Synthetic stand-ins for psutil so interface code can run off Windows
+import json
+from collections import namedtuple
+
+from powershell import FakeRunner
+
+# Same field layout as psutil's own named tuples
+snicaddr = namedtuple('snicaddr', ['family', 'address', 'netmask', 'broadcast', 'ptp'])
+snicstats = namedtuple('snicstats', ['isup', 'duplex', 'speed', 'mtu', 'flags'])
+
+
+class FakePsutil:
+    """
+    Drop-in for the psutil net_if_* API with `count` synthetic adapters.
+    Like the real thing, every call builds fresh dicts, so call counts and
+    per-call cost scale with the adapter count.
+    Families follow Windows numbering: AF_LINK=-1, AF_INET=2, AF_INET6=23.
+    """
+    AF_LINK = -1
+    AF_INET6 = 23  # real psutil has no such attribute; lets snapshots decode the fake data off Windows
+
+    def __init__(self, count=10, linklocal_every=7, down_every=5):
+        self.count = count
+        self.linklocal_every = linklocal_every
+        self.down_every = down_every
+        self.calls = {"net_if_addrs": 0, "net_if_stats": 0}
+        self.overrides = {}  # name -> {"ipv4": (addr, mask), "isup": bool} for simulating changes
+        self.removed = set()
+
+    @staticmethod
+    def iface_name(i):
+        if i == 0:
+            return "Ethernet"
+        return f"vEthernet (Switch {i})"
+
+    def _names(self):
+        """(index, name) pairs; indices stay stable when adapters are removed."""
+        names = ((i, self.iface_name(i)) for i in range(self.count))
+        return [(i, n) for i, n in names if n not in self.removed]
+
+    def net_if_addrs(self):
+        self.calls["net_if_addrs"] += 1
+        result = {}
+        for i, name in self._names():
+            mac = "00-15-5D-%02X-%02X-%02X" % ((i >> 16) & 0xFF, (i >> 8) & 0xFF, i & 0xFF)
+            if self.linklocal_every and i % self.linklocal_every == self.linklocal_every - 1:
+                ipv4 = (f"169.254.{(i >> 8) & 0xFF}.{i & 0xFF}", "255.255.0.0")
+            else:
+                ipv4 = (f"10.{(i >> 16) & 0xFF}.{(i >> 8) & 0xFF}.{(i & 0xFF) or 1}", "255.255.255.0")
+            ipv4 = self.overrides.get(name, {}).get("ipv4", ipv4)
+            result[name] = [
+                snicaddr(self.AF_LINK, mac, None, None, None),
+                snicaddr(2, ipv4[0], ipv4[1], None, None),
+                snicaddr(23, f"fe80::215:5dff:fe{i & 0xFF:02x}:{i:04x}", None, None, None),
+            ]
+        return result
+
+    def net_if_stats(self):
+        self.calls["net_if_stats"] += 1
+        result = {}
+        for i, name in self._names():
+            isup = not (self.down_every and i % self.down_every == self.down_every - 1)
+            isup = self.overrides.get(name, {}).get("isup", isup)
+            result[name] = snicstats(isup, 2, 10000, 1500, "")
+        return result
+
+    def info_light_json(self):
+        """What the get_info_light PowerShell query would print for these adapters."""
+        rows = []
+        for i, name in self._names():
+            ipv4 = self.overrides.get(name, {}).get("ipv4")
+            static = i % 3 == 0
+            gateway = None
+            if static and not ipv4:
+                gateway = f"10.{(i >> 16) & 0xFF}.{(i >> 8) & 0xFF}.254"
+            rows.append({
+                "InterfaceAlias": name,
+                "Dhcp": 0 if static else 1,  # ConvertTo-Json writes the enum as a number
+                "DNSServers": "10.0.0.53,10.0.1.53" if static else None,
+                "Gateway": gateway,
+            })
+        return json.dumps(rows)
+
+    def reset_calls(self):
+        for key in self.calls:
+            self.calls[key] = 0
+
+
+PLAN_OK = '{"ok": true, "rolled_back": false, "steps": []}'
+
+
+def fake_runner(net, latency=0.0, startup_latency=0.0, persistent=True):
+    """
+    FakeRunner that answers the get_info_light query from `net` and reports
+    success for any configuration plan. startup_latency simulates the cost of
+    launching powershell.exe (charged once when persistent, else on every call).
+    """
+    return FakeRunner(
+        responses=[("Get-NetIPInterface -AddressFamily IPv4 | Select-Object", lambda script: net.info_light_json())],
+        latency=latency, startup_latency=startup_latency, persistent=persistent, default=PLAN_OK,
+    )
+
+
+def fake_agent(count=4, latency=0.0, token="fake-token", fast=1.0, slow=30.0, port=0):
+    """
+    A started agent.Agent on a loopback port (a free one by default), serving
+    `count` synthetic adapters; a stand-in host for fleet.py. The token file
+    is not written.
+    latency: seconds every PowerShell call takes, to simulate a slow host.
+    """
+    from agent import Agent
+    from backends import WindowsBackend
+    from interfacemanager import InterfaceCollector
+    net = FakePsutil(count)
+    collector = InterfaceCollector(net=net, runner=fake_runner(net, latency=latency), backend=WindowsBackend())
+    return Agent(collector=collector, port=port, token=token, fast=fast, slow=slow).start(write_token=False)
+
+
+def fake_dns_server(delay=0.0, host="127.0.0.1"):
+    """
+    A UDP stub on a free port that answers every query with an empty
+    response after `delay` seconds. Returns (port, stop).
+    """
+    import socket
+    import threading
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, 0))
+    stopped = threading.Event()
+
+    def serve():
+        while not stopped.is_set():
+            try:
+                data, addr = sock.recvfrom(512)
+            except OSError:
+                break
+            if len(data) < 12 or stopped.wait(delay):
+                continue
+            try:
+                sock.sendto(data[:2] + b"\x81\x80" + data[4:], addr)  # same id and question, QR set
+            except OSError:
+                break
+
+    threading.Thread(target=serve, name="fake-dns", daemon=True).start()
+
+    def stop():
+        stopped.set()
+        sock.close()
+    return sock.getsockname()[1], stop
@@ -0,0 +1,234 @@
+# Fleet mode: inventory and configure many hosts at once through their agents (agent.py)
+# Usage:
+#   python fleet.py --hosts hosts.txt --token SECRET inventory
+#   python fleet.py --hosts hosts.txt --token SECRET apply "Ethernet" --dns1 10.0.0.53 --dns2 10.0.1.53
+# hosts.txt has one "host" or "host:port" per line. Each agent runs
+# `python agent.py --host 0.0.0.0 --token SECRET --insecure`. Results print as
+# NDJSON, one line per host, in the order they finish.
+# The agent protocol is not encrypted: the token, which authorizes admin-level
+# apply, crosses the network in plaintext. Use it only on an isolated
+# management network (or through a VPN/SSH tunnel to each agent's loopback port).
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+from agent import AgentClient, DEFAULT_PORT, FIELDS
+from exporter import info_dict
+from interfacemanager import InterfaceInfo, ConfigureInterface
+
+CONCURRENCY = 32
+CONNECT_TIMEOUT = 2.0
+TIMEOUT = 10.0  # per host and request; applies get apply_timeout instead
+APPLY_TIMEOUT = 120.0
+
+
+@dataclass
+class HostResult:
+    host: str
+    ok: bool
+    ms: int
+    infos: Optional[List[InterfaceInfo.Info]] = None
+    result: Optional[ConfigureInterface.PlanResult] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = {"host": self.host, "ok": self.ok, "ms": self.ms}
+        if self.infos is not None:
+            data["infos"] = [info_dict(i) for i in self.infos]
+        if self.result is not None:
+            data["result"] = asdict(self.result)
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+def parse_address(text) -> Tuple[str, int]:
+    """"host", "host:port" or "[v6addr]:port"."""
+    text = text.strip()
+    if text.startswith("["):
+        host, _, port = text[1:].partition("]")
+        return host, int(port.lstrip(":") or DEFAULT_PORT)
+    if text.count(":") == 1:
+        host, port = text.split(":")
+        return host, int(port)
+    return text, DEFAULT_PORT
+
+
+def format_address(address) -> str:
+    host, port = address
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+
+class ConnectionPool:
+    """
+    One persistent AgentClient per host, opened on first use and reused after.
+    A connection that has closed is replaced on the next get().
+    tokens: one shared token, or {"host:port": token}.
+    """
+    def __init__(self, tokens, connect_timeout=CONNECT_TIMEOUT, timeout=TIMEOUT):
+        self.tokens = tokens
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.connects = 0
+        self._clients: Dict[Tuple[str, int], AgentClient] = {}
+        self._lock = threading.Lock()
+
+    def _token(self, address):
+        if isinstance(self.tokens, dict):
+            return self.tokens.get(format_address(address))
+        return self.tokens
+
+    def get(self, address) -> Tuple[AgentClient, bool]:
+        """(client, reused); reused is False for a connection opened just now."""
+        with self._lock:
+            client = self._clients.get(address)
+        if client is not None and not client.closed:
+            return client, True
+        client = AgentClient(
+            host=address[0], port=address[1], token=self._token(address),
+            timeout=self.timeout, connect_timeout=self.connect_timeout,
+        )
+        with self._lock:
+            self.connects += 1
+            old = self._clients.get(address)
+            self._clients[address] = client
+        if old is not None:
+            old.close()
+        return client, False
+
+    def discard(self, address):
+        with self._lock:
+            client = self._clients.pop(address, None)
+        if client is not None:
+            client.close()
+
+    def close(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+class FleetController:
+    """
+    Fans a request out to many agents with at most `concurrency` in flight and
+    yields a HostResult per host as soon as that host answers or times out.
+    A reused connection that turns out to be dead is reopened once; a timeout
+    is reported as it is, never retried.
+    """
+    def __init__(self, hosts, tokens, concurrency=CONCURRENCY, connect_timeout=CONNECT_TIMEOUT,
+                 timeout=TIMEOUT, apply_timeout=APPLY_TIMEOUT):
+        self.addresses = [parse_address(h) if isinstance(h, str) else tuple(h) for h in hosts]
+        self.apply_timeout = apply_timeout
+        self.pool = ConnectionPool(tokens, connect_timeout, timeout)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fleet")
+
+    def _call(self, address, fn) -> HostResult:
+        t0 = time.perf_counter()
+        host = format_address(address)
+        try:
+            client, reused = self.pool.get(address)
+            try:
+                result = fn(client)
+            except ConnectionError:
+                if not reused:
+                    raise
+                self.pool.discard(address)  # agent restarted since the last call
+                client, _ = self.pool.get(address)
+                result = fn(client)
+        except Exception as e:
+            if not isinstance(e, TimeoutError):
+                self.pool.discard(address)
+            return HostResult(host, False, int((time.perf_counter() - t0) * 1000), error=f"{type(e).__name__}: {e}")
+        ms = int((time.perf_counter() - t0) * 1000)
+        if isinstance(result, ConfigureInterface.PlanResult):
+            return HostResult(host, result.ok, ms, result=result, error=result.error)
+        return HostResult(host, True, ms, infos=result)
+
+    def _fan_out(self, calls):
+        """calls: [(address, fn(client))]. Yields HostResults in completion order."""
+        futures = [self._executor.submit(self._call, address, fn) for address, fn in calls]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def inventory(self, addresses=None):
+        """Every host's current interface list."""
+        return self._fan_out([(a, lambda c: c.snapshot()) for a in addresses or self.addresses])
+
+    def configure(self, targets):
+        """
+        targets: {"host:port" or address: {"name": alias, "ip": ..., ...}}. Fields
+        left out keep each host's current value; None clears one.
+        """
+        calls = []
+        for address, fields in targets.items():
+            address = parse_address(address) if isinstance(address, str) else tuple(address)
+            fields = dict(fields)
+            name = fields.pop("name")
+            calls.append((address, lambda c, name=name, fields=fields: c.configure(name, self.apply_timeout, **fields)))
+        return self._fan_out(calls)
+
+    def apply(self, interfaces):
+        """interfaces: {"host:port" or address: ConfigureInterface}; every field is sent."""
+        return self.configure({
+            address: dict({f: getattr(i, f) for f in FIELDS}, name=i.iface_name)
+            for address, i in interfaces.items()
+        })
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_hosts(path) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.split("#")[0].strip() for line in f if line.split("#")[0].strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inventory and configure many hosts through their agents.")
+    parser.add_argument("--hosts", required=True, help='file with one "host" or "host:port" per line')
+    parser.add_argument("--token", default=os.environ.get("IPCHANGER_AGENT_TOKEN"), help="the agents' shared token")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="hosts in flight at once")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds per host and request")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("inventory", help="every host's interfaces")
+    p = sub.add_parser("apply", help="the same settings on one interface of every host")
+    p.add_argument("name", help="interface alias")
+    for field in FIELDS:
+        p.add_argument(f"--{field}", help="an empty string clears it")
+    p.add_argument("--apply-timeout", type=float, default=APPLY_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    hosts = read_hosts(args.hosts)
+    failed = 0
+    with FleetController(hosts, args.token, args.concurrency, timeout=args.timeout,
+                         apply_timeout=getattr(args, "apply_timeout", APPLY_TIMEOUT)) as fleet:
+        if args.command == "inventory":
+            results = fleet.inventory()
+        else:
+            fields = {f: getattr(args, f).strip() or None for f in FIELDS if getattr(args, f) is not None}
+            results = fleet.configure({h: dict(fields, name=args.name) for h in hosts})
+        for result in results:
+            failed += not result.ok
+            sys.stdout.write(json.dumps(result.to_dict(), separators=(",", ":"), default=str) + "\n")
+            sys.stdout.flush()
+    print(f"{len(hosts) - failed} of {len(hosts)} hosts succeeded", file=sys.stderr)  # stdout stays pure NDJSON
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
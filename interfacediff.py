@@ -0,0 +1,140 @@
+# Incremental diffs between consecutive InterfaceInfo snapshots
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import tracing
+
+
+@dataclass
+class InterfaceEvent:
+    name: str
+
+
+@dataclass
+class InterfaceAdded(InterfaceEvent):
+    info: Any = None
+
+
+@dataclass
+class InterfaceRemoved(InterfaceEvent):
+    info: Any = None
+
+
+@dataclass
+class InterfaceModified(InterfaceEvent):
+    """Base for field-level changes. changes: {field: (old, new)}"""
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    info: Any = None  # the new Info
+
+
+@dataclass
+class AddressChanged(InterfaceModified):
+    pass
+
+
+@dataclass
+class DnsChanged(InterfaceModified):
+    pass
+
+
+@dataclass
+class GatewayChanged(InterfaceModified):
+    pass
+
+
+@dataclass
+class DhcpChanged(InterfaceModified):
+    pass
+
+
+@dataclass
+class LinkStateChanged(InterfaceModified):
+    pass
+
+
+# Which event type reports which Info fields
+FIELD_GROUPS = (
+    (AddressChanged, ('mac', 'ipv4', 'ipv6', 'linklocal', 'important')),
+    (DnsChanged, ('dns1', 'dns2')),
+    (GatewayChanged, ('gateway',)),
+    (DhcpChanged, ('dhcp',)),
+    (LinkStateChanged, ('status',)),
+)
+
+
+def diff_info(old, new) -> List[InterfaceModified]:
+    """Field-level events for one interface present in both snapshots."""
+    if old == new:
+        return []
+    events = []
+    for event_type, fields in FIELD_GROUPS:
+        changes = {}
+        for name in fields:
+            before = getattr(old, name, None)
+            after = getattr(new, name, None)
+            if before != after:
+                changes[name] = (before, after)
+        if changes:
+            events.append(event_type(name=new.name, changes=changes, info=new))
+    return events
+
+
+def diff(old_map: Dict[str, Any], new_map: Dict[str, Any]) -> List[InterfaceEvent]:
+    """
+    Events turning old_map into new_map (both {name: Info}).
+    Removals come first, then additions and modifications in new_map order.
+    """
+    events = []
+    for name, info in old_map.items():
+        if name not in new_map:
+            events.append(InterfaceRemoved(name=name, info=info))
+    for name, info in new_map.items():
+        previous = old_map.get(name)
+        if previous is None:
+            events.append(InterfaceAdded(name=name, info=info))
+        else:
+            events.extend(diff_info(previous, info))
+    return events
+
+
+class DiffEngine:
+    """
+    Remembers the previous snapshot and turns each new one into events.
+    Subscribers are called with the event list whenever it is non-empty.
+    """
+    def __init__(self):
+        self.current: Dict[str, Any] = {}
+        self.order: List[str] = []
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def update(self, infos) -> List[InterfaceEvent]:
+        new_map = {i.name: i for i in infos}
+        with tracing.span("diff", cat="model", interfaces=len(new_map)) as span:
+            events = diff(self.current, new_map)
+            span.set(events=len(events))
+        self.current = new_map
+        self.order = list(new_map)
+        if events:
+            for callback in list(self._subscribers):
+                callback(events)
+        return events
+
+    def get(self, name) -> Optional[Any]:
+        return self.current.get(name)
+
+    def reset(self):
+        """Forget the previous snapshot; the next update reports everything as added."""
+        self.current = {}
+        self.order = []
+
+    @staticmethod
+    def changed_names(events) -> set:
+        return {e.name for e in events}
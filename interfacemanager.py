@@ -1,10 +1,19 @@
 # Build InterfaceInfo objects from psutil.net_if_addrs()
 from dataclasses import dataclass, field
 from typing import List, Optional
-import psutil
-import subprocess
 import json
-import ipaddress
+import threading
+import time
+from powershell import get_runner
+from backends import get_backend
+import tracing
+import validation
+
+
+def _psutil():
+    """psutil, imported on first use so the window can paint before it loads."""
+    import psutil
+    return psutil
 
 
 class InterfaceInfo:
@@ -39,30 +48,69 @@ class InterfaceInfo:
         important: bool = True
         linklocal: bool = False  # <-- Add link-local flag
 
+    @dataclass
+    class Snapshot:
+        """One consistent read of psutil (and optionally PowerShell) state."""
+        addrs: dict
+        stats: dict
+        light: dict
+        mac_family: int = 17
+        inet6_family: int = 23  # 23 on Windows, 10 on Linux
+
+    @classmethod
+    def take_snapshot(cls, net=None, light=True, runner=None, backend=None) -> 'InterfaceInfo.Snapshot':
+        """
+        Read addrs, stats and the batched DHCP/DNS/gateway info exactly once.
+        net: module or object with the psutil net_if_addrs/net_if_stats API (default: psutil).
+        light: False skips the DHCP/DNS/gateway query.
+        backend: backends.Backend supplying that query; defaults to the one for this OS.
+        """
+        backend = backend or get_backend()
+        net = net or _psutil()
+        with tracing.span("snapshot", cat="psutil", light=light) as span:
+            with tracing.span("psutil.net_if_addrs", cat="psutil"):
+                addrs = net.net_if_addrs()
+            with tracing.span("psutil.net_if_stats", cat="psutil"):
+                stats = net.net_if_stats()
+            with tracing.span("info_light", cat=backend.name):
+                info_light = backend.get_info_light(runner) if light else {}
+            span.set(interfaces=len(addrs))
+        return cls.snapshot_from(net, addrs, stats, info_light, backend)
+
     @classmethod
-    def get_info(cls):
+    def snapshot_from(cls, net, addrs, stats, light, backend=None) -> 'InterfaceInfo.Snapshot':
+        """Wrap already-read data in a Snapshot with the right address families."""
+        backend = backend or get_backend()
+        return cls.Snapshot(
+            addrs=addrs,
+            stats=stats,
+            light=light,
+            mac_family=getattr(net, 'AF_LINK', backend.link_family),
+            inet6_family=getattr(net, 'AF_INET6', backend.inet6_family),
+        )
+
+    @classmethod
+    def build(cls, snapshot: 'InterfaceInfo.Snapshot') -> List['InterfaceInfo.Info']:
+        """Build every Info from a single snapshot."""
         def is_link_local(ip):
             return ip.startswith("169.254.")
 
-        # Use the batched info method
-        info_map = cls.get_info_light()
+        mac_family = snapshot.mac_family
+        inet6_family = snapshot.inet6_family
+        stats = snapshot.stats
+        info_map = snapshot.light
 
         InterfaceInfo = []
-        addrs = psutil.net_if_addrs()
-        for name, addr_list in addrs.items():
+        for name, addr_list in snapshot.addrs.items():
             mac = None
             ipv4s = []
             ipv6s = []
             for addr in addr_list:
-                if hasattr(psutil, 'AF_LINK'):
-                    mac_family = psutil.AF_LINK
-                else:
-                    mac_family = 17
                 if addr.family == mac_family:
                     mac = addr.address
                 elif addr.family == 2:  # AF_INET
                     ipv4s.append(cls.IPv4Data(address=addr.address, netmask=addr.netmask))
-                elif addr.family == 23:  # AF_INET6
+                elif addr.family == inet6_family:  # AF_INET6
                     ipv6s.append(cls.IPv6Data(address=addr.address, netmask=addr.netmask))
             ipv4s.sort(key=lambda x: is_link_local(x.address))
 
@@ -77,7 +125,7 @@ class InterfaceInfo:
             dns1 = dns_list[0] if len(dns_list) > 0 else None
             dns2 = dns_list[1] if len(dns_list) > 1 else None
 
-            stat = psutil.net_if_stats().get(name)
+            stat = stats.get(name)
             status = 'Up' if stat and stat.isup else 'Down'
 
             iface = cls.Info(
@@ -96,6 +144,10 @@ class InterfaceInfo:
             InterfaceInfo.append(iface)
         return InterfaceInfo
 
+    @classmethod
+    def get_info(cls, net=None, runner=None, backend=None):
+        return cls.build(cls.take_snapshot(net=net, runner=runner, backend=backend))
+
     @staticmethod
     def _is_important(name, mac) -> bool:
         name_lower = name.lower()
@@ -112,9 +164,14 @@ class InterfaceInfo:
         return False
 
     @staticmethod
-    def get_status(name: str) -> 'InterfaceInfo.Status':
-        stats = psutil.net_if_stats()
-        stat = stats.get(name)
+    def get_status(name: str, stats=None) -> 'InterfaceInfo.Status':
+        """stats: an existing net_if_stats() result to reuse instead of taking a new one."""
+        if stats is None:
+            stats = _psutil().net_if_stats()
+        return InterfaceInfo._status_from_stat(stats.get(name))
+
+    @staticmethod
+    def _status_from_stat(stat) -> Optional['InterfaceInfo.Status']:
         if stat:
             return InterfaceInfo.Status(
                 isup=stat.isup,
@@ -126,19 +183,22 @@ class InterfaceInfo:
             return None
 
     @classmethod
-    def get_change_signature(cls):
-        """Return a lightweight tuple for each interface for fast change detection."""
-        addrs = psutil.net_if_addrs()
-        stats = psutil.net_if_stats()
+    def get_change_signature(cls, net=None, addrs=None, stats=None):
+        """
+        Return a lightweight tuple for each interface for fast change detection.
+        addrs/stats: existing snapshots to reuse instead of reading psutil again.
+        """
+        net = net or _psutil()
+        if addrs is None:
+            addrs = net.net_if_addrs()
+        if stats is None:
+            stats = net.net_if_stats()
+        mac_family = getattr(net, 'AF_LINK', get_backend().link_family)
         sigs = []
         for name, addr_list in addrs.items():
             mac = None
             ipv4 = None
             for addr in addr_list:
-                if hasattr(psutil, 'AF_LINK'):
-                    mac_family = psutil.AF_LINK
-                else:
-                    mac_family = 17
                 if addr.family == mac_family:
                     mac = addr.address
                 elif addr.family == 2:  # AF_INET
@@ -150,9 +210,10 @@ class InterfaceInfo:
         return tuple(sigs)
 
     @staticmethod
-    def get_info_light():
+    def get_info_light(runner=None):
         """
         Returns a dict mapping InterfaceAlias to a dict with keys: gateway, dns, dhcp.
+        runner: CommandRunner to use; defaults to the shared PowerShell session.
         """
         ps_script = """
         $ifaces = Get-NetIPInterface -AddressFamily IPv4 | Select-Object InterfaceAlias, Dhcp
@@ -187,49 +248,402 @@ class InterfaceInfo:
             }
         } | ConvertTo-Json
         """
-        cmd = ["powershell", "-Command", ps_script]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = (runner or get_runner()).run(ps_script, check=True)
             data = json.loads(result.stdout) if result.stdout.strip() else []
-            if isinstance(data, dict):
-                data = [data]
-            info_map = {}
-            for entry in data:
-                alias = entry.get("InterfaceAlias")
-                if alias:
-                    dhcp_val = entry.get("Dhcp")
-                    if isinstance(dhcp_val, str):
-                        dhcp = dhcp_val.lower() == "enabled"
-                    elif isinstance(dhcp_val, bool):
-                        dhcp = dhcp_val
-                    elif isinstance(dhcp_val, int):
-                        dhcp = bool(dhcp_val)
-                    else:
-                        dhcp = False
-
-                    info_map[alias] = {
-                        "dhcp": dhcp,
-                        "dns": entry.get("DNSServers").split(",") if entry.get("DNSServers") else [],
-                        "gateway": entry.get("Gateway")
-                    }
-            return info_map
+            return InterfaceInfo.parse_info_light(data)
         except Exception as e:
             print(f"[DEBUG] _batch_iface_info failed: {e}")
             return {}
 
+    @staticmethod
+    def parse_info_light(data):
+        """Turn the decoded get_info_light JSON (object or list of objects) into the alias map."""
+        if isinstance(data, dict):
+            data = [data]
+        info_map = {}
+        for entry in data:
+            alias = entry.get("InterfaceAlias")
+            if alias:
+                dhcp_val = entry.get("Dhcp")
+                if isinstance(dhcp_val, str):
+                    dhcp = dhcp_val.lower() == "enabled"
+                elif isinstance(dhcp_val, bool):
+                    dhcp = dhcp_val
+                elif isinstance(dhcp_val, int):
+                    dhcp = bool(dhcp_val)
+                else:
+                    dhcp = False
+
+                info_map[alias] = {
+                    "dhcp": dhcp,
+                    "dns": entry.get("DNSServers").split(",") if entry.get("DNSServers") else [],
+                    "gateway": entry.get("Gateway")
+                }
+        return info_map
+
+class InterfaceCollector:
+    """
+    Holds the latest snapshot and the Info list built from it.
+    One refresh() costs one net_if_addrs(), one net_if_stats() and at most one
+    PowerShell query, however many adapters the host has.
+    """
+    def __init__(self, net=None, runner=None, backend=None, builder=None):
+        self._net = net  # None means psutil, imported on first refresh
+        self.runner = runner
+        self.backend = backend or get_backend()
+        self.builder = builder or InterfaceInfo.build  # e.g. compactmodel.build
+        self.snapshot = None
+        self.infos = []
+        self._by_name = {}
+        self._status_cache = {}
+
+    @property
+    def net(self):
+        if self._net is None:
+            self._net = _psutil()
+        return self._net
+
+    def refresh(self, light=True) -> List[InterfaceInfo.Info]:
+        snapshot = InterfaceInfo.take_snapshot(net=self.net, light=light, runner=self.runner, backend=self.backend)
+        return self.load(snapshot)
+
+    def load(self, snapshot) -> List[InterfaceInfo.Info]:
+        """Adopt an already taken snapshot."""
+        self.snapshot = snapshot
+        with tracing.span("build", cat="model", interfaces=len(snapshot.addrs)):
+            self.infos = self.builder(snapshot)
+        self._by_name = {i.name: i for i in self.infos}
+        self._status_cache = {}
+        return self.infos
+
+    def adopt(self, infos) -> List[InterfaceInfo.Info]:
+        """Use a list read elsewhere (e.g. pushed by the agent); status() then asks psutil directly."""
+        self.snapshot = None
+        self.infos = list(infos)
+        self._by_name = {i.name: i for i in self.infos}
+        self._status_cache = {}
+        return self.infos
+
+    def get(self, name) -> Optional[InterfaceInfo.Info]:
+        return self._by_name.get(name)
+
+    def names(self):
+        return list(self._by_name)
+
+    def status(self, name) -> Optional[InterfaceInfo.Status]:
+        """Status for one NIC from the current snapshot; no new psutil call."""
+        if self.snapshot is None:
+            return InterfaceInfo.get_status(name, self.net.net_if_stats())
+        if name not in self._status_cache:
+            self._status_cache[name] = InterfaceInfo._status_from_stat(self.snapshot.stats.get(name))
+        return self._status_cache[name]
+
+
+class RefreshManager:
+    """
+    Two-tier refresh in front of an InterfaceCollector.
+    Every tick reads psutil and compares get_change_signature(); the PowerShell
+    query for DHCP/DNS/gateway only runs when the signature changed, the TTL
+    expired, or invalidate() was called. hits/misses count skipped/run queries.
+    """
+    def __init__(self, collector=None, ttl=30.0, clock=time.monotonic):
+        self.collector = collector or InterfaceCollector()
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.signature = None
+        self.changed = False  # whether the last tick saw a change
+        self._light_at = None
+        self._force = True
+        self._lock = threading.Lock()  # ticks come from both the poller and the Tk thread
+
+    def invalidate(self):
+        """Force the PowerShell query on the next tick (e.g. after a local change)."""
+        self._force = True
+
+    def tick(self) -> List[InterfaceInfo.Info]:
+        with self._lock:
+            return self._tick()
+
+    def _tick(self) -> List[InterfaceInfo.Info]:
+        net = self.collector.net
+        with tracing.span("psutil.net_if_addrs", cat="psutil"):
+            addrs = net.net_if_addrs()
+        with tracing.span("psutil.net_if_stats", cat="psutil"):
+            stats = net.net_if_stats()
+        signature = InterfaceInfo.get_change_signature(net, addrs, stats)
+        now = self.clock()
+
+        previous = self.collector.snapshot
+        expired = self._light_at is None or now - self._light_at >= self.ttl
+        if self._force or expired or signature != self.signature or previous is None:
+            with tracing.span("info_light", cat=self.collector.backend.name):
+                light = self.collector.backend.get_info_light(self.collector.runner)
+            self._light_at = now
+            self._force = False
+            self.misses += 1
+        else:
+            light = previous.light
+            self.hits += 1
+
+        self.changed = (
+            previous is None or signature != self.signature or light != previous.light
+        )
+        self.signature = signature
+        self.collector.load(InterfaceInfo.snapshot_from(net, addrs, stats, light, self.collector.backend))
+        return self.collector.infos
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
 class ConfigureInterface:
-    def __init__(self, iface_name, ip, netmask, gateway, dns1, dns2):
+    @dataclass
+    class Step:
+        name: str
+        script: str  # PowerShell body; may use $alias for the interface name
+
+    @dataclass
+    class StepResult:
+        name: str
+        ok: bool
+        error: Optional[str] = None
+        ms: Optional[int] = None
+
+    @dataclass
+    class PlanResult:
+        ok: bool
+        steps: List['ConfigureInterface.StepResult']
+        rolled_back: bool = False
+        error: Optional[str] = None
+
+        def failed_steps(self):
+            return [s for s in self.steps if not s.ok]
+
+    @dataclass
+    class Plan:
+        """
+        Every change for one interface, compiled into a single PowerShell script.
+        Steps stop at the first failure; when transactional, the interface's previous
+        IPv4/gateway/DNS/DHCP state is captured first and restored on failure.
+        The script prints one JSON object with per-step results.
+        """
+        iface_name: str
+        steps: List['ConfigureInterface.Step'] = field(default_factory=list)
+        transactional: bool = True
+
+        SNAPSHOT = """
+$ipif = Get-NetIPInterface -InterfaceAlias $alias -AddressFamily IPv4
+$prev = @{
+    Dhcp = [string]$ipif.Dhcp
+    Addresses = @(Get-NetIPAddress -InterfaceAlias $alias -AddressFamily IPv4 -ErrorAction SilentlyContinue | Where-Object { $_.PrefixOrigin -eq 'Manual' } | ForEach-Object { @{ IP = $_.IPAddress; Prefix = $_.PrefixLength } })
+    Gateways = @(Get-NetRoute -InterfaceIndex $ipif.InterfaceIndex -DestinationPrefix '0.0.0.0/0' -ErrorAction SilentlyContinue | ForEach-Object { $_.NextHop })
+    Dns = @((Get-DnsClientServerAddress -InterfaceAlias $alias -AddressFamily IPv4).ServerAddresses)
+}
+"""
+
+        ROLLBACK = """
+if ($prev.Dhcp -eq 'Enabled') {
+    # Drop the static address and routes the plan added, then let DHCP take over again
+    Get-NetIPAddress -InterfaceAlias $alias -AddressFamily IPv4 -ErrorAction SilentlyContinue | Where-Object { $_.PrefixOrigin -eq 'Manual' } | Remove-NetIPAddress -Confirm:$false
+    Get-NetRoute -InterfaceIndex $ipif.InterfaceIndex -DestinationPrefix '0.0.0.0/0' -ErrorAction SilentlyContinue | Where-Object { $prev.Gateways -notcontains $_.NextHop } | Remove-NetRoute -Confirm:$false
+    Set-NetIPInterface -InterfaceAlias $alias -Dhcp Enabled
+} else {
+    Set-NetIPInterface -InterfaceAlias $alias -Dhcp Disabled
+    Get-NetIPAddress -InterfaceAlias $alias -AddressFamily IPv4 -ErrorAction SilentlyContinue | Where-Object { $_.PrefixOrigin -eq 'Manual' } | Remove-NetIPAddress -Confirm:$false
+    Get-NetRoute -InterfaceIndex $ipif.InterfaceIndex -DestinationPrefix '0.0.0.0/0' -ErrorAction SilentlyContinue | Remove-NetRoute -Confirm:$false
+    foreach ($a in $prev.Addresses) { New-NetIPAddress -InterfaceAlias $alias -IPAddress $a.IP -PrefixLength $a.Prefix | Out-Null }
+    foreach ($g in $prev.Gateways) { New-NetRoute -InterfaceAlias $alias -DestinationPrefix '0.0.0.0/0' -NextHop $g | Out-Null }
+}
+if ($prev.Dns.Count -gt 0) {
+    Set-DnsClientServerAddress -InterfaceAlias $alias -ServerAddresses $prev.Dns
+} else {
+    Set-DnsClientServerAddress -InterfaceAlias $alias -ResetServerAddresses
+}
+"""
+
+        def __bool__(self):
+            return bool(self.steps)
+
+        def step_names(self):
+            return [s.name for s in self.steps]
+
+        def render(self) -> str:
+            """Return the whole plan as one script for a single round trip."""
+            lines = [
+                "$ErrorActionPreference = 'Stop'",
+                f"$alias = {ConfigureInterface._ps_quote(self.iface_name)}",
+                "$steps = New-Object System.Collections.ArrayList",
+                "$failed = $false",
+                "$prev = $null",
+            ]
+            if self.transactional:
+                lines.append("try {" + self.SNAPSHOT + "} catch {")
+                lines.append("    [void]$steps.Add([PSCustomObject]@{ name = 'snapshot'; ok = $false; error = $_.ToString(); ms = 0 })")
+                lines.append("    $failed = $true")
+                lines.append("}")
+            for step in self.steps:
+                name = ConfigureInterface._ps_quote(step.name)
+                lines.append("if ($failed) {")
+                lines.append(f"    [void]$steps.Add([PSCustomObject]@{{ name = {name}; ok = $false; error = 'skipped'; ms = 0 }})")
+                lines.append("} else {")
+                lines.append("    $sw = [Diagnostics.Stopwatch]::StartNew()")
+                lines.append("    try {")
+                lines.append("        & {")
+                lines.append(step.script)
+                lines.append("        } | Out-Null")
+                lines.append(f"        [void]$steps.Add([PSCustomObject]@{{ name = {name}; ok = $true; error = $null; ms = $sw.ElapsedMilliseconds }})")
+                lines.append("    } catch {")
+                lines.append(f"        [void]$steps.Add([PSCustomObject]@{{ name = {name}; ok = $false; error = $_.ToString(); ms = $sw.ElapsedMilliseconds }})")
+                lines.append("        $failed = $true")
+                lines.append("    }")
+                lines.append("}")
+            lines.append("$rolledBack = $false")
+            lines.append("$rollbackError = $null")
+            if self.transactional:
+                lines.append("if ($failed -and $prev) {")
+                lines.append("    try {" + self.ROLLBACK + "    $rolledBack = $true")
+                lines.append("    } catch { $rollbackError = $_.ToString() }")
+                lines.append("}")
+            lines.append(
+                "[PSCustomObject]@{ ok = -not $failed; rolled_back = $rolledBack; "
+                "error = $rollbackError; steps = @($steps) } | ConvertTo-Json -Depth 4 -Compress"
+            )
+            return "\n".join(lines)
+
+        def apply(self, runner=None, timeout=None) -> 'ConfigureInterface.PlanResult':
+            """Run the rendered script once and parse its per-step results."""
+            if not self.steps:
+                return ConfigureInterface.PlanResult(ok=True, steps=[])
+            with tracing.span("plan.apply", cat="plan", iface=self.iface_name, steps=len(self.steps)) as span:
+                try:
+                    result = (runner or get_runner()).run(self.render(), timeout=timeout)
+                except Exception as e:
+                    span.set(error=str(e))
+                    return ConfigureInterface.PlanResult(ok=False, steps=[], error=str(e))
+                parsed = self.parse_result(result.stdout, result.stderr)
+                span.set(ok=parsed.ok, rolled_back=parsed.rolled_back)
+            self._trace_steps(span, parsed)
+            return parsed
+
+        @staticmethod
+        def _trace_steps(span, parsed):
+            """
+            The script reports per-step ms; lay those back-to-back ending where the
+            plan span ended so cmdlet time shows up under it. Offsets are approximate.
+            """
+            if span.duration is None:
+                return
+            timed = [s for s in parsed.steps if s.ms is not None]
+            cursor = span.start + span.duration - sum(s.ms for s in timed) / 1000
+            tracer = tracing.get_tracer()
+            for step in timed:
+                tracer.record(f"step.{step.name}", cursor, step.ms / 1000, cat="cmdlet", ok=step.ok, error=step.error)
+                cursor += step.ms / 1000
+
+        @staticmethod
+        def parse_result(stdout, stderr="") -> 'ConfigureInterface.PlanResult':
+            try:
+                data = json.loads(stdout.strip().splitlines()[-1])
+            except (ValueError, IndexError):
+                return ConfigureInterface.PlanResult(ok=False, steps=[], error=(stderr or stdout or "No output").strip())
+            steps = data.get("steps") or []
+            if isinstance(steps, dict):
+                steps = [steps]
+            return ConfigureInterface.PlanResult(
+                ok=bool(data.get("ok")),
+                steps=[
+                    ConfigureInterface.StepResult(
+                        name=s.get("name"), ok=bool(s.get("ok")), error=s.get("error"), ms=s.get("ms")
+                    ) for s in steps
+                ],
+                rolled_back=bool(data.get("rolled_back")),
+                error=data.get("error"),
+            )
+
+    def __init__(self, iface_name, ip, netmask, gateway, dns1, dns2, runner=None):
         self.iface_name = iface_name
         self.ip = ip
         self.netmask = netmask
         self.gateway = gateway
         self.dns1 = dns1
         self.dns2 = dns2
+        self.runner = runner  # None means the shared PowerShell session
+
+    def _ps(self, cmd, check=False):
+        return (self.runner or get_runner()).run(cmd, check=check)
+
+    @staticmethod
+    def _ps_quote(val):
+        """Quote a string as a PowerShell single-quoted literal."""
+        return "'" + str(val).replace("'", "''") + "'"
 
-    def _ps(self, cmd):
-        return subprocess.run(
-            ["powershell", "-NoProfile", "-Command", cmd],
-            capture_output=True, text=True
+    def compile_plan(self, iface_info, diffs=None, transactional=True) -> 'ConfigureInterface.Plan':
+        """
+        Turn the diff against iface_info (InterfaceInfo.Info) into a Plan.
+        Only the fields that changed produce steps, and the DHCP check is answered
+        from iface_info instead of a separate query.
+        """
+        if diffs is None:
+            diffs = self.iface_compare(iface_info)
+        plan = self.Plan(iface_name=self.iface_name, transactional=transactional)
+        Step = self.Step
+
+        # DHCP owns the default route, so a gateway change on a DHCP interface goes
+        # static like an address change does, re-adding the current address
+        addr_changed = 'ip' in diffs or 'netmask' in diffs or ('gateway' in diffs and iface_info.dhcp)
+        went_static = False
+        if addr_changed:
+            if self.ip and iface_info.dhcp:
+                went_static = True
+                plan.steps.append(Step("set_static", (
+                    "Set-NetIPInterface -InterfaceAlias $alias -Dhcp Disabled; "
+                    "Set-DnsClientServerAddress -InterfaceAlias $alias -ResetServerAddresses"
+                )))
+            plan.steps.append(Step("clear_ip", (
+                "Get-NetIPAddress -InterfaceAlias $alias -AddressFamily IPv4 -ErrorAction SilentlyContinue | "
+                "Remove-NetIPAddress -Confirm:$false"
+            )))
+            plan.steps.append(Step("clear_gateway", self._clear_gateway_script()))
+            if self.ip:
+                cmd = (
+                    f"New-NetIPAddress -InterfaceAlias $alias -IPAddress {self._ps_quote(self.ip)} "
+                    f"-PrefixLength {self.netmask_to_CIDR(self.netmask)}"
+                )
+                if self.gateway:
+                    cmd += f" -DefaultGateway {self._ps_quote(self.gateway)}"
+                plan.steps.append(Step("set_ip", cmd))
+        elif 'gateway' in diffs:
+            plan.steps.append(Step("clear_gateway", self._clear_gateway_script()))
+            if self.gateway:
+                plan.steps.append(Step("set_gateway", (
+                    f"New-NetRoute -InterfaceAlias $alias -DestinationPrefix '0.0.0.0/0' "
+                    f"-NextHop {self._ps_quote(self.gateway)}"
+                )))
+
+        # Leaving DHCP resets DNS, so DNS is rewritten even if it did not change
+        if went_static or 'dns1' in diffs or 'dns2' in diffs:
+            servers = [d.strip() for d in (self.dns1, self.dns2) if d and d.strip() and self.is_valid_ipv4_syntax(d)]
+            if servers:
+                servers_str = ",".join(self._ps_quote(d) for d in servers)
+                plan.steps.append(Step("set_dns", f"Set-DnsClientServerAddress -InterfaceAlias $alias -ServerAddresses @({servers_str})"))
+            else:
+                plan.steps.append(Step("set_dns", "Set-DnsClientServerAddress -InterfaceAlias $alias -ResetServerAddresses"))
+        return plan
+
+    @staticmethod
+    def _clear_gateway_script():
+        return (
+            "$idx = (Get-NetIPInterface -InterfaceAlias $alias -AddressFamily IPv4).InterfaceIndex; "
+            "Get-NetRoute -InterfaceIndex $idx -DestinationPrefix '0.0.0.0/0' -ErrorAction SilentlyContinue | "
+            "Remove-NetRoute -Confirm:$false"
         )
 
     def _clear_ip_mask_gw(self):
@@ -248,11 +662,10 @@ class ConfigureInterface:
     def _set_dhcp(self):
         # Check if already DHCP
         try:
-            dhcp_cmd = [
-                "powershell", "-Command",
-                f"(Get-NetIPInterface -InterfaceAlias '{self.iface_name}' -AddressFamily IPv4).Dhcp"
-            ]
-            dhcp_result = subprocess.run(dhcp_cmd, capture_output=True, text=True, check=True)
+            dhcp_result = self._ps(
+                f"(Get-NetIPInterface -InterfaceAlias '{self.iface_name}' -AddressFamily IPv4).Dhcp",
+                check=True
+            )
             dhcp_status = dhcp_result.stdout.strip()
             if dhcp_status.lower() == "enabled":
                 return  # Already DHCP, early exit
@@ -267,11 +680,10 @@ class ConfigureInterface:
     def _set_static(self):
         # Check if already static (not DHCP)
         try:
-            dhcp_cmd = [
-                "powershell", "-Command",
-                f"(Get-NetIPInterface -InterfaceAlias '{self.iface_name}' -AddressFamily IPv4).Dhcp"
-            ]
-            dhcp_result = subprocess.run(dhcp_cmd, capture_output=True, text=True, check=True)
+            dhcp_result = self._ps(
+                f"(Get-NetIPInterface -InterfaceAlias '{self.iface_name}' -AddressFamily IPv4).Dhcp",
+                check=True
+            )
             dhcp_status = dhcp_result.stdout.strip()
             if dhcp_status.lower() == "disabled":
                 return  # Already static, early exit
@@ -305,50 +717,28 @@ class ConfigureInterface:
 
     @staticmethod
     def is_valid_ipv4_syntax(val):
-        val = val.strip() if val else ""
-        if not val:
-            return True  # Allow blank (optional field)
-        if val.count('.') != 3:
-            return False
-        if not all(c.isdigit() or c == '.' for c in val):
-            return False
-        if '..' in val:
-            return False
-        octets = val.split('.')
-        if len(octets) != 4:
-            return False
-        return all(octet.isdigit() for octet in octets)
+        """Strict dotted quad (no octet above 255, no leading zeros); blank is allowed."""
+        value = validation.parse_ipv4(val)
+        return value is None or value >= 0
 
     def validate_syntax(self):
-        errors = []
-        fields = [
-            ("IP Address", self.ip),
-            ("Netmask", self.netmask),
-            ("Gateway", self.gateway),
-            ("DNS 1", self.dns1),
-            ("DNS 2", self.dns2),
-        ]
-        for label, val in fields:
-            if val and val.strip() and not self.is_valid_ipv4_syntax(val):
-                errors.append(f"{label} is not valid IPv4 syntax.")
-
-        # Check that gateway is in the same subnet as IP/mask
-        if self.ip and self.netmask and self.gateway:
-            try:
-                ip_net = ipaddress.IPv4Network(f"{self.ip}/{self.netmask}", strict=False)
-                gw_addr = ipaddress.IPv4Address(self.gateway)
-                if gw_addr not in ip_net:
-                    errors.append("Gateway is not in the same subnet as the IP address.")
-            except Exception:
-                errors.append("Failed to validate gateway subnet scope.")
-
-        return errors
+        """Same rules the bulk validator applies to every row of a plan."""
+        result = validation.validate_columns(
+            [self.ip], [self.netmask], [self.gateway], [self.dns1], [self.dns2], use_numpy=False
+        )
+        return result.errors(0)
 
     @staticmethod
     def netmask_to_CIDR(netmask):
         """Convert dotted netmask to prefix length (e.g., 255.255.255.0 -> 24).
-        Took me weeks to learn how to do this back in the day. one line lol"""
-        return sum(bin(int(x)).count('1') for x in netmask.split('.')) if netmask else 0
+        Took me weeks to learn how to do this back in the day. one line lol
+        (Not one line any more: 255.0.255.0 used to come out as /16.)"""
+        if not netmask:
+            return 0
+        mask = validation.parse_ipv4(netmask)
+        if mask is None or mask < 0 or (~mask & validation.FULL) & ((~mask & validation.FULL) + 1):
+            raise ValueError(f"Invalid netmask: {netmask}")
+        return 32 - (~mask & validation.FULL).bit_length()
 
     def iface_compare(self, iface_info):
         """
@@ -0,0 +1,132 @@
+# Worker-backed job queue so slow configuration work stays off the Tk thread
+import queue
+import threading
+import time
+
+
+class Job:
+    """
+    A named list of steps run in order on the worker thread.
+    steps: list of (label, func); func is called with the job and its return
+    value is stored in job.results[label]. An exception fails the job and the
+    remaining steps are skipped. Cancelling skips every step not yet started.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, name, steps, on_progress=None, on_done=None):
+        self.name = name
+        self.steps = list(steps)
+        self.on_progress = on_progress  # (job, index, total, label, state, detail) on the UI thread
+        self.on_done = on_done  # (job) on the UI thread
+        self.status = self.QUEUED
+        self.results = {}
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class JobQueue:
+    """
+    Runs Jobs one at a time on a single daemon worker.
+    schedule: runs a callable on the UI thread, e.g. lambda fn: root.after(0, fn).
+    Progress and completion callbacks are always delivered through schedule.
+    """
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self._queue = queue.Queue()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self.current = None
+
+    def submit(self, job: Job) -> Job:
+        with self._lock:
+            self._pending.append(job)
+        self._queue.put(job)
+        self._ensure_worker()
+        return job
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending)
+
+    def cancel_pending(self):
+        """Cancel every queued job; the running job finishes its current step and stops."""
+        with self._lock:
+            jobs = list(self._pending)
+        if self.current:
+            jobs.append(self.current)
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def stop(self):
+        self.cancel_pending()
+        self._queue.put(None)
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name="config-jobs", daemon=True)
+            self._thread.start()
+
+    def _emit(self, func, *args):
+        if func is None:
+            return
+        try:
+            self.schedule(lambda: func(*args))
+        except RuntimeError:
+            pass  # Tk is gone
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            with self._lock:
+                if job in self._pending:
+                    self._pending.remove(job)
+            self.current = job
+            try:
+                self._run(job)
+            finally:
+                self.current = None
+
+    def _run(self, job):
+        total = len(job.steps)
+        job.started_at = time.time()
+        job.status = Job.RUNNING
+        for index, (label, func) in enumerate(job.steps):
+            if job.cancelled or job.status == Job.FAILED:
+                self._emit(job.on_progress, job, index, total, label, "skipped", None)
+                continue
+            self._emit(job.on_progress, job, index, total, label, "started", None)
+            try:
+                job.results[label] = func(job)
+            except Exception as e:
+                job.error = e
+                job.status = Job.FAILED
+                self._emit(job.on_progress, job, index, total, label, "failed", str(e))
+                continue
+            self._emit(job.on_progress, job, index, total, label, "ok", None)
+        if job.status == Job.RUNNING:
+            job.status = Job.CANCELLED if job.cancelled else Job.DONE
+        job.finished_at = time.time()
+        self._emit(job.on_done, job)
@@ -1,8 +1,12 @@
+# --- Startup timing starts before any other import ---
+import time
+STARTUP_T0 = time.perf_counter()
+
 # --- Elevation check and relaunch as admin if needed ---
 import sys
 import os
-import ctypes
 # if os.name == 'nt':
+#     import ctypes
 #     try:
 #         is_admin = ctypes.windll.shell32.IsUserAnAdmin()
 #     except Exception:
@@ -14,13 +18,29 @@ import ctypes
 #         sys.exit(0)
 
 from main_ui import MainUI
-from interfacemanager import InterfaceInfo, ConfigureInterface
-import threading
-import time
-from not_snake_game import SnakeGame
+from interfacemanager import InterfaceInfo, InterfaceCollector, RefreshManager, ConfigureInterface
+from interfacediff import DiffEngine
+import compactmodel
+from poller import Poller
+from jobqueue import Job, JobQueue
+from scheduler import TimerScheduler
+from netlinksource import NetlinkChangeSource
+from statecache import StateCache
+import tracing
 import tkinter as tk 
 
 prev_state = None
+collector = InterfaceCollector(builder=compactmodel.build)
+refresher = RefreshManager(collector)
+diff_engine = DiffEngine()
+state_cache = StateCache()
+poller = None
+netlink = None
+agent = None  # AgentClient when agent.py is running; it then does the polling
+jobs = None
+timers = None
+verify_after_apply = True  # probe the new gateway and DNS servers once a change is applied
+startup_marks = [("start", STARTUP_T0)]  # (phase, perf_counter at its end)
 
 def build_interface(ui, iface):
     """Create and return a ConfigureInterface instance with attributes set from the UI."""
@@ -46,22 +66,38 @@ def has_syntax_errors(interface):
         return False
 
 def fade_in_info(ui, selected_frame=None):
-    def worker():
-        time.sleep(10)
-        ui.root.after(0, lambda: update_ui(ui))
-    threading.Thread(target=worker, daemon=True).start()
+    # Repeated clicks push the one deferred refresh back instead of stacking threads
+    def refresh():
+        if agent:
+            return  # the agent pushes changes as it sees them
+        if poller:
+            poller.kick()
+        else:
+            update_ui(ui)
+    timers.debounce("refresh", 10000, refresh)
+
+def describe_plan_failure(result):
+    failed = result.failed_steps()
+    detail = "\n".join(f"  {s.name}: {s.error}" for s in failed) or f"  {result.error}"
+    rollback = " Previous settings were restored." if result.rolled_back else ""
+    return f"Configuration failed:{rollback}\n{detail}"
 
 def cfg_button(ui):
     t0 = time.time()
+    if not collector.infos:
+        # Only the cached last-known state is on screen; never plan against it
+        ui.set_info_panel("Still reading the current interface state, try again in a moment.")
+        return
     try:
-        interface = build_interface(ui, ui.is_selected().iface_info)
+        selected = ui.is_selected()
+        interface = build_interface(ui, selected.iface_info)
         if has_syntax_errors(interface):
             return
-        diffs = interface.iface_compare(ui.is_selected().iface_info)
+        diffs = interface.iface_compare(selected.iface_info)
 
         if not diffs:
             ui.set_info_panel("No changes detected.")
-            fade_in_info(ui, ui.is_selected())
+            fade_in_info(ui, selected)
             return
 
         # Show what will be reconfigured
@@ -73,66 +109,250 @@ def cfg_button(ui):
             ('dns2', "DNS 2"),
         )
         changed = [f"{label}: {getattr(interface, field)}" for field, label in diff_labels if field in diffs]
-        ui.set_info_panel("Reconfiguring " + ", ".join(changed) + ".")
-        ui.root.update_idletasks()  # <-- Force redraw before blocking
-
-        # Apply changes
-        if any(field in diffs for field in ['ip', 'netmask', 'gateway']):
-            interface._set_static()
-            interface._clear_ip_mask_gw()
-            interface._set_ip_mask_gw(interface.ip, interface.netmask, interface.gateway)
-        if any(field in diffs for field in ['dns1', 'dns2']):
-            interface._clear_dns()
-            interface._set_dns(interface.dns1, interface.dns2)
-
-        update_ui(ui)
-        fade_in_info(ui, ui.is_selected())
-        print(interface)
+        summary = "Reconfiguring " + ", ".join(changed) + "."
+        ui.set_info_panel(summary)
+        plan = interface.compile_plan(selected.iface_info, diffs)
     except Exception as e:
         ui.set_info_panel(f"An error occurred:\n{e}")
+        return
 
-    system_ifaces = {iface.name: iface for iface in InterfaceInfo.get_info()}
+    # --- Worker thread steps ---
 
-    def do_update():
-        ui.refresh_ifaces(list(system_ifaces.values()))
-        selected = ui.is_selected()
-        if selected and hasattr(selected, "iface_info"):
-            iface_name = selected.iface_info.name
-            fresh_info = system_ifaces.get(iface_name)
-            if fresh_info:
-                ui.refresh_entries(fresh_info)
-                ui.refresh_status(fresh_info, InterfaceInfo.get_status(fresh_info.name))
-            else:
-                ui.set_info_panel("No interface selected.")
-        ui.set_info_panel(f"Configuration took {time.time() - t0:.2f} seconds")
-    ui.root.after(0, do_update)
+    def apply_plan(job):
+        # All changes in a single round trip
+        result = agent.apply(interface) if agent else plan.apply()
+        if not result.ok:
+            raise RuntimeError(describe_plan_failure(result))
+        return result
+
+    def refresh(job):
+        if agent:
+            return collector.infos  # the agent re-reads and pushes the result
+        refresher.invalidate()
+        return refresher.tick()
+
+    applied_at = []
+
+    def verify(job):
+        applied_at.append(time.time())  # keep probe time out of "Configuration took"
+        import reachability  # asyncio and friends load on the first check, not at startup
+        return reachability.verify(interface.gateway, interface.dns1, interface.dns2)
+
+    # --- Tk thread callbacks ---
+
+    def on_progress(job, index, total, label, state, detail):
+        text = f"{summary}\nStep {index + 1}/{total}: {label} ({state})"
+        result = job.results.get(label)
+        if state == "ok" and isinstance(result, ConfigureInterface.PlanResult):
+            text += "\n" + "\n".join(f"  {s.name}: {s.ms} ms" for s in result.steps)
+        ui.set_info_panel(text)
+
+    def on_done(job):
+        if job.status == Job.FAILED:
+            ui.set_info_panel(str(job.error))
+        elif job.status == Job.CANCELLED:
+            ui.set_info_panel("Configuration cancelled.")
+        else:
+            apply_ifaces(ui, collector.infos)
+            selected = ui.is_selected()
+            if selected and hasattr(selected, "iface_info"):
+                fresh_info = collector.get(selected.iface_info.name)
+                if fresh_info:
+                    ui.refresh_entries(fresh_info)
+                    ui.refresh_status(fresh_info, collector.status(fresh_info.name))
+            text = f"Configuration took {(applied_at[0] if applied_at else time.time()) - t0:.2f} seconds"
+            probes = job.results.get("Checking reachability")
+            if probes:
+                import reachability  # already loaded by verify()
+                text += "\nReachability:\n" + reachability.describe(probes)
+            ui.set_info_panel(text)
+            print(interface)
+        fade_in_info(ui, ui.is_selected())
+        if poller:
+            poller.kick()  # watch closely while the adapter settles
+
+    steps = [("Applying changes", apply_plan), ("Refreshing interfaces", refresh)]
+    if verify_after_apply and (interface.gateway or interface.dns1 or interface.dns2):
+        steps.append(("Checking reachability", verify))
+    jobs.submit(Job(
+        f"configure {interface.iface_name}",
+        steps,
+        on_progress=on_progress,
+        on_done=on_done,
+    ))
 
 def update_ui(ui):
-    iface_list = InterfaceInfo.get_info()
+    apply_ifaces(ui, refresher.tick())
+
+def apply_ifaces(ui, iface_list):
+    """Push a fresh interface list into the UI. Must run on the Tk thread."""
+    events = diff_engine.update(iface_list)
+    if not events:
+        return  # Nothing changed since the last refresh
     ui.refresh_ifaces(iface_list)
     selected = ui.is_selected()
     if selected and hasattr(selected, "iface_info"):
-        iface = next((i for i in iface_list if i.name == selected.iface_info.name), None)
-        if iface:
+        iface = collector.get(selected.iface_info.name)
+        if iface and iface.name in DiffEngine.changed_names(events):
             ui.refresh_entries(iface)
-            ui.refresh_status(iface, InterfaceInfo.get_status(iface.name))
+            ui.refresh_status(iface, collector.status(iface.name))
+    tracer = tracing.get_tracer()
+    if tracer.enabled:
+        # Tk lays out and redraws at idle time, in order; this runs after that work, without forcing it
+        start = tracer.clock()
+        ui.root.after_idle(lambda: tracer.record("tk.redraw", start, tracer.clock() - start, cat="tk"))
+
+def mark_startup(phase):
+    """End a startup phase; prints the breakdown once the first data is on screen."""
+    now = time.perf_counter()
+    start = startup_marks[-1][1]
+    startup_marks.append((phase, now))
+    tracing.get_tracer().record(f"startup.{phase}", start, now - start, cat="startup")
+    if phase == "first_data":
+        parts = ", ".join(
+            f"{name} {(end - begin) * 1000:.0f} ms"
+            for (_, begin), (name, end) in zip(startup_marks, startup_marks[1:])
+        )
+        print(f"[DEBUG] startup: {parts} (total {(now - STARTUP_T0) * 1000:.0f} ms)")
+
+def sample_ifaces():
+    """Poller sample, on the worker thread. Persists the inventory when it changed."""
+    iface_list = refresher.tick()
+    state_cache.save(iface_list)
+    return iface_list, refresher.changed
+
+def show_cached_state(ui):
+    """Render the last saved inventory, marked stale, until the live query reconciles it."""
+    cached = state_cache.load()
+    if not cached:
+        ui.set_loading("Loading interfaces...")
+        return
+    apply_ifaces(ui, cached.infos)
+    saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(cached.saved_at))
+    ui.set_loading(f"Last known state from {saved} (stale), refreshing...")
+    mark_startup("cached_state")
+
+def deliver_ifaces(ui, iface_list):
+    """Poller delivery; the first one also ends the loading state."""
+    apply_ifaces(ui, iface_list)
+    if startup_marks[-1][0] != "first_data":
+        ui.set_loading(None)
+        mark_startup("first_data")
+
+def connect_agent(ui):
+    """Subscribe to a running agent instead of polling locally. Returns the client, or None."""
+    pending = []
+    def on_event(records):
+        # Reader thread; coalesce bursts into one Tk-side redraw
+        if pending:
+            return
+        pending.append(True)
+        def deliver():
+            pending.clear()
+            if agent is not client:
+                return  # already back on local polling
+            infos = [compactmodel.CompactInfo.from_info(i) for i in client.infos()]
+            deliver_ifaces(ui, collector.adopt(infos))
+        ui.root.after(0, deliver)
+    def on_close():
+        ui.root.after(0, lambda: agent_lost(ui))
+    from agent import AgentClient  # only loaded when looking for a running agent
+    client = AgentClient.connect_if_running(on_event=on_event, on_close=on_close)
+    if client:
+        client.subscribe()
+        print("[DEBUG] using the running agent")
+    return client
+
+def agent_lost(ui):
+    """The agent went away: poll locally from here on, starting with a fresh read."""
+    global agent
+    if agent is None:
+        return
+    print("[DEBUG] agent connection lost, polling locally")
+    agent = None
+    refresher.invalidate()
+    start_local_polling(ui)
+
+def netlink_changed(events):
+    """NetlinkChangeSource callback, on its reader thread."""
+    # Gateway and address changes can leave the change signature as it was, so drop the cached light data
+    if any(e.kind in ("addr", "route") for e in events):
+        refresher.invalidate()
+    poller.kick()
+
+def start_local_polling(ui):
+    """Start this process's own Poller, with netlink pushes on Linux. Must run on the Tk thread."""
+    global poller, netlink
+    # The poller's first sample is the initial inventory, taken off the Tk thread
+    poller = Poller(
+        sample=sample_ifaces,
+        deliver=lambda iface_list: deliver_ifaces(ui, iface_list),
+        schedule=lambda fn: ui.root.after(0, fn),
+    )
+    ui.root.after_idle(poller.start)  # once mainloop runs, so the first delivery can be scheduled
+
+    # On Linux, netlink pushes changes as they happen; polling stays on as a slow safety net
+    normal_slow = poller.slow
+    def netlink_stopped():
+        poller.slow = normal_slow  # nothing pushes changes any more
+        poller.kick()
+    netlink = NetlinkChangeSource(
+        on_change=netlink_changed,
+        on_overflow=poller.kick,  # notifications were dropped; resample
+        on_stop=netlink_stopped,
+    )
+    poller.slow = 300.0  # before start(), so an early on_stop is not overwritten
+    if not netlink.start():
+        poller.slow = normal_slow
+
+def export_trace(ui, path="ipchanger-trace.json"):
+    """Dump the recent spans for chrome://tracing or ui.perfetto.dev."""
+    try:
+        path = tracing.export_chrome(os.path.abspath(path))
+        ui.set_info_panel(f"Trace saved to {path}")
+    except OSError as e:
+        ui.set_info_panel(f"Could not save trace: {e}")
 
 def open_snake():
+    from not_snake_game import SnakeGame  # only loaded if someone opens it
     snake_win = tk.Toplevel(ui.root)
     snake_win.title("Snake")
     SnakeGame(snake_win)
 
 if __name__ == "__main__":
+    mark_startup("imports")
     ui = MainUI()
+    ui.root.update_idletasks()  # map and paint now instead of after the first query
+    mark_startup("window")
+    show_cached_state(ui)
     print("UI initialized")
-    update_ui(ui)
+    jobs = JobQueue(schedule=lambda fn: ui.root.after(0, fn))
+    timers = TimerScheduler(ui.root)
+    ui.root.bind("<Escape>", lambda event: jobs.cancel_pending())
+    ui.root.bind("<F12>", lambda event: export_trace(ui))
     ui.set_cfg_command(lambda: (cfg_button(ui)))
     ui.set_on_select_callback(lambda frame: (
         ui.refresh_entries(frame.iface_info),
         ui.refresh_status(
             frame.iface_info,
-            InterfaceInfo.get_status(frame.iface_info.name)
+            collector.status(frame.iface_info.name)
         )
     ))
     ui.set_snake_callback(open_snake)
+
+    agent = connect_agent(ui)
+    if not agent:
+        start_local_polling(ui)
+
+    def on_close():
+        if agent:
+            agent.close()
+        if netlink:
+            netlink.stop(timeout=1)
+        if poller:
+            poller.stop(timeout=1)
+        jobs.stop()
+        timers.cancel_all()
+        ui.root.destroy()
+    ui.root.protocol("WM_DELETE_WINDOW", on_close)
     ui.run()
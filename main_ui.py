@@ -1,6 +1,133 @@
 import tkinter as tk
 from tkinter import font
 
+import tracing
+
+class VirtualIfaceList:
+    """
+    Virtualized overview list: a small pool of row frames, placed as canvas windows,
+    is reassigned to whichever interfaces are in view as the canvas scrolls.
+    Widget count depends on the panel height, not on the number of interfaces.
+    """
+    class Selection:
+        """Stands in for the selected frame; only iface_info is meaningful."""
+        def __init__(self, iface_info):
+            self.iface_info = iface_info
+
+    pad_x = 8
+    pad_y = 4
+
+    def __init__(self, ui):
+        self.ui = ui
+        self.canvas = ui.canvas
+        self.items = []
+        self.rows = []
+        self.row_height = None
+        self.active = False
+        self._width = 0
+        self._height = 0
+
+    def activate(self):
+        self.active = True
+        self.canvas.itemconfig(self.ui.inner_frame_id, state="hidden")
+
+    def deactivate(self):
+        self.active = False
+        for row in self.rows:
+            self.canvas.delete(row.window_id)
+            row.destroy()
+        self.rows = []
+        self.items = []
+        self.canvas.itemconfig(self.ui.inner_frame_id, state="normal")
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def selection(self):
+        alias = self.ui._selected_alias
+        for item in self.items:
+            if item.name == alias:
+                return self.Selection(item)
+        return None
+
+    def set_items(self, items):
+        self.items = items
+        if self.row_height is None:
+            self._measure_row()
+        self.canvas.configure(scrollregion=(0, 0, self._width, len(items) * self.row_height))
+        self.render()
+
+    def on_resize(self, width, height):
+        self._width, self._height = width, height
+        if not self.active:
+            return
+        for row in self.rows:
+            self.canvas.itemconfig(row.window_id, width=max(width - 2 * self.pad_x, 1))
+        if self.row_height is not None:
+            self.canvas.configure(scrollregion=(0, 0, width, len(self.items) * self.row_height))
+        self.render()
+
+    def render(self):
+        """Assign pool rows to the interfaces currently in view."""
+        if not self.active or self.row_height is None:
+            return
+        height = self._height or self.canvas.winfo_height()
+        total = len(self.items) * self.row_height
+        first = int(self.canvas.yview()[0] * total) // self.row_height if total else 0
+        needed = height // self.row_height + 2
+        while len(self.rows) < needed:
+            self.rows.append(self._make_row())
+        for offset, row in enumerate(self.rows):
+            index = first + offset
+            if index < len(self.items):
+                self._assign(row, self.items[index])
+                self.canvas.coords(row.window_id, self.pad_x, index * self.row_height + self.pad_y)
+                self.canvas.itemconfig(row.window_id, state="normal")
+            else:
+                row.iface_info = None
+                self.canvas.itemconfig(row.window_id, state="hidden")
+
+    def _measure_row(self):
+        probe = self._make_row()
+        if self.items:
+            self._assign(probe, self.items[0])
+        probe.update_idletasks()
+        self.row_height = probe.winfo_reqheight() + 2 * self.pad_y
+        self.rows.append(probe)
+
+    def _make_row(self):
+        row = tk.Frame(self.canvas, bd=2, relief=tk.RIDGE)
+        row._label = tk.Label(row, justify=tk.LEFT, anchor="w")
+        row._label.pack(fill=tk.BOTH, expand=True, padx=8, pady=4)
+        row._paragraph = None
+        row.iface_info = None
+        row.window_id = self.canvas.create_window(
+            self.pad_x, 0, window=row, anchor="nw",
+            width=max(self._width - 2 * self.pad_x, 1), state="hidden"
+        )
+
+        def on_select(event, r=row):
+            if r.iface_info is None:
+                return
+            self.ui._selected_alias = r.iface_info.name
+            self.render()
+            if self.ui._on_select_callback:
+                self.ui._on_select_callback(self.Selection(r.iface_info))
+        row.bind("<Button-1>", on_select, add="+")
+        row._label.bind("<Button-1>", on_select, add="+")
+        return row
+
+    def _assign(self, row, iface):
+        row.iface_info = iface
+        paragraph = self.ui.iface_paragraph(iface)
+        if paragraph != row._paragraph:
+            row._label.config(text=paragraph)
+            row._paragraph = paragraph
+        bg_color, fg_color = self.ui._iface_colors(getattr(iface, "important", False))
+        if iface.name == self.ui._selected_alias:
+            bg_color = "#cce6ff"
+        row.configure(background=bg_color)
+        row._label.configure(background=bg_color, foreground=fg_color)
+
+
 class MainUI:
     # --- Class attributes ---
     main_width = 650
@@ -19,6 +146,9 @@ class MainUI:
     y2 = 65
     y3 = 115
 
+    # Above this many interfaces the overview only builds widgets for visible rows (None = never)
+    virtual_threshold = 150
+
     # --- Initialization ---
     def __init__(self):
         self.root = tk.Tk()
@@ -33,7 +163,7 @@ class MainUI:
         # Scrollable container for paragraph frames
         self.canvas = tk.Canvas(self.overview_frame, background="#f6f6f6", bd=2, relief=tk.GROOVE, highlightthickness=0)
         self.scrollbar = tk.Scrollbar(self.overview_frame, orient="vertical", command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
 
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -42,11 +172,13 @@ class MainUI:
         self.inner_frame_id = self.canvas.create_window((0, 0), window=self.inner_frame, anchor="nw")
 
         def _on_frame_configure(event):
-            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            if not self._vlist.active:  # the virtual list manages its own scrollregion
+                self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         self.inner_frame.bind("<Configure>", _on_frame_configure)
 
         def _on_canvas_configure(event):
             self.canvas.itemconfig(self.inner_frame_id, width=event.width)
+            self._vlist.on_resize(event.width, event.height)
         self.canvas.bind("<Configure>", _on_canvas_configure)
 
         # Optional: enable mousewheel scrolling
@@ -58,7 +190,12 @@ class MainUI:
         self.top_spacer = tk.Frame(self.inner_frame, height=4, bg="#f6f6f6")
         self.top_spacer.pack(fill=tk.X)
 
+        # Placeholder shown in the overview until the first inventory arrives
+        self.loading_label = tk.Label(self.inner_frame, text="", bg="#f6f6f6", fg="#808080", anchor="w")
+
         self._paragraph_frames = []
+        self._frames_by_name = {}  # interface name -> frame, for keyed reconciliation
+        self._vlist = VirtualIfaceList(self)
         self._selected_frame = None
         self._selected_alias = None  # Remember selected interface alias
 
@@ -123,7 +260,17 @@ class MainUI:
     def set_info_panel(self, text):
         self.info_label.config(text=text)
 
+    def set_loading(self, text):
+        """Show text in the empty overview (e.g. while the first query runs); None hides it."""
+        if text:
+            self.loading_label.config(text=text)
+            self.loading_label.pack(fill=tk.X, padx=12, pady=8, after=self.top_spacer)
+        else:
+            self.loading_label.pack_forget()
+
     def is_selected(self):
+        if self._vlist.active:
+            return self._vlist.selection()
         return self._selected_frame
 
     def restore_selection(self):
@@ -134,22 +281,28 @@ class MainUI:
                     self._select_frame(frame)
                     break
 
-    def insert_iface_frame(self, info, iface_info=None):
+    def insert_iface_frame(self, info, iface_info=None, after=None):
         """
         Insert a paragraph (IP info chunk) as a selectable Frame in the overview_frame.
         info: str (should be a full paragraph for one interface)
         iface_info: the data object for this interface
         important: bool (optional, can highlight differently)
+        after: widget to pack the new frame after (default: append at the end)
         """
         important = getattr(iface_info, "important", False)
-        bg_color = "#ffffff" if important else "#e0e0e0"
-        fg_color = "#000000" if important else "#888888"
+        bg_color, fg_color = self._iface_colors(important)
         frame = tk.Frame(self.inner_frame, bd=2, relief=tk.RIDGE, background=bg_color)
         label = tk.Label(frame, text=info, justify=tk.LEFT, anchor="w", background=bg_color, foreground=fg_color)
         label.pack(fill=tk.BOTH, expand=True, padx=8, pady=4)
-        frame.pack(fill=tk.X, padx=8, pady=4)
+        if after is not None:
+            frame.pack(fill=tk.X, padx=8, pady=4, after=after)
+        else:
+            frame.pack(fill=tk.X, padx=8, pady=4)
         frame._original_bg = bg_color
         label._original_bg = bg_color
+        frame._label = label
+        frame._paragraph = info
+        frame._important = important
         self._paragraph_frames.append(frame)
 
         # Attach the iface_info object to the frame
@@ -164,33 +317,119 @@ class MainUI:
 
         return frame
 
-    def create_iface_frame(self, iface):
+    @staticmethod
+    def iface_paragraph(iface):
+        """Overview text for one interface."""
         ipv4_str = ', '.join(f.address for f in iface.ipv4) if iface.ipv4 else 'N/A'
         netmask_str = ', '.join(f.netmask or 'N/A' for f in iface.ipv4) if iface.ipv4 else 'N/A'
         ipv6_str = ', '.join(f.address for f in iface.ipv6) if iface.ipv6 else 'N/A'
         mac_str = iface.mac if iface.mac else 'N/A'
         linklocal_str = " (link local)" if getattr(iface, "linklocal", False) else ""
-        paragraph = (
+        return (
             f"Interface: {iface.name}\n"
             f"  IPv4: {ipv4_str}{linklocal_str}\n"
             f"  Netmask: {netmask_str}\n"
             f"  IPv6: {ipv6_str}\n"
             f"  MAC: {mac_str}\n"
         )
-        frame = self.insert_iface_frame(paragraph, iface_info=iface)
+
+    def create_iface_frame(self, iface, after=None):
+        frame = self.insert_iface_frame(self.iface_paragraph(iface), iface_info=iface, after=after)
         frame.iface_info = iface
+        self._frames_by_name[iface.name] = frame
         return frame
 
+    @tracing.traced("ui.refresh_ifaces", cat="tk")
     def refresh_ifaces(self, iface_list):
-        """Redraw all interface frames from a list of iface objects."""
-        for frame in list(self._paragraph_frames):
-            frame.destroy()
-        self._paragraph_frames.clear()
+        """
+        Reconcile the interface frames with iface_list, keyed by interface name.
+        Existing frames are reused and only relabelled when their text changed;
+        only added or vanished interfaces create or destroy widgets.
+        Selection and scroll position are kept.
+        Above virtual_threshold interfaces the virtualized list is used instead.
+        """
+        iface_list = list(iface_list)
+        if self.virtual_threshold is not None and len(iface_list) > self.virtual_threshold:
+            if not self._vlist.active:
+                self._clear_iface_frames()
+                self._vlist.activate()
+            self._vlist.set_items(iface_list)
+            return
+        if self._vlist.active:
+            self._vlist.deactivate()
+
+        scroll_top = self.canvas.yview()[0]
+        wanted = {iface.name for iface in iface_list}
+
+        for name, frame in list(self._frames_by_name.items()):
+            if name not in wanted:
+                if frame is self._selected_frame:
+                    self._selected_frame = None  # _selected_alias is kept in case it comes back
+                frame.destroy()
+                del self._frames_by_name[name]
+
+        old_order = [f for f in self._paragraph_frames if f.winfo_exists()]
+        ordered = []
+        prev = self.top_spacer
         for iface in iface_list:
-            self.create_iface_frame(iface)
-        if hasattr(self, 'restore_selection'):
+            frame = self._frames_by_name.get(iface.name)
+            if frame is None:
+                frame = self.create_iface_frame(iface, after=prev)
+            else:
+                self._update_iface_frame(frame, iface)
+            ordered.append(frame)
+            prev = frame
+
+        # Existing frames only need repacking if the interface order itself changed
+        kept = [f for f in ordered if f in old_order]
+        if kept != [f for f in old_order if f in kept]:
+            for frame in ordered:
+                frame.pack_forget()
+            for frame in ordered:
+                frame.pack(fill=tk.X, padx=8, pady=4)
+        self._paragraph_frames = ordered
+
+        if self._selected_frame is None:
             self.restore_selection()
+        self.canvas.yview_moveto(scroll_top)
 
+    def _clear_iface_frames(self):
+        for frame in self._paragraph_frames:
+            frame.destroy()
+        self._paragraph_frames = []
+        self._frames_by_name = {}
+        self._selected_frame = None
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._vlist.render()
+
+    def _update_iface_frame(self, frame, iface):
+        """Point an existing frame at fresh data, touching only what changed."""
+        frame.iface_info = iface
+        paragraph = self.iface_paragraph(iface)
+        if paragraph != frame._paragraph:
+            frame._label.config(text=paragraph)
+            frame._paragraph = paragraph
+        important = getattr(iface, "important", False)
+        if important != frame._important:
+            bg_color, fg_color = self._iface_colors(important)
+            frame._important = important
+            frame._original_bg = bg_color
+            frame._label._original_bg = bg_color
+            frame._label.config(foreground=fg_color)
+            if frame is not self._selected_frame:
+                frame.configure(background=bg_color)
+                frame._label.configure(background=bg_color)
+
+    @staticmethod
+    def _iface_colors(important):
+        """(background, foreground) for an interface frame."""
+        if important:
+            return "#ffffff", "#000000"
+        return "#e0e0e0", "#888888"
+
+    @tracing.traced("ui.refresh_entries", cat="tk")
     def refresh_entries(self, iface):
         """Populate the info fields and info panel using the iface_info attached to the frame."""
         if iface:
@@ -206,6 +445,7 @@ class MainUI:
             self.dns2_entry.delete(0, tk.END)
             self.dns2_entry.insert(0, iface.dns2 or '')     # Placeholder
 
+    @tracing.traced("ui.refresh_status", cat="tk")
     def refresh_status(self, iface, status):
         """Update the info panel from an iface object."""
         if status:
@@ -0,0 +1,254 @@
+# Event-driven change source for Linux: rtnetlink link/address/route notifications
+import errno
+import socket
+import struct
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Multicast groups (linux/rtnetlink.h)
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+GROUPS = RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE | RTMGRP_IPV6_IFADDR | RTMGRP_IPV6_ROUTE
+
+NETLINK_ROUTE = 0
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWLINK, RTM_DELLINK = 16, 17
+RTM_NEWADDR, RTM_DELADDR = 20, 21
+RTM_NEWROUTE, RTM_DELROUTE = 24, 25
+
+IFF_UP = 0x1
+IFF_LOWER_UP = 0x10000
+IFLA_IFNAME = 3
+IFA_ADDRESS, IFA_LOCAL, IFA_LABEL = 1, 2, 3
+RTA_DST, RTA_OIF, RTA_GATEWAY = 1, 4, 5
+
+NLMSGHDR = struct.Struct("=IHHII")   # len, type, flags, seq, pid
+IFINFOMSG = struct.Struct("=BxHiII")  # family, type, index, flags, change
+IFADDRMSG = struct.Struct("=BBBBI")   # family, prefixlen, flags, scope, index
+RTMSG = struct.Struct("=BBBBBBBBI")   # family, dst_len, src_len, tos, table, protocol, scope, type, flags
+RTATTR = struct.Struct("=HH")         # len, type
+
+MESSAGE_KINDS = {
+    RTM_NEWLINK: ("link", "new"), RTM_DELLINK: ("link", "del"),
+    RTM_NEWADDR: ("addr", "new"), RTM_DELADDR: ("addr", "del"),
+    RTM_NEWROUTE: ("route", "new"), RTM_DELROUTE: ("route", "del"),
+}
+
+
+@dataclass
+class NetlinkEvent:
+    kind: str    # "link", "addr" or "route"
+    action: str  # "new" or "del"
+    index: int   # interface index
+    name: Optional[str] = None
+    family: int = 0
+    address: Optional[str] = None
+    prefixlen: Optional[int] = None
+    isup: Optional[bool] = None
+    gateway: Optional[str] = None
+
+
+def _align(n):
+    return (n + 3) & ~3
+
+
+def _attrs(buf, offset, end):
+    """Yield (type, start, stop) for each rtattr; the payload stays in buf."""
+    while offset + RTATTR.size <= end:
+        length, kind = RTATTR.unpack_from(buf, offset)
+        if length < RTATTR.size:
+            break
+        yield kind & 0x3FFF, offset + RTATTR.size, offset + length
+        offset += _align(length)
+
+
+def _addr(family, buf, start, stop):
+    try:
+        return socket.inet_ntop(family, buf[start:stop])
+    except (ValueError, OSError):
+        return None
+
+
+def decode(data) -> List[NetlinkEvent]:
+    """
+    Decode every link/address/route message in one recv() buffer.
+    Headers and attributes are read in place with struct.unpack_from over a
+    memoryview; only names and addresses are materialized.
+    """
+    buf = memoryview(data)
+    events = []
+    offset = 0
+    while offset + NLMSGHDR.size <= len(buf):
+        length, msg_type, _flags, _seq, _pid = NLMSGHDR.unpack_from(buf, offset)
+        if length < NLMSGHDR.size or offset + length > len(buf):
+            break
+        body = offset + NLMSGHDR.size
+        end = offset + length
+        offset += _align(length)
+        if msg_type in (NLMSG_DONE, NLMSG_ERROR):
+            continue
+        kind = MESSAGE_KINDS.get(msg_type)
+        if kind is None:
+            continue
+
+        if kind[0] == "link" and body + IFINFOMSG.size <= end:
+            family, _type, index, flags, _change = IFINFOMSG.unpack_from(buf, body)
+            event = NetlinkEvent(*kind, index=index, family=family, isup=bool(flags & IFF_UP and flags & IFF_LOWER_UP))
+            for attr, start, stop in _attrs(buf, body + _align(IFINFOMSG.size), end):
+                if attr == IFLA_IFNAME:
+                    event.name = bytes(buf[start:stop]).split(b"\0", 1)[0].decode("utf-8", "replace")
+        elif kind[0] == "addr" and body + IFADDRMSG.size <= end:
+            family, prefixlen, _flags, _scope, index = IFADDRMSG.unpack_from(buf, body)
+            event = NetlinkEvent(*kind, index=index, family=family, prefixlen=prefixlen)
+            for attr, start, stop in _attrs(buf, body + _align(IFADDRMSG.size), end):
+                if attr == IFA_LOCAL or (attr == IFA_ADDRESS and event.address is None):
+                    event.address = _addr(family, buf, start, stop)
+                elif attr == IFA_LABEL:
+                    event.name = bytes(buf[start:stop]).split(b"\0", 1)[0].decode("utf-8", "replace")
+        elif kind[0] == "route" and body + RTMSG.size <= end:
+            family, dst_len = RTMSG.unpack_from(buf, body)[:2]
+            event = NetlinkEvent(*kind, index=0, family=family, prefixlen=dst_len)
+            for attr, start, stop in _attrs(buf, body + _align(RTMSG.size), end):
+                if attr == RTA_OIF:
+                    event.index = struct.unpack_from("=i", buf, start)[0]
+                elif attr == RTA_GATEWAY:
+                    event.gateway = _addr(family, buf, start, stop)
+                elif attr == RTA_DST:
+                    event.address = _addr(family, buf, start, stop)
+        else:
+            continue
+        events.append(event)
+    return events
+
+
+def pack_message(msg_type, body, attrs=(), seq=0):
+    """Build one netlink message: body is the packed family header, attrs are (type, bytes)."""
+    payload = bytearray(body)
+    payload += b"\0" * (_align(len(payload)) - len(payload))
+    for kind, value in attrs:
+        attr = RTATTR.pack(RTATTR.size + len(value), kind) + value
+        payload += attr + b"\0" * (_align(len(attr)) - len(attr))
+    return NLMSGHDR.pack(NLMSGHDR.size + len(payload), msg_type, 0, seq, 0) + bytes(payload)
+
+
+class RecordedSocket:
+    """
+    Stand-in for the netlink socket that replays recorded recv() buffers.
+    An exception in the recording is raised instead (e.g. OSError(ENOBUFS)).
+    Needs no privileges; recv() returns b"" once the recording is exhausted.
+    """
+    def __init__(self, buffers):
+        self._buffers = list(buffers)
+        self.closed = False
+
+    def recv(self, bufsize):
+        if self.closed or not self._buffers:
+            return b""
+        item = self._buffers.pop(0)
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def settimeout(self, timeout):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def open_netlink_socket(groups=GROUPS):
+    """Subscribe to rtnetlink multicast groups. Raises OSError where netlink is unavailable."""
+    if not hasattr(socket, "AF_NETLINK"):
+        raise OSError("netlink is not available on this platform")
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    try:
+        sock.bind((0, groups))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class NetlinkChangeSource:
+    """
+    Pushes interface change notifications instead of waiting for the next poll.
+    on_change(events) is called on the reader thread with each non-empty batch;
+    the app uses it to kick the Poller, so consumers see the same deliveries
+    either way. start() returns False when netlink cannot be opened, in which
+    case the caller simply keeps polling.
+    on_overflow(): the kernel dropped notifications (ENOBUFS); reading goes on,
+    but the caller should resample. Defaults to on_change([]).
+    on_stop(): the reader ended on its own (socket error or closed), so the
+    caller can go back to normal polling. Not called after stop().
+    """
+    def __init__(self, on_change, socket_factory=open_netlink_socket, timeout=1.0, on_overflow=None, on_stop=None):
+        self.on_change = on_change
+        self.on_overflow = on_overflow or (lambda: on_change([]))
+        self.on_stop = on_stop
+        self.socket_factory = socket_factory
+        self.timeout = timeout
+        self.messages = 0
+        self.overflows = 0
+        self._sock = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def active(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> bool:
+        try:
+            self._sock = self.socket_factory()
+        except OSError as e:
+            print(f"[DEBUG] netlink unavailable, staying on polling: {e}")
+            return False
+        self._sock.settimeout(self.timeout)  # lets stop() be noticed
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="netlink", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                data = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    # Receive buffer overran; some changes were lost but the socket still works
+                    self.overflows += 1
+                    self._notify(self.on_overflow)
+                    continue
+                if not self._stop.is_set():
+                    print(f"[DEBUG] netlink reader stopped: {e}")
+                break
+            if not data:
+                break
+            events = decode(data)
+            self.messages += len(events)
+            if events:
+                self._notify(self.on_change, events)
+        if not self._stop.is_set() and self.on_stop:
+            self._notify(self.on_stop)
+
+    @staticmethod
+    def _notify(callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"[DEBUG] netlink subscriber failed: {e}")
@@ -0,0 +1,97 @@
+# Background polling loop with adaptive interval
+import threading
+
+
+class Poller:
+    """
+    Samples interface state on a worker thread and hands changes to the UI thread.
+
+    sample: called on the worker; returns (payload, changed).
+    deliver: called with payload on the UI thread, only when changed is true.
+    schedule: runs a callable on the UI thread, e.g. lambda fn: root.after(0, fn).
+
+    The interval starts at `fast`, doubles (times `backoff`) after every quiet
+    sample up to `slow`, and drops back to `fast` on a detected change or kick().
+    An idle app therefore samples once every `slow` seconds at most.
+    """
+    def __init__(self, sample, deliver, schedule, fast=1.0, slow=30.0, backoff=2.0):
+        self.sample = sample
+        self.deliver = deliver
+        self.schedule = schedule
+        self.fast = fast
+        self.slow = slow
+        self.backoff = backoff
+        self.interval = fast
+        self.samples = 0
+        self.errors = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._thread = None
+
+    # --- Control ---
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="iface-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._running.set()  # release a paused loop so it can exit
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+        self._wake.set()
+
+    def kick(self):
+        """Sample now and go back to the fast rate (call after a local change)."""
+        self.interval = self.fast
+        self._wake.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def is_alive(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    # --- Worker ---
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._running.wait()
+            if self._stop.is_set():
+                break
+            changed = self._poll_once()
+            if changed:
+                self.interval = self.fast
+            else:
+                self.interval = min(self.interval * self.backoff, self.slow)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _poll_once(self):
+        self.samples += 1
+        try:
+            payload, changed = self.sample()
+        except Exception as e:
+            self.errors += 1
+            print(f"[DEBUG] poller sample failed: {e}")
+            return False
+        if changed:
+            try:
+                self.schedule(lambda: self.deliver(payload))
+            except RuntimeError:
+                # Tk is gone (window closed); nothing left to update
+                self._stop.set()
+        return changed
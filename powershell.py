@@ -0,0 +1,274 @@
+# Command runners for PowerShell: one-shot, persistent session host, and a fake for testing
+import atexit
+import base64
+import queue
+import subprocess
+import threading
+import time
+import uuid
+
+import tracing
+
+
+class CommandRunner:
+    """
+    Interface for anything that can execute a PowerShell script.
+    run() mirrors subprocess.run: it returns a subprocess.CompletedProcess,
+    raises subprocess.CalledProcessError when check=True and the script failed,
+    and raises subprocess.TimeoutExpired when the timeout elapses.
+    """
+    def run(self, script, timeout=None, check=False) -> subprocess.CompletedProcess:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def _span(self, script):
+        return tracing.span("powershell", cat="powershell", runner=type(self).__name__, script_bytes=len(script))
+
+    @staticmethod
+    def _finish(script, returncode, stdout, stderr, check):
+        result = subprocess.CompletedProcess(["powershell", script], returncode, stdout, stderr)
+        if check:
+            result.check_returncode()
+        return result
+
+
+class SubprocessRunner(CommandRunner):
+    """Launch a fresh powershell process for every script (the original behaviour)."""
+    def __init__(self, executable="powershell"):
+        self.executable = executable
+
+    def run(self, script, timeout=None, check=False):
+        with self._span(script) as span:
+            return span.set_result(subprocess.run(
+                [self.executable, "-NoProfile", "-NonInteractive", "-Command", script],
+                capture_output=True, text=True, timeout=timeout, check=check
+            ))
+
+
+class PowerShellSession(CommandRunner):
+    """
+    Keeps one powershell process alive and feeds it scripts over stdin.
+    Each request is a single line "<token> <base64 utf-8 script>", and each reply
+    is a single line "__IPC__ <token> <rc> <base64 stdout> <base64 stderr>".
+    rc is 1 only when the script throws a terminating error.
+    The process is restarted on the next call after a crash or a timeout.
+    """
+    MARKER = "__IPC__"
+
+    HOST_SCRIPT = r"""
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+$utf8 = New-Object System.Text.UTF8Encoding $false
+[Console]::OutputEncoding = $utf8
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    $parts = $line.Split(' ', 2)
+    if ($parts.Count -ne 2) { continue }
+    $token = $parts[0]
+    $script = $utf8.GetString([Convert]::FromBase64String($parts[1]))
+    $Error.Clear()
+    $rc = 0
+    $out = ''
+    $err = ''
+    try {
+        $out = (& ([ScriptBlock]::Create($script)) | Out-String)
+    } catch {
+        $rc = 1
+        $err = $_.ToString()
+    }
+    if ($rc -eq 0 -and $Error.Count -gt 0) {
+        # Non-terminating errors are reported but, like -ErrorAction SilentlyContinue, do not fail the call
+        $err = ($Error | ForEach-Object { $_.ToString() }) -join "`n"
+    }
+    $o64 = [Convert]::ToBase64String($utf8.GetBytes([string]$out))
+    $e64 = [Convert]::ToBase64String($utf8.GetBytes([string]$err))
+    [Console]::Out.WriteLine("__IPC__ $token $rc $o64 $e64")
+    [Console]::Out.Flush()
+}
+"""
+
+    def __init__(self, executable="powershell", default_timeout=60.0):
+        self.executable = executable
+        self.default_timeout = default_timeout
+        self.launches = 0
+        self.restarts = 0
+        self._proc = None
+        self._lines = None
+        self._lock = threading.Lock()
+
+    # --- Process management ---
+
+    def _start(self):
+        if self.launches:
+            self.restarts += 1
+        self.launches += 1
+        encoded = base64.b64encode(self.HOST_SCRIPT.encode("utf-16-le")).decode("ascii")
+        creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        # Only the spawn; the host's own startup shows up in the first call's span
+        with tracing.span("powershell.start", cat="powershell", restart=self.restarts > 0):
+            self._proc = subprocess.Popen(
+                [self.executable, "-NoProfile", "-NonInteractive", "-NoLogo", "-EncodedCommand", encoded],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, encoding="utf-8", bufsize=1, creationflags=creationflags
+            )
+        # Windows pipes cannot be select()ed, so a reader thread feeds a queue we can wait on
+        self._lines = queue.Queue()
+        threading.Thread(target=self._reader, args=(self._proc, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _reader(proc, lines):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)  # EOF: the host exited
+
+    def _kill(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=5)
+            except Exception:
+                pass
+        self._proc = None
+        self._lines = None
+
+    def is_alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def close(self):
+        with self._lock:
+            if self.is_alive():
+                try:
+                    self._proc.stdin.close()
+                    self._proc.wait(timeout=2)
+                except Exception:
+                    pass
+            self._kill()
+
+    # --- Public API ---
+
+    def run(self, script, timeout=None, check=False):
+        with self._span(script) as span:
+            return span.set_result(self._run(script, timeout, check))
+
+    def _run(self, script, timeout, check):
+        timeout = self.default_timeout if timeout is None else timeout
+        with self._lock:
+            if not self.is_alive():
+                self._kill()
+                self._start()
+
+            token = uuid.uuid4().hex
+            payload = base64.b64encode(script.encode("utf-8")).decode("ascii")
+            try:
+                self._proc.stdin.write(f"{token} {payload}\n")
+                self._proc.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._kill()
+                return self._finish(script, -1, "", f"PowerShell session died: {e}", check)
+
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    line = self._lines.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    # A hung cmdlet would poison every later call, so start over
+                    self._kill()
+                    raise subprocess.TimeoutExpired(["powershell", script], timeout)
+                if line is None:
+                    self._kill()
+                    return self._finish(script, -1, "", "PowerShell session exited unexpectedly", check)
+                parts = line.rstrip("\r\n").split(" ")
+                if len(parts) == 5 and parts[0] == self.MARKER and parts[1] == token:
+                    stdout = base64.b64decode(parts[3]).decode("utf-8", "replace")
+                    stderr = base64.b64decode(parts[4]).decode("utf-8", "replace")
+                    return self._finish(script, int(parts[2]), stdout, stderr, check)
+                # Anything else is stray host output; ignore it
+
+
+class FakeRunner(CommandRunner):
+    """
+    Stand-in runner for non-Windows machines.
+    responses: list of (substring, reply) pairs; the first substring found in the script wins.
+    A reply is either a stdout string or a callable taking the script and returning
+    a string or a CompletedProcess.
+    startup_latency is charged on every call when persistent=False (like a fresh
+    powershell.exe) and once when persistent=True (like a session host).
+    """
+    def __init__(self, responses=None, latency=0.0, startup_latency=0.0, persistent=True, default=""):
+        self.responses = list(responses or [])
+        self.latency = latency
+        self.startup_latency = startup_latency
+        self.persistent = persistent
+        self.default = default
+        self.calls = []
+        self._started = False
+        self._lock = threading.Lock()
+
+    def run(self, script, timeout=None, check=False):
+        with self._span(script) as span:
+            return span.set_result(self._run(script, timeout, check))
+
+    def _run(self, script, timeout, check):
+        with self._lock:
+            self.calls.append(script)
+            delay = self.latency
+            if not self.persistent or not self._started:
+                delay += self.startup_latency
+                self._started = True
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            self._started = False  # a timed-out session host gets restarted
+            raise subprocess.TimeoutExpired(["powershell", script], timeout)
+        if delay:
+            time.sleep(delay)
+
+        reply = self.default
+        for needle, candidate in self.responses:
+            if needle in script:
+                reply = candidate
+                break
+        if callable(reply):
+            reply = reply(script)
+        if isinstance(reply, subprocess.CompletedProcess):
+            if check:
+                reply.check_returncode()
+            return reply
+        return self._finish(script, 0, reply, "", check)
+
+    def close(self):
+        self._started = False
+
+
+# --- Process-wide default runner ---
+
+_default_runner = None
+_default_lock = threading.Lock()
+
+
+def get_runner() -> CommandRunner:
+    """Return the shared runner, creating a PowerShellSession on first use."""
+    global _default_runner
+    with _default_lock:
+        if _default_runner is None:
+            _default_runner = PowerShellSession()
+        return _default_runner
+
+
+def set_runner(runner: CommandRunner):
+    """Swap the shared runner (e.g. a FakeRunner on Linux). Returns the previous one."""
+    global _default_runner
+    with _default_lock:
+        previous, _default_runner = _default_runner, runner
+    return previous
+
+
+def _close_default():
+    if _default_runner is not None:
+        _default_runner.close()
+
+
+atexit.register(_close_default)
@@ -0,0 +1,118 @@
+# Post-apply reachability checks: probe the gateway and DNS servers concurrently with asyncio
+import asyncio
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+TIMEOUT = 1.0  # seconds per probe; all probes run at once, so the whole check takes about this long
+GATEWAY_PORTS = (53, 80, 443)  # any answer counts, a refused connection included
+DNS_PORT = 53
+
+
+@dataclass
+class ProbeResult:
+    label: str  # "Gateway", "DNS 1", ...
+    target: str
+    ok: bool
+    ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+def dns_query(query_id) -> bytes:
+    """A recursive query for the root NS records; any DNS server answers it, even offline."""
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    return header + b"\x00" + struct.pack("!HH", 2, 1)  # root name, type NS, class IN
+
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    def __init__(self, query_id, answered):
+        self.query_id = query_id
+        self.answered = answered
+
+    def datagram_received(self, data, addr):
+        # Any reply to our id counts, whatever its rcode: the server is there
+        if len(data) >= 12 and not self.answered.done():
+            query_id, flags = struct.unpack("!HH", data[:4])
+            if query_id == self.query_id and flags & 0x8000:
+                self.answered.set_result(None)
+
+    def error_received(self, exc):
+        if not self.answered.done():
+            self.answered.set_exception(exc)
+
+
+async def probe_dns(label, server, port=DNS_PORT, timeout=TIMEOUT) -> ProbeResult:
+    loop = asyncio.get_running_loop()
+    query_id = struct.unpack("!H", os.urandom(2))[0]
+    answered = loop.create_future()
+    t0 = time.perf_counter()
+    transport = None
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DnsProtocol(query_id, answered), remote_addr=(server, port))
+        transport.sendto(dns_query(query_id))
+        await asyncio.wait_for(answered, timeout)
+        return ProbeResult(label, server, True, (time.perf_counter() - t0) * 1000)
+    except asyncio.TimeoutError:
+        return ProbeResult(label, server, False, error="no answer")
+    except OSError as e:
+        return ProbeResult(label, server, False, error=e.strerror or str(e))
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+async def _connect(host, port):
+    try:
+        _, writer = await asyncio.open_connection(host, port)
+    except ConnectionRefusedError:
+        return  # the host sent a reset, so it is up
+    writer.close()
+
+
+async def probe_tcp(label, host, ports=GATEWAY_PORTS, timeout=TIMEOUT) -> ProbeResult:
+    """Reachable when any port accepts or refuses the connection within timeout."""
+    t0 = time.perf_counter()
+    attempts = [asyncio.ensure_future(_connect(host, port)) for port in ports]
+    error = "no answer"
+    try:
+        for attempt in asyncio.as_completed(attempts, timeout=timeout):
+            try:
+                await attempt
+                return ProbeResult(label, host, True, (time.perf_counter() - t0) * 1000)
+            except OSError as e:
+                error = e.strerror or str(e)  # e.g. no route; another port may still answer
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+        await asyncio.gather(*attempts, return_exceptions=True)
+    return ProbeResult(label, host, False, error=error)
+
+
+async def probe_all(gateway=None, dns1=None, dns2=None, timeout=TIMEOUT,
+                    gateway_ports=GATEWAY_PORTS, dns_port=DNS_PORT) -> List[ProbeResult]:
+    probes = []
+    if gateway:
+        probes.append(probe_tcp("Gateway", gateway, gateway_ports, timeout))
+    for label, server in (("DNS 1", dns1), ("DNS 2", dns2)):
+        if server:
+            probes.append(probe_dns(label, server, dns_port, timeout))
+    return list(await asyncio.gather(*probes))
+
+
+def verify(gateway=None, dns1=None, dns2=None, timeout=TIMEOUT, **ports) -> List[ProbeResult]:
+    """Probe every target that is set, all at once. Call from a worker thread, not Tk."""
+    if not (gateway or dns1 or dns2):
+        return []
+    return asyncio.run(probe_all(gateway, dns1, dns2, timeout, **ports))
+
+
+def describe(results) -> str:
+    return "\n".join(
+        f"  {r.label} {r.target}: {r.ms:.0f} ms" if r.ok else f"  {r.label} {r.target}: unreachable ({r.error})"
+        for r in results
+    )
@@ -0,0 +1,48 @@
+# Named, cancellable timers on top of Tk's after()
+
+
+class TimerScheduler:
+    """
+    One Tk `after` handle per timer name, so repeated triggers never stack up.
+    debounce(): every call pushes the deadline back (last trigger wins).
+    coalesce(): calls while a timer is pending are merged into it (first deadline wins).
+    All methods must be called on the Tk thread.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._timers = {}  # name -> after id
+        self.fired = 0
+        self.merged = 0
+
+    def debounce(self, name, delay_ms, func):
+        if name in self._timers:
+            self.merged += 1
+        self.cancel(name)
+        self._timers[name] = self.root.after(delay_ms, lambda: self._fire(name, func))
+
+    def coalesce(self, name, delay_ms, func):
+        if name in self._timers:
+            self.merged += 1
+            return
+        self._timers[name] = self.root.after(delay_ms, lambda: self._fire(name, func))
+
+    def cancel(self, name):
+        after_id = self._timers.pop(name, None)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+            return True
+        return False
+
+    def cancel_all(self):
+        for name in list(self._timers):
+            self.cancel(name)
+
+    def pending(self, name=None):
+        if name is None:
+            return list(self._timers)
+        return name in self._timers
+
+    def _fire(self, name, func):
+        self._timers.pop(name, None)
+        self.fired += 1
+        func()
@@ -0,0 +1,124 @@
+# Last-known interface state on disk, so a launch can show something before the live query returns
+import json
+import os
+import socket
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from compactmodel import CompactInfo, IPv4Addr, IPv6Addr
+
+FORMAT = "ipchanger-state"
+VERSION = 1
+
+
+@dataclass
+class CachedState:
+    saved_at: float  # epoch seconds
+    infos: List[CompactInfo]
+
+
+def default_path():
+    """%LOCALAPPDATA%\\IPChanger on Windows, $XDG_CACHE_HOME/ipchanger elsewhere."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "IPChanger", "last_state.json")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ipchanger", "last_state.json")
+
+
+def _row(info):
+    """One interface as a flat JSON array; addresses stay packed ints."""
+    if not isinstance(info, CompactInfo):
+        info = CompactInfo.from_info(info)
+    return [
+        info.name, info.mac, info.dhcp,
+        [list(a) for a in info.ipv4] if info.ipv4 else None,
+        [list(a) for a in info.ipv6] if info.ipv6 else None,
+        info.gateway_int, info.dns1_int, info.dns2_int,
+        info.isup, info.important, info.linklocal,
+    ]
+
+
+def _info(row):
+    name, mac, dhcp, ipv4, ipv6, gateway, dns1, dns2, isup, important, linklocal = row
+    return CompactInfo(
+        name, mac, dhcp,
+        tuple(IPv4Addr(*a) for a in ipv4) if ipv4 else None,
+        tuple(IPv6Addr(*a) for a in ipv6) if ipv6 else None,
+        gateway, dns1, dns2, isup, important, linklocal,
+    )
+
+
+class StateCache:
+    """
+    Reads and writes the last inventory as one small versioned JSON file.
+    save() skips the write when the list equals what is already on disk, and
+    writes through a temp file + os.replace so a crash never leaves half a file.
+    A file from another format version or another host is ignored.
+    """
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        self.writes = 0
+        self._last = None  # the list last written or loaded
+
+    def load(self) -> Optional[CachedState]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[DEBUG] ignoring unreadable state cache: {e}")
+            return None
+        if data.get("format") != FORMAT or data.get("version") != VERSION:
+            return None
+        if data.get("host") != socket.gethostname():
+            return None
+        try:
+            infos = [_info(row) for row in data["rows"]]
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"[DEBUG] ignoring malformed state cache: {e}")
+            return None
+        self._last = infos
+        return CachedState(saved_at=data.get("saved_at", 0.0), infos=infos)
+
+    def save(self, infos) -> bool:
+        """Write infos if they differ from the last saved state. Returns True if written."""
+        infos = list(infos)
+        if infos == self._last:
+            return False
+        data = {
+            "format": FORMAT,
+            "version": VERSION,
+            "host": socket.gethostname(),
+            "saved_at": time.time(),
+            "rows": [_row(i) for i in infos],
+        }
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".last_state-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            print(f"[DEBUG] could not save state cache: {e}")
+            return False
+        self._last = infos
+        self.writes += 1
+        return True
+
+    def clear(self):
+        self._last = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
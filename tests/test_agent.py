@@ -0,0 +1,136 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+import agent
+from agent import AgentClient
+from fakes import fake_agent
+from interfacemanager import ConfigureInterface
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    return tmp_path
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX modes; Windows uses an ACL")
+def test_token_file_is_private(cache_home):
+    server = fake_agent()
+    try:
+        server._write_token()
+        path = agent.token_path()
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        with open(path, encoding="utf-8") as f:
+            assert f.read().split() == [str(server.port), server.token]
+    finally:
+        server.stop()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX modes; Windows uses an ACL")
+def test_stale_temp_file_does_not_keep_its_mode(cache_home):
+    path = agent.token_path()
+    os.makedirs(os.path.dirname(path))
+    with open(path + ".tmp", "w") as f:
+        f.write("old")
+    os.chmod(path + ".tmp", 0o644)
+    server = fake_agent()
+    try:
+        server._write_token()
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    finally:
+        server.stop()
+
+
+def test_connect_if_running_uses_the_token_file(cache_home):
+    assert AgentClient.connect_if_running() is None
+    server = fake_agent()
+    try:
+        server._write_token()
+        client = AgentClient.connect_if_running()
+        assert client is not None
+        assert len(client.snapshot()) == 4
+        client.close()
+    finally:
+        server.stop()
+
+
+def test_bad_token_is_refused():
+    server = fake_agent()
+    try:
+        with pytest.raises(PermissionError):
+            AgentClient(port=server.port, token="wrong")
+    finally:
+        server.stop()
+
+
+def test_on_close_fires_when_the_agent_goes_away():
+    server = fake_agent()
+    lost = threading.Event()
+    client = AgentClient(port=server.port, token=server.token, on_close=lost.set)
+    server.stop()
+    assert lost.wait(2)
+    assert client.closed
+
+
+def test_own_close_does_not_fire_on_close():
+    server = fake_agent()
+    lost = threading.Event()
+    try:
+        client = AgentClient(port=server.port, token=server.token, on_close=lost.set)
+        client.close()
+        assert wait_for(lambda: client.closed)
+        assert not lost.is_set()
+    finally:
+        server.stop()
+
+
+def test_subscribers_share_one_poller():
+    server = fake_agent(count=10, fast=0.05, slow=0.05)
+    clients = []
+    try:
+        for _ in range(8):
+            client = AgentClient(port=server.port, token=server.token)
+            client.subscribe()
+            clients.append(client)
+        assert wait_for(lambda: all(len(c.infos()) == 10 for c in clients))
+        net = server.collector.net
+        before = net.calls["net_if_addrs"]
+        time.sleep(0.5)
+        # ~10 samples in 0.5 s whatever the client count; 8 pollers would be ~80
+        assert net.calls["net_if_addrs"] - before < 20
+        net.overrides["Ethernet"] = {"isup": False}
+        assert wait_for(lambda: all(c.rebuilder.state["Ethernet"]["status"] == "Down" for c in clients))
+    finally:
+        for client in clients:
+            client.close()
+        server.stop()
+
+
+def test_apply_keeps_fields_that_are_not_given():
+    server = fake_agent()
+    try:
+        client = AgentClient(port=server.port, token=server.token)
+        result = client.configure("Ethernet", dns2=None)
+        assert isinstance(result, ConfigureInterface.PlanResult) and result.ok
+        invalid = client.configure("Ethernet", ip="10.0.0.300")
+        assert not invalid.ok and "octet above 255" in invalid.error
+        missing = client.configure("nope", ip="10.0.0.1")
+        assert not missing.ok
+        assert client.stats()["applies"] == 3
+        client.close()
+    finally:
+        server.stop()
@@ -0,0 +1,90 @@
+import asyncio
+import subprocess
+import time
+
+from asyncinterfaces import AsyncRunner, AsyncConfigureInterface, AsyncInterfaceInfo
+from fakes import PLAN_OK
+from interfacemanager import ConfigureInterface, InterfaceInfo
+
+
+class SleepyRunner(AsyncRunner):
+    """Sleeps `latency` seconds per script and records how many ran at once."""
+    def __init__(self, latency=0.05, concurrency=2, default_timeout=60.0, slow=()):
+        super().__init__(concurrency, default_timeout)
+        self.latency = latency
+        self.slow = slow
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def _run(self, script, timeout):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            delay = self.latency * (10 if any(s in script for s in self.slow) else 1)
+            try:
+                await asyncio.wait_for(asyncio.sleep(delay), timeout)
+            except asyncio.TimeoutError:
+                raise subprocess.TimeoutExpired(script, timeout)
+            return subprocess.CompletedProcess(script, 0, PLAN_OK, "")
+        finally:
+            self.active -= 1
+
+
+def info(name):
+    return InterfaceInfo.Info(
+        name=name, mac="00-15-5D-00-00-00", dhcp=False,
+        ipv4=[InterfaceInfo.IPv4Data(address="192.168.1.23", netmask="255.255.255.0")], ipv6=None,
+        gateway="192.168.1.1", dns1=None, status="Up", important=True, linklocal=False,
+    )
+
+
+def configs(*names):
+    return [(ConfigureInterface(n, ip="192.168.1.23", netmask="255.255.255.0", gateway="192.168.1.1",
+                                dns1="10.0.0.53", dns2=None), info(n)) for n in names]
+
+
+def test_concurrency_is_bounded():
+    runner = SleepyRunner(latency=0.05, concurrency=2)
+
+    async def main():
+        await asyncio.gather(*(runner.run(f"script {i}") for i in range(6)))
+
+    t0 = time.perf_counter()
+    asyncio.run(main())
+    assert runner.calls == 6
+    assert runner.peak == 2
+    assert time.perf_counter() - t0 >= 0.14  # three rounds of two
+
+
+def test_runner_survives_a_second_event_loop():
+    runner = SleepyRunner(latency=0.01, concurrency=1)
+
+    async def main():
+        await asyncio.wait_for(asyncio.gather(runner.run("a"), runner.run("b")), 1.0)
+
+    for _ in range(2):
+        asyncio.run(main())
+    assert runner.calls == 4
+
+
+def test_timeout_fails_only_that_plan():
+    runner = SleepyRunner(latency=0.02, concurrency=4, slow=("'Slow'",))
+    results = asyncio.run(AsyncConfigureInterface.apply_many(configs("Fast", "Slow"), runner, timeout=0.1))
+    assert results[0].ok
+    assert not results[1].ok and "timed out" in results[1].error
+
+
+def test_apply_many_keeps_order_and_overlaps():
+    runner = SleepyRunner(latency=0.1, concurrency=4)
+    t0 = time.perf_counter()
+    results = asyncio.run(AsyncConfigureInterface.apply_many(configs("A", "B", "C", "D"), runner))
+    elapsed = time.perf_counter() - t0
+    assert [r.ok for r in results] == [True] * 4
+    assert runner.peak == 4
+    assert elapsed < 0.3  # sequential would take 0.4 s
+
+
+def test_net_is_not_imported_until_used():
+    assert AsyncInterfaceInfo(SleepyRunner())._net is None
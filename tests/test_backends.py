@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+from backends import LinuxBackend
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture_backend(name):
+    return LinuxBackend(root=os.path.join(FIXTURES, "linux", name))
+
+
+# --- Default routes ---
+
+def test_lowest_metric_default_route_wins():
+    assert fixture_backend("networkd").gateways()["eth0"] == "192.168.1.1"
+
+
+def test_default_route_per_interface():
+    assert fixture_backend("networkd").gateways() == {"eth0": "192.168.1.1", "wlan0": "10.0.0.1"}
+
+
+def test_routes_without_gateway_flag_or_nonzero_destination_are_ignored():
+    gateways = fixture_backend("dhclient").gateways()
+    assert "eth1" not in gateways
+    assert gateways == {"eth0": "192.168.0.1"}
+
+
+# --- Multiple interfaces ---
+
+def test_interface_indexes():
+    assert fixture_backend("networkd").interface_indexes() == {"lo": 1, "eth0": 2, "eth1": 3, "wlan0": 4}
+
+
+def test_every_interface_is_reported():
+    info = fixture_backend("networkd").get_info_light()
+    assert set(info) == {"lo", "eth0", "eth1", "wlan0"}
+    assert info["lo"] == {"dhcp": False, "dns": [], "gateway": None}
+
+
+def test_resolved_link_dns_keeps_ipv4_and_drops_server_names():
+    info = fixture_backend("networkd").get_info_light()
+    assert info["eth0"]["dns"] == ["192.168.1.53", "1.1.1.1"]
+
+
+def test_link_without_dns_falls_back_to_resolved_upstreams():
+    # resolv.conf only names the stub; the upstreams come from resolved's own copy
+    info = fixture_backend("networkd").get_info_light()
+    assert info["wlan0"]["dns"] == ["9.9.9.9"]
+
+
+def test_resolv_conf_dns_only_for_interfaces_with_a_default_route():
+    info = fixture_backend("dhclient").get_info_light()
+    assert info["eth0"]["dns"] == ["8.8.8.8", "8.8.4.4"]
+    assert info["eth1"]["dns"] == []
+
+
+# --- DHCP versus static ---
+
+def test_networkd_and_networkmanager_leases_mark_dhcp():
+    info = fixture_backend("networkd").get_info_light()
+    assert info["eth0"]["dhcp"] is True   # systemd-networkd lease by ifindex
+    assert info["wlan0"]["dhcp"] is True  # NetworkManager lease file
+    assert info["eth1"]["dhcp"] is False
+
+
+def test_dhclient_lease_marks_dhcp():
+    info = fixture_backend("dhclient").get_info_light()
+    assert info["eth0"]["dhcp"] is True   # newest lease runs to 2099
+    assert info["eth1"]["dhcp"] is False  # only lease expired in 2021
+
+
+def test_expired_dhclient_lease_is_not_dhcp():
+    backend = LinuxBackend(root=os.path.join(FIXTURES, "linux", "dhclient"), clock=lambda: 4102488000.0)  # 2100
+    assert backend.get_info_light()["eth0"]["dhcp"] is False
+
+
+def test_dhclient_lease_expiry_forms():
+    text = (
+        'lease {\n  interface "eth0";\n  expire epoch 1792663200; # Thu Oct 22 10:00:00 2026\n}\n'
+        'lease {\n  interface "eth1";\n  expire never;\n}\n'
+        'lease {\n  interface "eth2";\n  expire 4 2026/10/22 10:00:00;\n}\n'
+        'lease {\n  interface "eth3";\n  expire garbage;\n}\n'
+    )
+    assert LinuxBackend.dhclient_leases(text) == {"eth0": 1792663200.0, "eth1": None, "eth2": 1792663200, "eth3": 0.0}
+
+
+def test_dhcpcd_lease_marks_dhcp(tmp_path):
+    (tmp_path / "sys/class/net/eth0").mkdir(parents=True)
+    (tmp_path / "sys/class/net/eth0/ifindex").write_text("2\n")
+    (tmp_path / "var/lib/dhcpcd").mkdir(parents=True)
+    (tmp_path / "var/lib/dhcpcd/eth0.lease").write_bytes(b"\x02\x01")
+    assert LinuxBackend(root=str(tmp_path)).get_info_light()["eth0"]["dhcp"] is True
+
+
+# --- Missing or unreadable files ---
+
+def test_empty_root_reports_nothing(tmp_path):
+    backend = LinuxBackend(root=str(tmp_path))
+    assert backend.gateways() == {}
+    assert backend.interface_indexes() == {}
+    assert backend.global_dns() == []
+    assert backend.get_info_light() == {}
+
+
+def test_unreadable_files_are_treated_as_missing(tmp_path):
+    # A directory where a file should be fails to open even for root
+    for path in ("proc/net/route", "etc/resolv.conf", "sys/class/net/eth0/ifindex"):
+        (tmp_path / path).mkdir(parents=True)
+    backend = LinuxBackend(root=str(tmp_path))
+    assert backend.gateways() == {}
+    assert backend.global_dns() == []
+    assert backend.interface_indexes() == {}
+
+
+def test_interfaces_without_resolver_state(tmp_path):
+    (tmp_path / "sys/class/net/eth0").mkdir(parents=True)
+    (tmp_path / "sys/class/net/eth0/ifindex").write_text("2\n")
+    backend = LinuxBackend(root=str(tmp_path))
+    assert backend.resolved_link_dns(2) is None
+    assert backend.get_info_light() == {"eth0": {"dhcp": False, "dns": [], "gateway": None}}
+
+
+@pytest.mark.parametrize("line", [
+    "eth0\tnothex\t0101A8C0\t0003\t0\t0\t0\t00000000",
+    "eth0\t00000000",
+    "",
+])
+def test_malformed_route_lines_are_skipped(tmp_path, line):
+    (tmp_path / "proc/net").mkdir(parents=True)
+    (tmp_path / "proc/net/route").write_text("Iface\tDestination\n" + line + "\n")
+    assert LinuxBackend(root=str(tmp_path)).gateways() == {}
@@ -0,0 +1,82 @@
+import time
+
+from bulkapply import Target, bulk_apply, validate_targets
+from fakes import PLAN_OK
+from interfacemanager import InterfaceInfo
+from powershell import FakeRunner
+
+
+def info(name, ip, gateway="192.168.1.1", dns1="192.168.1.53"):
+    return InterfaceInfo.Info(
+        name=name, mac="00-15-5D-00-00-00", dhcp=False,
+        ipv4=[InterfaceInfo.IPv4Data(address=ip, netmask="255.255.255.0")], ipv6=None,
+        gateway=gateway, dns1=dns1, dns2=None, status="Up", important=True, linklocal=False,
+    )
+
+
+CURRENT = [info("Ethernet", "192.168.1.23"), info("Ethernet 2", "192.168.1.24"), info("Wi-Fi", "192.168.1.25")]
+
+
+def runner_factory(latency=None):
+    """FakeRunners that take latency[alias] seconds to apply a plan for that alias."""
+    latency = latency or {}
+
+    def reply(script):
+        time.sleep(max([s for name, s in latency.items() if f"'{name}'" in script] or [0]))
+        return PLAN_OK
+
+    runners = []
+
+    def factory():
+        runners.append(FakeRunner(default=reply))
+        return runners[-1]
+    factory.runners = runners
+    return factory
+
+
+def calls(factory):
+    return [script for runner in factory.runners for script in runner.calls]
+
+
+def test_partial_target_keeps_the_other_fields():
+    factory = runner_factory()
+    result = bulk_apply([Target("Ethernet", dns1="10.0.0.53")], CURRENT, factory)
+    assert result.ok
+    assert result.results["Ethernet"].steps == ["set_dns"]
+    assert len(calls(factory)) == 1
+
+
+def test_none_still_clears_a_field():
+    result = bulk_apply([Target("Ethernet", gateway=None)], CURRENT, runner_factory())
+    assert result.ok
+    assert "clear_gateway" in result.results["Ethernet"].steps
+
+
+def test_ip_held_by_another_interface_is_rejected():
+    errors = validate_targets([Target("Ethernet", ip="192.168.1.25")], {i.name: i for i in CURRENT})
+    assert errors == {"Ethernet": ["IP Address 192.168.1.25 is also assigned to Wi-Fi."]}
+
+
+def test_ip_swapped_between_targets_is_allowed():
+    targets = [Target("Ethernet", ip="192.168.1.24"), Target("Ethernet 2", ip="192.168.1.23")]
+    assert validate_targets(targets, {i.name: i for i in CURRENT}) == {}
+
+
+def test_one_invalid_target_means_nothing_is_applied():
+    factory = runner_factory()
+    result = bulk_apply([Target("Ethernet", dns1="10.0.0.53"), Target("Wi-Fi", ip="300.1.1.1")], CURRENT, factory)
+    assert not result.ok
+    assert not result.results["Ethernet"].applied
+    assert result.results["Ethernet"].errors == ["Not applied: other targets failed validation."]
+    assert result.results["Wi-Fi"].errors
+    assert calls(factory) == []
+
+
+def test_wall_clock_is_close_to_the_slowest_interface():
+    factory = runner_factory({"Ethernet": 0.1, "Ethernet 2": 0.1, "Wi-Fi": 0.3})
+    targets = [Target(i.name, dns1="10.0.0.53") for i in CURRENT]
+    t0 = time.perf_counter()
+    result = bulk_apply(targets, CURRENT, factory, max_workers=3)
+    elapsed = time.perf_counter() - t0
+    assert result.ok and all(r.applied for r in result.results.values())
+    assert 0.3 <= elapsed < 0.45  # sequential would take 0.5 s
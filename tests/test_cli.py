@@ -0,0 +1,52 @@
+import json
+
+import cli
+from backends import WindowsBackend
+from fakes import FakePsutil, fake_runner
+from interfacemanager import InterfaceCollector
+
+
+def fake_collector(count=3):
+    net = FakePsutil(count)
+    return InterfaceCollector(net=net, runner=fake_runner(net), backend=WindowsBackend())
+
+
+def run(capsys, *argv):
+    code = cli.main(list(argv), collector=fake_collector())
+    out = capsys.readouterr().out
+    return code, [json.loads(line) for line in out.splitlines() if line.strip()]
+
+
+def test_list_names(capsys):
+    code, (names,) = run(capsys, "list", "--names")
+    assert code == cli.EXIT_OK
+    assert "Ethernet" in names
+
+
+def test_unknown_interface(capsys):
+    code, (output,) = run(capsys, "show", "nope")
+    assert code == cli.EXIT_NOT_FOUND
+    assert output["error"] == "not_found"
+
+
+def test_invalid_target(capsys):
+    code, (output,) = run(capsys, "diff", "Ethernet", "--ip", "10.0.0.300")
+    assert code == cli.EXIT_INVALID
+    assert output["error"] == "invalid"
+
+
+def test_dry_run_shows_the_plan(capsys):
+    code, (output,) = run(capsys, "apply", "Ethernet", "--dns2", "", "--dry-run")
+    assert code == cli.EXIT_OK
+    assert output["applied"] is False and output["steps"]
+
+
+def test_export_takes_pretty(capsys, tmp_path):
+    code, _ = run(capsys, "export", "--pretty", "--polls", "1", "--interval", "0", "--output", str(tmp_path / "x.ndjson"))
+    assert code == cli.EXIT_OK
+
+
+def test_export_failure_is_reported_as_json(capsys, tmp_path):
+    code, (output,) = run(capsys, "export", "--polls", "1", "--output", str(tmp_path / "missing" / "x.ndjson"))
+    assert code == cli.EXIT_FAILED
+    assert output["error"] == "exception" and output["type"] == "FileNotFoundError"
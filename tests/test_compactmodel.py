@@ -0,0 +1,45 @@
+import pytest
+
+from compactmodel import CompactInfo, IPv4Addr, ipv4_to_int, mask_to_prefix, prefix_to_mask, int_to_ipv4
+from interfacemanager import InterfaceInfo
+
+
+def info(address, netmask, gateway="192.168.1.1", dns1="192.168.1.53"):
+    return InterfaceInfo.Info(
+        name="Ethernet", mac="00-15-5D-00-00-00", dhcp=False,
+        ipv4=[InterfaceInfo.IPv4Data(address=address, netmask=netmask)], ipv6=None,
+        gateway=gateway, dns1=dns1, dns2=None, status="Up", important=True, linklocal=False,
+    )
+
+
+def test_addresses_pack_to_ints():
+    addr = IPv4Addr.parse("192.168.1.23", "255.255.255.0")
+    assert addr == (0xC0A80117, 24)
+    assert (addr.address, addr.netmask) == ("192.168.1.23", "255.255.255.0")
+
+
+@pytest.mark.parametrize("address", ["not-an-ip", "300.1.1.1", "10.1", "010.0.0.1"])
+def test_unparsable_address_is_kept(address):
+    assert ipv4_to_int(address) == address
+    assert int_to_ipv4(ipv4_to_int(address)) == address
+
+
+@pytest.mark.parametrize("netmask", ["255.0.255.0", "255.255.255.1", "garbage"])
+def test_noncontiguous_or_bad_mask_is_kept(netmask):
+    assert mask_to_prefix(netmask) == netmask
+    assert prefix_to_mask(mask_to_prefix(netmask)) == netmask
+
+
+@pytest.mark.parametrize("address, netmask, gateway", [
+    ("192.168.1.23", "255.255.255.0", "192.168.1.1"),
+    ("192.168.1.23", "255.0.255.0", "192.168.1.1"),
+    ("not-an-ip", "255.255.255.0", "gateway?"),
+])
+def test_info_round_trip(address, netmask, gateway):
+    original = info(address, netmask, gateway)
+    assert CompactInfo.from_info(original).to_info() == original
+
+
+def test_unpacked_address_is_not_linklocal():
+    assert not IPv4Addr.parse("169.254.x.y", "255.255.0.0").is_linklocal
+    assert IPv4Addr.parse("169.254.1.2", "255.255.0.0").is_linklocal
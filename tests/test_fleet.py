@@ -0,0 +1,142 @@
+import json
+import time
+
+import pytest
+
+import fleet
+from agent import Agent
+from fakes import fake_agent
+from fleet import FleetController, format_address, parse_address
+
+TOKEN = "fake-token"
+
+
+@pytest.fixture
+def agents():
+    started = []
+
+    def start(n=1, **kwargs):
+        new = [fake_agent(token=TOKEN, **kwargs) for _ in range(n)]
+        started.extend(new)
+        return new
+    yield start
+    for server in started:
+        server.stop()
+
+
+def hosts_of(servers):
+    return [f"127.0.0.1:{s.port}" for s in servers]
+
+
+def free_port():
+    server = fake_agent()
+    port = server.port
+    server.stop()
+    return port
+
+
+def test_parse_and_format_address():
+    assert parse_address("10.0.0.5") == ("10.0.0.5", fleet.DEFAULT_PORT)
+    assert parse_address(" lab-17:5000 ") == ("lab-17", 5000)
+    assert parse_address("[fe80::1]:6000") == ("fe80::1", 6000)
+    assert format_address(("fe80::1", 6000)) == "[fe80::1]:6000"
+
+
+def test_inventory_from_many_agents(agents):
+    servers = agents(20, count=3)
+    with FleetController(hosts_of(servers), TOKEN, concurrency=8) as controller:
+        results = list(controller.inventory())
+    assert sorted(r.host for r in results) == sorted(hosts_of(servers))
+    assert all(r.ok and len(r.infos) == 3 for r in results)
+
+
+def test_connections_are_pooled(agents):
+    servers = agents(5)
+    with FleetController(hosts_of(servers), TOKEN) as controller:
+        list(controller.inventory())
+        list(controller.inventory())
+        assert controller.pool.connects == 5
+
+
+def test_results_arrive_in_completion_order(agents):
+    slow, medium, fast = agents(latency=0.4) + agents(latency=0.2) + agents(latency=0.0)
+    with FleetController(hosts_of([slow, medium, fast]), TOKEN) as controller:
+        list(controller.inventory())  # connect first so only the applies are timed
+        targets = {h: {"name": "Ethernet", "dns2": None} for h in hosts_of([slow, medium, fast])}
+        order = [r.host for r in controller.configure(targets)]
+    assert order == hosts_of([fast, medium, slow])
+
+
+def test_per_host_timeout(agents):
+    slow = agents(latency=2.0)[0]
+    fast = agents()[0]
+    with FleetController(hosts_of([slow, fast]), TOKEN, apply_timeout=0.3) as controller:
+        list(controller.inventory())
+        t0 = time.perf_counter()
+        results = {r.host: r for r in controller.configure(
+            {h: {"name": "Ethernet", "dns2": None} for h in hosts_of([slow, fast])})}
+        elapsed = time.perf_counter() - t0
+    timed_out = results[hosts_of([slow])[0]]
+    assert not timed_out.ok and timed_out.error.startswith("TimeoutError")
+    assert results[hosts_of([fast])[0]].ok
+    assert elapsed < 1.0  # bounded by the timeout, not the 2 s apply
+
+
+def test_refused_host_does_not_hold_up_the_rest(agents):
+    server = agents()[0]
+    dead = f"127.0.0.1:{free_port()}"
+    with FleetController([dead] + hosts_of([server]), TOKEN) as controller:
+        results = {r.host: r for r in controller.inventory()}
+    assert not results[dead].ok and "Refused" in results[dead].error
+    assert results[hosts_of([server])[0]].ok
+
+
+def test_killed_agent_is_reconnected_once(agents):
+    server = agents()[0]
+    port = server.port
+    with FleetController(hosts_of([server]), TOKEN) as controller:
+        assert next(controller.inventory()).ok
+        server.stop()
+        restarted = fake_agent(token=TOKEN, port=port, count=2)
+        try:
+            result = next(controller.inventory())
+            assert result.ok and len(result.infos) == 2
+            assert controller.pool.connects == 2
+        finally:
+            restarted.stop()
+
+
+def test_killed_agent_that_stays_down_is_reported(agents):
+    server = agents()[0]
+    with FleetController(hosts_of([server]), TOKEN) as controller:
+        assert next(controller.inventory()).ok
+        server.stop()
+        result = next(controller.inventory())
+    assert not result.ok and result.error
+
+
+def test_bad_token_is_reported(agents):
+    server = agents()[0]
+    with FleetController(hosts_of([server]), "wrong") as controller:
+        result = next(controller.inventory())
+    assert not result.ok and "bad token" in result.error
+
+
+def test_cli_exit_code(agents, tmp_path, capsys):
+    servers = agents(3)
+    hosts = tmp_path / "hosts.txt"
+    hosts.write_text("\n".join(hosts_of(servers)) + "\n# a comment\n")
+    assert fleet.main(["--hosts", str(hosts), "--token", TOKEN, "inventory"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(lines) == 3 and all(line["ok"] for line in lines)
+
+    hosts.write_text("\n".join(hosts_of(servers) + [f"127.0.0.1:{free_port()}"]) + "\n")
+    assert fleet.main(["--hosts", str(hosts), "--token", TOKEN, "apply", "Ethernet", "--dns2", ""]) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(line["ok"] for line in lines) == [False, True, True, True]
+
+
+def test_agent_refuses_non_loopback_without_insecure():
+    with pytest.raises(ValueError):
+        Agent(host="0.0.0.0", port=0)
+    Agent(host="0.0.0.0", port=0, insecure=True)  # allowed, but not started here
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+import main
+from backends import Backend
+from fakes import FakePsutil
+from interfacemanager import InterfaceCollector, RefreshManager
+from netlinksource import NetlinkEvent
+
+
+class CountingBackend(Backend):
+    name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_info_light(self, runner=None):
+        self.calls += 1
+        return {}
+
+
+class KickCounter:
+    kicks = 0
+
+    def kick(self):
+        self.kicks += 1
+
+
+def setup(monkeypatch):
+    backend = CountingBackend()
+    refresher = RefreshManager(InterfaceCollector(net=FakePsutil(2), backend=backend), ttl=3600.0)
+    monkeypatch.setattr(main, "refresher", refresher)
+    monkeypatch.setattr(main, "poller", KickCounter())
+    refresher.tick()
+    refresher.tick()
+    assert backend.calls == 1  # second tick reused the cached light data
+    return backend
+
+
+def test_route_event_refetches_light_data(monkeypatch):
+    backend = setup(monkeypatch)
+    main.netlink_changed([NetlinkEvent("route", "new", 2, gateway="192.168.1.254")])
+    main.refresher.tick()
+    assert backend.calls == 2
+    assert main.poller.kicks == 1
+
+
+def test_link_event_only_kicks(monkeypatch):
+    backend = setup(monkeypatch)
+    main.netlink_changed([NetlinkEvent("link", "new", 2, isup=True)])
+    main.refresher.tick()
+    assert backend.calls == 1
+    assert main.poller.kicks == 1
+
+
+def test_startup_does_not_import_agent_or_reachability():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, main; print(sorted(m for m in ('agent', 'reachability', 'asyncio') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
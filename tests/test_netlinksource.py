@@ -0,0 +1,150 @@
+import errno
+import socket
+import threading
+
+from netlinksource import (
+    IFADDRMSG, IFINFOMSG, IFF_LOWER_UP, IFF_UP, IFA_ADDRESS, IFA_LABEL, IFA_LOCAL, IFLA_IFNAME,
+    NLMSG_DONE, RTA_DST, RTA_GATEWAY, RTA_OIF, RTM_DELADDR, RTM_NEWADDR, RTM_NEWLINK, RTM_NEWROUTE,
+    RTMSG, NetlinkChangeSource, RecordedSocket, decode, pack_message,
+)
+
+
+def link(index, name, flags=IFF_UP | IFF_LOWER_UP, msg_type=RTM_NEWLINK):
+    return pack_message(msg_type, IFINFOMSG.pack(socket.AF_UNSPEC, 1, index, flags, 0),
+                        [(IFLA_IFNAME, name.encode() + b"\0")])
+
+
+def addr4(index, address, prefixlen=24, label=None, msg_type=RTM_NEWADDR):
+    attrs = [(IFA_ADDRESS, socket.inet_aton(address)), (IFA_LOCAL, socket.inet_aton(address))]
+    if label:
+        attrs.append((IFA_LABEL, label.encode() + b"\0"))
+    return pack_message(msg_type, IFADDRMSG.pack(socket.AF_INET, prefixlen, 0, 0, index), attrs)
+
+
+def route4(index, gateway, dst=None, dst_len=0):
+    attrs = [(RTA_OIF, index.to_bytes(4, "little", signed=True)), (RTA_GATEWAY, socket.inet_aton(gateway))]
+    if dst:
+        attrs.append((RTA_DST, socket.inet_aton(dst)))
+    return pack_message(RTM_NEWROUTE, RTMSG.pack(socket.AF_INET, dst_len, 0, 0, 254, 3, 0, 1, 0), attrs)
+
+
+# --- decode ---
+
+def test_link_up_with_name():
+    (event,) = decode(link(2, "eth0"))
+    assert (event.kind, event.action, event.index, event.name, event.isup) == ("link", "new", 2, "eth0", True)
+
+
+def test_link_needs_lower_up_to_count_as_up():
+    (event,) = decode(link(3, "wlan0", flags=IFF_UP))
+    assert event.isup is False
+
+
+def test_ipv4_address_prefers_local_and_reads_label():
+    (event,) = decode(addr4(2, "192.168.1.23", 24, label="eth0", msg_type=RTM_DELADDR))
+    assert (event.kind, event.action) == ("addr", "del")
+    assert (event.family, event.address, event.prefixlen, event.name) == (socket.AF_INET, "192.168.1.23", 24, "eth0")
+
+
+def test_ipv6_address():
+    raw = socket.inet_pton(socket.AF_INET6, "fe80::1")
+    data = pack_message(RTM_NEWADDR, IFADDRMSG.pack(socket.AF_INET6, 64, 0, 253, 4), [(IFA_ADDRESS, raw)])
+    (event,) = decode(data)
+    assert (event.index, event.family, event.address, event.prefixlen) == (4, socket.AF_INET6, "fe80::1", 64)
+
+
+def test_route_reads_oif_gateway_and_destination():
+    (default,) = decode(route4(2, "192.168.1.1"))
+    assert (default.kind, default.index, default.gateway, default.address, default.prefixlen) == \
+        ("route", 2, "192.168.1.1", None, 0)
+    (subnet,) = decode(route4(3, "10.0.0.1", dst="10.1.0.0", dst_len=16))
+    assert (subnet.address, subnet.prefixlen) == ("10.1.0.0", 16)
+
+
+def test_several_messages_in_one_buffer():
+    data = link(2, "eth0") + addr4(2, "10.0.0.5") + pack_message(NLMSG_DONE, b"") + route4(2, "10.0.0.1")
+    assert [e.kind for e in decode(data)] == ["link", "addr", "route"]
+
+
+def test_unknown_and_truncated_messages_are_skipped():
+    unknown = pack_message(99, b"\0" * 16)
+    whole = link(2, "eth0")
+    assert [e.name for e in decode(unknown + whole + whole[:10])] == ["eth0"]
+    assert decode(b"") == []
+    assert decode(b"\xff" * 7) == []
+
+
+def test_header_length_past_the_buffer_stops_decoding():
+    data = bytearray(link(2, "eth0"))
+    data[0:4] = (len(data) + 100).to_bytes(4, "little")
+    assert decode(bytes(data)) == []
+
+
+# --- NetlinkChangeSource ---
+
+def run_source(buffers, **kwargs):
+    """Run a source over a recording until its reader ends; returns (source, batches, stopped)."""
+    batches = []
+    stopped = threading.Event()
+    source = NetlinkChangeSource(
+        on_change=batches.append,
+        socket_factory=lambda: RecordedSocket(buffers),
+        on_stop=stopped.set,
+        **kwargs,
+    )
+    assert source.start()
+    source._thread.join(2)
+    return source, batches, stopped
+
+
+def test_batches_are_delivered_per_recv():
+    source, batches, stopped = run_source([link(2, "eth0") + addr4(2, "10.0.0.5"), route4(2, "10.0.0.1")])
+    assert [[e.kind for e in batch] for batch in batches] == [["link", "addr"], ["route"]]
+    assert source.messages == 3
+    assert stopped.is_set()  # the recording ran out, as a closed socket would
+
+
+def test_enobufs_reports_overflow_and_keeps_reading():
+    overflows = []
+    source, batches, stopped = run_source(
+        [link(2, "eth0"), OSError(errno.ENOBUFS, "No buffer space available"), link(3, "eth1")],
+        on_overflow=lambda: overflows.append(True),
+    )
+    assert overflows == [True]
+    assert source.overflows == 1
+    assert [batch[0].name for batch in batches] == ["eth0", "eth1"]
+
+
+def test_overflow_defaults_to_an_empty_change():
+    _, batches, _ = run_source([OSError(errno.ENOBUFS, "No buffer space available")])
+    assert batches == [[]]
+
+
+def test_other_socket_errors_end_the_reader_and_call_on_stop():
+    source, batches, stopped = run_source([OSError(errno.EBADF, "Bad file descriptor"), link(2, "eth0")])
+    assert stopped.is_set()
+    assert batches == []
+    assert not source.active
+
+
+def test_stop_does_not_call_on_stop():
+    stopped = threading.Event()
+
+    class IdleSocket(RecordedSocket):
+        def recv(self, bufsize):
+            if self.closed:
+                return b""
+            raise socket.timeout()
+
+    source = NetlinkChangeSource(on_change=lambda e: None, socket_factory=lambda: IdleSocket([]),
+                                 on_stop=stopped.set)
+    assert source.start()
+    source.stop(timeout=2)
+    assert not source.active
+    assert not stopped.is_set()
+
+
+def test_start_returns_false_without_netlink():
+    def unavailable():
+        raise OSError("netlink is not available on this platform")
+    assert NetlinkChangeSource(on_change=lambda e: None, socket_factory=unavailable).start() is False
@@ -0,0 +1,45 @@
+from interfacemanager import ConfigureInterface, InterfaceInfo
+
+
+def info(dhcp, gateway="192.168.1.1"):
+    return InterfaceInfo.Info(
+        name="Ethernet", mac="00-15-5D-00-00-00", dhcp=dhcp,
+        ipv4=[InterfaceInfo.IPv4Data(address="192.168.1.23", netmask="255.255.255.0")], ipv6=None,
+        gateway=gateway, dns1="192.168.1.53", dns2=None, status="Up", important=True, linklocal=False,
+    )
+
+
+def target(**changes):
+    values = dict(ip="192.168.1.23", netmask="255.255.255.0", gateway="192.168.1.1", dns1="192.168.1.53", dns2=None)
+    values.update(changes)
+    return ConfigureInterface("Ethernet", **values)
+
+
+def test_gateway_only_change_on_static_interface_replaces_the_route():
+    plan = target(gateway="192.168.1.254").compile_plan(info(dhcp=False))
+    assert plan.step_names() == ["clear_gateway", "set_gateway"]
+
+
+def test_gateway_only_change_on_dhcp_interface_goes_static():
+    plan = target(gateway="192.168.1.254").compile_plan(info(dhcp=True))
+    assert plan.step_names() == ["set_static", "clear_ip", "clear_gateway", "set_ip", "set_dns"]
+    set_ip = plan.steps[3].script
+    assert "-IPAddress '192.168.1.23'" in set_ip and "-DefaultGateway '192.168.1.254'" in set_ip
+    assert not any("New-NetRoute" in step.script for step in plan.steps)
+
+
+def test_dns_only_change_on_dhcp_interface_stays_dhcp():
+    plan = target(dns1="1.1.1.1").compile_plan(info(dhcp=True))
+    assert plan.step_names() == ["set_dns"]
+
+
+def test_rollback_to_dhcp_removes_what_the_plan_added():
+    script = target(gateway="192.168.1.254").compile_plan(info(dhcp=True)).render()
+    dhcp_branch = script[script.index("if ($prev.Dhcp -eq 'Enabled')"):script.index("} else {", script.index("if ($prev.Dhcp"))]
+    assert "Remove-NetIPAddress" in dhcp_branch
+    assert "Remove-NetRoute" in dhcp_branch
+    assert dhcp_branch.index("Remove-NetRoute") < dhcp_branch.index("-Dhcp Enabled")
+
+
+def test_no_changes_no_steps():
+    assert not target().compile_plan(info(dhcp=False))
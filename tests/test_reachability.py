@@ -0,0 +1,116 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import reachability
+from fakes import fake_dns_server
+
+TIMEOUT = 0.3
+
+
+@pytest.fixture
+def dns():
+    stops = []
+
+    def start(delay=0.0):
+        port, stop = fake_dns_server(delay=delay)
+        stops.append(stop)
+        return port
+    yield start
+    for stop in stops:
+        stop()
+
+
+@pytest.fixture
+def tcp_listener():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+def closed_port(kind=socket.SOCK_STREAM):
+    sock = socket.socket(socket.AF_INET, kind)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_dns_answered(dns):
+    (result,) = reachability.verify(dns1="127.0.0.1", dns_port=dns(), timeout=TIMEOUT)
+    assert (result.label, result.target, result.ok) == ("DNS 1", "127.0.0.1", True)
+    assert 0 <= result.ms < TIMEOUT * 1000
+
+
+def test_dns_delayed_past_timeout(dns):
+    (result,) = reachability.verify(dns1="127.0.0.1", dns_port=dns(delay=TIMEOUT * 3), timeout=TIMEOUT)
+    assert not result.ok
+    assert result.error == "no answer"
+    assert result.ms is None
+
+
+def test_dns_refused():
+    (result,) = reachability.verify(dns2="127.0.0.1", dns_port=closed_port(socket.SOCK_DGRAM), timeout=TIMEOUT)
+    assert result.label == "DNS 2"
+    assert not result.ok and result.error
+
+
+def test_dns_reply_with_another_id_is_ignored():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2)
+
+    def answer_wrong():
+        data, addr = sock.recvfrom(512)
+        wrong = bytes([data[0] ^ 0xFF]) + data[1:2] + b"\x81\x80" + data[4:]
+        sock.sendto(wrong, addr)
+    threading.Thread(target=answer_wrong, daemon=True).start()
+    try:
+        (result,) = reachability.verify(dns1="127.0.0.1", dns_port=sock.getsockname()[1], timeout=TIMEOUT)
+        assert not result.ok
+    finally:
+        sock.close()
+
+
+def test_gateway_listener_accepts(tcp_listener):
+    (result,) = reachability.verify(gateway="127.0.0.1", gateway_ports=(tcp_listener,), timeout=TIMEOUT)
+    assert (result.label, result.ok) == ("Gateway", True)
+
+
+def test_gateway_refusing_counts_as_reachable():
+    (result,) = reachability.verify(gateway="127.0.0.1", gateway_ports=(closed_port(),), timeout=TIMEOUT)
+    assert result.ok
+
+
+def test_any_gateway_port_is_enough(tcp_listener):
+    # A closed port answers with a reset; the listener answers too; either one wins
+    (result,) = reachability.verify(gateway="127.0.0.1", gateway_ports=(closed_port(), tcp_listener), timeout=TIMEOUT)
+    assert result.ok
+
+
+def test_probes_run_concurrently_within_one_timeout(dns, tcp_listener):
+    slow_port = dns(delay=TIMEOUT * 3)
+    t0 = time.perf_counter()
+    results = reachability.verify("127.0.0.1", "127.0.0.1", "127.0.0.1", timeout=TIMEOUT,
+                                  gateway_ports=(tcp_listener,), dns_port=slow_port)
+    elapsed = time.perf_counter() - t0
+    assert [r.label for r in results] == ["Gateway", "DNS 1", "DNS 2"]
+    assert [r.ok for r in results] == [True, False, False]
+    # Two DNS timeouts in parallel, not back to back
+    assert elapsed < TIMEOUT * 1.8
+
+
+def test_nothing_to_probe():
+    assert reachability.verify() == []
+
+
+def test_describe():
+    results = [
+        reachability.ProbeResult("Gateway", "10.0.0.1", True, 2.4),
+        reachability.ProbeResult("DNS 1", "10.0.0.53", False, error="no answer"),
+    ]
+    assert reachability.describe(results) == "  Gateway 10.0.0.1: 2 ms\n  DNS 1 10.0.0.53: unreachable (no answer)"
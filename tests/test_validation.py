@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+import validation
+from validation import parse_ipv4, validate_columns
+
+# Non-ASCII digits that str.isdigit() and int() accept
+UNICODE_DIGITS = ["١.1.1.1", "1.1.1.٢", "１.1.1.1", "1.१.1.1", "10.0.0.۵"]
+
+
+def test_parse_ipv4():
+    assert parse_ipv4("192.168.1.1") == 0xC0A80101
+    assert parse_ipv4("  10.0.0.1 ") == 0x0A000001
+    assert parse_ipv4("") is None
+    assert parse_ipv4(None) is None
+    assert parse_ipv4("1.2.3") == -1
+    assert parse_ipv4("01.2.3.4") == -1
+    assert parse_ipv4("1.2.3.256") == -2
+
+
+@pytest.mark.parametrize("text", UNICODE_DIGITS)
+def test_non_ascii_digits_are_bad_syntax(text):
+    assert parse_ipv4(text) == -1
+
+
+@pytest.mark.parametrize("text", UNICODE_DIGITS + ["1.1.1.1\0", "1.1.1\0.1"])
+def test_both_paths_reject_the_same_odd_input(text):
+    pytest.importorskip("numpy")
+    columns = ([text], ["255.255.255.0"], [None], [text], [None])
+    python = validate_columns(*columns, use_numpy=False).codes
+    vectorized = validate_columns(*columns, use_numpy=True).codes.tolist()
+    assert python == vectorized
+    assert python[0] & validation.IP_SYNTAX and python[0] & validation.DNS1_SYNTAX
+
+
+def _random_address(rng):
+    pick = rng.random()
+    if pick < 0.05:
+        return None
+    if pick < 0.1:
+        return rng.choice(["", "1.2.3", "1..2.3", "01.2.3.4", "a.b.c.d", " 10.0.0.1 ", "300.1.1.1",
+                           "255.255.0.255", "1.2.3.4.5", "1234.1.1.1"] + UNICODE_DIGITS)
+    if pick < 0.4:
+        prefix = rng.randint(0, 32)
+        return ".".join(str(b) for b in (((0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF).to_bytes(4, "big")))
+    return ".".join(str(rng.choice([0, 1, 10, 127, 168, 192, 224, 254, 255, rng.randint(0, 255)])) for _ in range(4))
+
+
+def test_python_and_numpy_paths_agree():
+    pytest.importorskip("numpy")
+    rng = random.Random(1234)
+    n = 5000
+    columns = [[_random_address(rng) for _ in range(n)] for _ in range(5)]
+    python = validate_columns(*columns, use_numpy=False).codes
+    vectorized = validate_columns(*columns, use_numpy=True).codes.tolist()
+    assert python == vectorized
+    assert any(python) and not all(python)
+
+
+def test_valid_plan():
+    result = validate_columns(["192.168.1.10"], ["255.255.255.0"], ["192.168.1.1"], ["1.1.1.1"], [None])
+    assert result.ok
+    assert result.invalid_rows() == []
+
+
+def test_messages_for_bad_gateway():
+    result = validate_columns(["192.168.1.10"], ["255.255.255.0"], ["192.168.2.1"], use_numpy=False)
+    assert result.invalid_rows() == [0]
+    assert result.errors(0) == ["Gateway is not in the same subnet as the IP address."]
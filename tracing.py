@@ -0,0 +1,198 @@
+# Lightweight tracing: named spans in a ring buffer, exportable as Chrome trace JSON
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class Span:
+    """
+    One timed operation. args holds whatever the caller attaches with set(),
+    e.g. exit_code and output_bytes for PowerShell calls.
+    """
+    __slots__ = ("name", "cat", "start", "duration", "tid", "thread", "args", "_tracer")
+
+    def __init__(self, tracer, name, cat, args):
+        self._tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+        self.duration = None
+        thread = threading.current_thread()
+        self.tid = thread.ident
+        self.thread = thread.name
+
+    def set(self, **args):
+        self.args.update(args)
+        return self
+
+    def set_result(self, result):
+        """Record exit code and output size from a subprocess.CompletedProcess."""
+        self.args["exit_code"] = result.returncode
+        self.args["output_bytes"] = len(result.stdout or "") + len(result.stderr or "")
+        return result
+
+    def __enter__(self):
+        self.start = self._tracer.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = self._tracer.clock() - self.start
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+            if getattr(exc, "returncode", None) is not None:
+                self.args["exit_code"] = exc.returncode
+        self._tracer.add(self)
+        return False
+
+    def __repr__(self):
+        ms = f"{self.duration * 1000:.2f} ms" if self.duration is not None else "open"
+        return f"Span({self.name}, {ms})"
+
+
+class _NullSpan:
+    """Returned while tracing is disabled so call sites need no checks."""
+    args = {}
+    start = 0.0
+    duration = None
+
+    def set(self, **args):
+        return self
+
+    def set_result(self, result):
+        return result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Keeps the most recent `capacity` finished spans; older ones fall off the end,
+    so tracing can stay on for a whole session with bounded memory.
+    """
+    def __init__(self, capacity=10000, enabled=True, clock=time.perf_counter):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.clock = clock
+        self.dropped = 0
+        self._spans = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._origin = clock()
+
+    def span(self, name, cat="app", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, cat, args)
+
+    def add(self, span):
+        with self._lock:
+            if len(self._spans) == self.capacity:
+                self.dropped += 1
+            self._spans.append(span)
+
+    def record(self, name, start, duration, cat="app", **args):
+        """Add an already-measured span (start is on this tracer's clock)."""
+        if not self.enabled:
+            return None
+        span = Span(self, name, cat, args)
+        span.start = start
+        span.duration = duration
+        self.add(span)
+        return span
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self.dropped = 0
+
+    def summary(self):
+        """{name: {"count", "total_ms", "max_ms"}} over the buffered spans."""
+        totals = {}
+        for span in self.spans():
+            row = totals.setdefault(span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            ms = span.duration * 1000
+            row["count"] += 1
+            row["total_ms"] += ms
+            row["max_ms"] = max(row["max_ms"], ms)
+        return totals
+
+    # --- Export ---
+
+    def to_chrome(self) -> dict:
+        """Chrome trace format (chrome://tracing, Perfetto): complete "X" events in microseconds."""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for span in self.spans():
+            threads[span.tid] = span.thread
+            events.append({
+                "name": span.name,
+                "cat": span.cat,
+                "ph": "X",
+                "ts": round((span.start - self._origin) * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+                "pid": pid,
+                "tid": span.tid,
+                "args": span.args,
+            })
+        for tid, name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"dropped": self.dropped}}
+
+    def export_chrome(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f, default=str)
+        return path
+
+
+# --- Process-wide default tracer ---
+
+_default_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _default_tracer
+
+
+def set_tracer(tracer: Tracer):
+    """Swap the shared tracer. Returns the previous one."""
+    global _default_tracer
+    previous, _default_tracer = _default_tracer, tracer
+    return previous
+
+
+def span(name, cat="app", **args):
+    """Open a span on the shared tracer: `with tracing.span("diff"): ...`"""
+    return _default_tracer.span(name, cat, **args)
+
+
+def traced(name=None, cat="app"):
+    """Decorator form of span()."""
+    def wrap(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            with _default_tracer.span(label, cat):
+                return func(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def export_chrome(path) -> Optional[str]:
+    return _default_tracer.export_chrome(path)
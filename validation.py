@@ -0,0 +1,310 @@
+# Bulk IPv4 address-plan validation (NumPy-vectorized when available)
+import re
+from typing import List, Optional, Sequence
+
+np = None  # NumPy is optional and only imported when a large plan needs it
+_numpy_checked = False
+
+# Error flags; a row's code is the OR of every problem found
+IP_SYNTAX = 1 << 0
+IP_RANGE = 1 << 1
+IP_RESERVED = 1 << 2
+IP_NETWORK = 1 << 3
+IP_BROADCAST = 1 << 4
+MASK_MISSING = 1 << 5
+MASK_SYNTAX = 1 << 6
+MASK_RANGE = 1 << 7
+MASK_NONCONTIGUOUS = 1 << 8
+GW_SYNTAX = 1 << 9
+GW_RANGE = 1 << 10
+GW_RESERVED = 1 << 11
+GW_NOT_IN_SUBNET = 1 << 12
+GW_IS_IP = 1 << 13
+GW_NETWORK_OR_BROADCAST = 1 << 14
+GW_WITHOUT_IP = 1 << 15
+DNS1_SYNTAX = 1 << 16
+DNS1_RANGE = 1 << 17
+DNS2_SYNTAX = 1 << 18
+DNS2_RANGE = 1 << 19
+
+MESSAGES = (
+    (IP_SYNTAX, "IP Address is not valid IPv4 syntax."),
+    (IP_RANGE, "IP Address has an octet above 255."),
+    (IP_RESERVED, "IP Address is in a reserved range (0/8, loopback, multicast or 240/4)."),
+    (IP_NETWORK, "IP Address is the network address of its subnet."),
+    (IP_BROADCAST, "IP Address is the broadcast address of its subnet."),
+    (MASK_MISSING, "Netmask is required with an IP address."),
+    (MASK_SYNTAX, "Netmask is not valid IPv4 syntax."),
+    (MASK_RANGE, "Netmask has an octet above 255."),
+    (MASK_NONCONTIGUOUS, "Netmask bits are not contiguous."),
+    (GW_SYNTAX, "Gateway is not valid IPv4 syntax."),
+    (GW_RANGE, "Gateway has an octet above 255."),
+    (GW_RESERVED, "Gateway is in a reserved range (0/8, loopback, multicast or 240/4)."),
+    (GW_NOT_IN_SUBNET, "Gateway is not in the same subnet as the IP address."),
+    (GW_IS_IP, "Gateway is the same as the IP address."),
+    (GW_NETWORK_OR_BROADCAST, "Gateway is the network or broadcast address of the subnet."),
+    (GW_WITHOUT_IP, "Gateway needs an IP address and netmask."),
+    (DNS1_SYNTAX, "DNS 1 is not valid IPv4 syntax."),
+    (DNS1_RANGE, "DNS 1 has an octet above 255."),
+    (DNS2_SYNTAX, "DNS 2 is not valid IPv4 syntax."),
+    (DNS2_RANGE, "DNS 2 has an octet above 255."),
+)
+
+FULL = 0xFFFFFFFF
+MAX_LEN = 15  # "255.255.255.255"
+_DOTTED = re.compile(r"([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})\.([0-9]{1,3})")  # ASCII only; \d takes any Unicode digit
+
+
+def messages(code) -> List[str]:
+    """Human-readable messages for one row's error code."""
+    code = int(code)
+    return [text for flag, text in MESSAGES if code & flag]
+
+
+def parse_ipv4(val) -> Optional[int]:
+    """
+    Strict dotted-quad parse: returns the address as an int, None for blank,
+    -1 for bad syntax and -2 for an octet above 255. Leading zeros are rejected
+    because Windows reads them as octal.
+    """
+    val = val.strip() if val else ""
+    if not val:
+        return None
+    m = _DOTTED.fullmatch(val)
+    if not m:
+        return -1
+    value = 0
+    for octet in m.groups():
+        if len(octet) > 1 and octet[0] == "0":
+            return -1
+        n = int(octet)
+        if n > 255:
+            return -2
+        value = (value << 8) | n
+    return value
+
+
+def _load_numpy():
+    """Import NumPy on first use (it costs ~100 ms at startup); False if it is not installed."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:  # the pure-Python path gives the same answers
+            pass
+    return np is not None
+
+
+def _is_reserved(value):
+    first = value >> 24
+    return first == 0 or first == 127 or first >= 224
+
+
+class ValidationResult:
+    """Per-row error codes; 0 means the row is valid."""
+    def __init__(self, codes):
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def ok(self):
+        return not self.invalid_rows()
+
+    def invalid_rows(self) -> List[int]:
+        if isinstance(self.codes, list):
+            return [i for i, c in enumerate(self.codes) if c]
+        return np.nonzero(self.codes)[0].tolist()
+
+    def errors(self, row) -> List[str]:
+        return messages(self.codes[row])
+
+
+# --- Pure-Python path ---
+
+def _validate_python(ip, netmask, gateway, dns1, dns2):
+    codes = []
+    for row in range(len(ip)):
+        code = 0
+        a = parse_ipv4(ip[row])
+        m = parse_ipv4(netmask[row])
+        g = parse_ipv4(gateway[row])
+        for value, syntax, rng in ((a, IP_SYNTAX, IP_RANGE), (m, MASK_SYNTAX, MASK_RANGE), (g, GW_SYNTAX, GW_RANGE)):
+            if value == -1:
+                code |= syntax
+            elif value == -2:
+                code |= rng
+        for field, syntax, rng in ((dns1, DNS1_SYNTAX, DNS1_RANGE), (dns2, DNS2_SYNTAX, DNS2_RANGE)):
+            if field is not None:
+                value = parse_ipv4(field[row])
+                if value == -1:
+                    code |= syntax
+                elif value == -2:
+                    code |= rng
+
+        a_ok = a is not None and a >= 0
+        m_ok = m is not None and m >= 0
+        g_ok = g is not None and g >= 0
+        if a_ok and m is None:
+            code |= MASK_MISSING
+        if m_ok:
+            inv = ~m & FULL
+            if m == 0 or inv & (inv + 1):
+                code |= MASK_NONCONTIGUOUS
+                m_ok = False
+        if a_ok and _is_reserved(a):
+            code |= IP_RESERVED
+        if g_ok and _is_reserved(g):
+            code |= GW_RESERVED
+        if g is not None and (a is None or m is None):
+            code |= GW_WITHOUT_IP
+        if a_ok and m_ok:
+            inv = ~m & FULL
+            host = a & inv
+            if inv > 1:  # /31 and /32 have no network or broadcast address
+                if host == 0:
+                    code |= IP_NETWORK
+                elif host == inv:
+                    code |= IP_BROADCAST
+            if g_ok:
+                if (g & m) != (a & m):
+                    code |= GW_NOT_IN_SUBNET
+                elif g == a:
+                    code |= GW_IS_IP
+                elif inv > 1 and (g & inv) in (0, inv):
+                    code |= GW_NETWORK_OR_BROADCAST
+        codes.append(code)
+    return codes
+
+
+# --- NumPy path ---
+
+def _parse_column_numpy(values):
+    """
+    Vectorized strict parse of one column.
+    Returns (value uint64, present bool, syntax_bad bool, range_bad bool) arrays.
+    """
+    cleaned = ["" if v is None else v.strip() for v in values]
+    n = len(cleaned)
+    text = np.array(cleaned, dtype=f"<U{MAX_LEN + 1}")
+    # NumPy drops trailing NULs, so a NUL would otherwise pass as padding
+    unfit = np.fromiter((len(v) > MAX_LEN or "\0" in v for v in cleaned), dtype=bool, count=n)
+    chars = text.view(np.uint32).reshape(n, MAX_LEN + 1)
+
+    present = chars[:, 0] != 0
+    is_dot = chars == 46
+    is_digit = (chars >= 48) & (chars <= 57)
+    is_pad = chars == 0
+    # Padding only ever trails, so any other character is a syntax error
+    syntax_bad = ~np.all(is_dot | is_digit | is_pad, axis=1) | unfit
+    syntax_bad |= is_dot.sum(axis=1) != 3
+
+    seg = np.cumsum(is_dot, axis=1)
+    seg = np.minimum(seg, 3)
+    octets = np.zeros((n, 4), dtype=np.uint32)
+    digits = np.zeros((n, 4), dtype=np.uint8)
+    leading_zero = np.zeros(n, dtype=bool)
+    rows = np.arange(n)
+    for col in range(MAX_LEN + 1):
+        d = is_digit[:, col]
+        if not d.any():
+            continue
+        r = rows[d]
+        s = seg[d, col]
+        first = digits[r, s] == 0
+        # A '0' that starts a segment which continues is a leading zero
+        if col < MAX_LEN:
+            leading_zero[r[first & (chars[r, col] == 48) & is_digit[r, col + 1]]] = True
+        octets[r, s] = octets[r, s] * 10 + (chars[r, col] - 48)
+        digits[r, s] += 1
+    syntax_bad |= np.any((digits == 0) | (digits > 3), axis=1) | leading_zero
+    syntax_bad &= present
+    range_bad = np.any(octets > 255, axis=1) & present & ~syntax_bad
+
+    value = (
+        (octets[:, 0].astype(np.uint64) << 24) | (octets[:, 1].astype(np.uint64) << 16)
+        | (octets[:, 2].astype(np.uint64) << 8) | octets[:, 3].astype(np.uint64)
+    )
+    return value, present, syntax_bad, range_bad
+
+
+def _validate_numpy(ip, netmask, gateway, dns1, dns2):
+    n = len(ip)
+    codes = np.zeros(n, dtype=np.uint32)
+    a, a_present, a_syn, a_rng = _parse_column_numpy(ip)
+    m, m_present, m_syn, m_rng = _parse_column_numpy(netmask)
+    g, g_present, g_syn, g_rng = _parse_column_numpy(gateway)
+    for syn, rng, fs, fr in ((a_syn, a_rng, IP_SYNTAX, IP_RANGE), (m_syn, m_rng, MASK_SYNTAX, MASK_RANGE),
+                             (g_syn, g_rng, GW_SYNTAX, GW_RANGE)):
+        codes[syn] |= fs
+        codes[rng] |= fr
+    for column, fs, fr in ((dns1, DNS1_SYNTAX, DNS1_RANGE), (dns2, DNS2_SYNTAX, DNS2_RANGE)):
+        if column is not None:
+            _, _, syn, rng = _parse_column_numpy(column)
+            codes[syn] |= fs
+            codes[rng] |= fr
+
+    a_ok = a_present & ~a_syn & ~a_rng
+    m_ok = m_present & ~m_syn & ~m_rng
+    g_ok = g_present & ~g_syn & ~g_rng
+    full = np.uint64(FULL)
+
+    codes[a_ok & ~m_present] |= MASK_MISSING
+    inv = ~m & full
+    noncontiguous = m_ok & ((m == 0) | ((inv & (inv + np.uint64(1))) != 0))
+    codes[noncontiguous] |= MASK_NONCONTIGUOUS
+    m_ok &= ~noncontiguous
+
+    a_first = a >> np.uint64(24)
+    g_first = g >> np.uint64(24)
+    codes[a_ok & ((a_first == 0) | (a_first == 127) | (a_first >= 224))] |= IP_RESERVED
+    codes[g_ok & ((g_first == 0) | (g_first == 127) | (g_first >= 224))] |= GW_RESERVED
+    codes[g_present & ~(a_present & m_present)] |= GW_WITHOUT_IP
+
+    both = a_ok & m_ok
+    has_hosts = inv > np.uint64(1)
+    host = a & inv
+    codes[both & has_hosts & (host == 0)] |= IP_NETWORK
+    codes[both & has_hosts & (host == inv) & (host != 0)] |= IP_BROADCAST
+
+    with_gw = both & g_ok
+    outside = with_gw & ((g & m) != (a & m))
+    codes[outside] |= GW_NOT_IN_SUBNET
+    inside = with_gw & ~outside
+    codes[inside & (g == a)] |= GW_IS_IP
+    g_host = g & inv
+    codes[inside & (g != a) & has_hosts & ((g_host == 0) | (g_host == inv))] |= GW_NETWORK_OR_BROADCAST
+    return codes
+
+
+def validate_columns(ip: Sequence, netmask: Sequence, gateway: Sequence = None,
+                     dns1: Sequence = None, dns2: Sequence = None, use_numpy=None) -> ValidationResult:
+    """
+    Validate an address plan given as parallel columns of strings (None or "" = blank).
+    use_numpy: None picks NumPy when it is installed and the plan is large enough to pay off.
+    """
+    n = len(ip)
+    if len(netmask) != n or (gateway is not None and len(gateway) != n):
+        raise ValueError("All columns must have the same length.")
+    if gateway is None:
+        gateway = [None] * n
+    if use_numpy is None:
+        use_numpy = n >= 256 and _load_numpy()
+    if use_numpy and not _load_numpy():
+        raise RuntimeError("NumPy is not installed.")
+    if use_numpy:
+        return ValidationResult(_validate_numpy(ip, netmask, gateway, dns1, dns2))
+    return ValidationResult(_validate_python(ip, netmask, gateway, dns1, dns2))
+
+
+def validate_rows(rows, use_numpy=None) -> ValidationResult:
+    """rows: iterable of (ip, netmask, gateway) or (ip, netmask, gateway, dns1, dns2) tuples."""
+    rows = list(rows)
+    columns = list(zip(*rows)) if rows else [(), (), ()]
+    ip, netmask, gateway = columns[0], columns[1], columns[2]
+    dns1 = columns[3] if len(columns) > 3 else None
+    dns2 = columns[4] if len(columns) > 4 else None
+    return validate_columns(ip, netmask, gateway, dns1, dns2, use_numpy=use_numpy)